@@ -1,13 +1,32 @@
 import streamlit as st
-from utils.data_loader import load_all_data
+import utils.data_loader
+import utils.operations
+import utils.rfm
+import utils.timeline
+from utils.data_loader import load_all_data, merge_on_key, source_digest
+from utils.timeline import sort_by_time, slice_by_time, time_bounds
+from utils.graph import ComputeGraph
+from utils.frame_cache import default_frame_cache, code_version
+from utils.cube import build_daily_cube
+from utils.cohort import customer_type_trend, retention_matrix
+from utils.rfm import calculate_rfm
+from utils.translation import Translator, TranslationStore, get_backend, default_store_path
+from utils.reviews import build_review_facts
+from utils.search_index import open_index, default_index_path
+from utils.keywords import build_keyword_counts
+from utils.maps import point_map
+from utils.geo import state_totals
+from utils.operations import add_lifecycle_columns, sla_percentiles, on_time_rate
+from utils.binning import build_daily_histogram, histogram_quantile, coarsen, bar_trace, histogram
+from utils.sellers import build_seller_facts, month_code, top_n
+from utils.leads import build_lead_facts, leads_in_period, funnel_totals, conversion_by, deals_by, time_to_close_histogram
 import pandas as pd
+import time
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import numpy as np
-import folium
 from streamlit_folium import st_folium
-from deep_translator import GoogleTranslator
 
 
 # Konfigurasi dasar
@@ -38,63 +57,162 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 st.title("📊 Dashboard E-Commerce SSDC")
+page_start = time.perf_counter()
 
-# Load data dengan error handling
-@st.cache_data
+# Registry tabel dibagi ke semua sesi; tiap tabel dibaca saat pertama dipakai
+@st.cache_resource
 def load_data():
-    try:
-        return load_all_data()
-    except Exception as e:
-        st.error(f"Error loading data: {str(e)}")
-        return None
+    data = load_all_data()
+    # Tabel inti (dipakai semua halaman) dibaca bersamaan saat boot;
+    # DASHBOARD_INGEST_WORKERS / DASHBOARD_CSV_ENGINE=pyarrow untuk mengatur
+    data.prefetch(["orders", "order_items", "order_payments"])
+    return data
 
-data = load_data()
-if data is None:
+# Load data dengan error handling
+try:
+    data = load_data()
+
+    # Tabel inti yang dipakai semua halaman; tabel lain diambil per halaman
+    orders = data["orders"]
+    order_items = data["order_items"]
+    payments = data["order_payments"]
+except Exception as e:
+    st.error(f"Error loading data: {str(e)}")
     st.stop()
 
-# Extract data
-orders = data["orders"]
-order_items = data["order_items"]
-payments = data["order_payments"]
-customers = data["customers"]
-products = data["products"]
-geolocation = data["geolocation"]
-order_reviews = data["order_reviews"]
-product_cat = data["product_cat"]
-sellers = data["sellers"]
-leads_qualified = data["leads_qualified"]
-leads_closed = data["leads_closed"]
-product_category_name_translation = data['product_cat']
-
 # Data preprocessing
-@st.cache_data
-def preprocess_data():
-    # Copy dan convert timestamp
-    orders_clean = orders.copy()
-    orders_clean['order_purchase_timestamp'] = pd.to_datetime(orders_clean['order_purchase_timestamp'], errors='coerce')
+def preprocess_orders():
+    # Timestamp sudah di-parse saat load (lihat SCHEMAS di data_loader).
+    # Orders diurutkan per waktu pembelian supaya filter periode cukup berupa
+    # potongan baris; merge "left" turunannya mempertahankan urutan ini.
+    orders_clean = sort_by_time(orders)
+    # Epoch int64 + durasi siklus order (approval, handoff, delivery, lateness)
+    orders_clean = add_lifecycle_columns(orders_clean)
 
     # Tambahkan kolom waktu
     orders_clean['month'] = orders_clean['order_purchase_timestamp'].dt.to_period("M").astype(str)
     orders_clean['year'] = orders_clean['order_purchase_timestamp'].dt.year
     orders_clean['year_month'] = orders_clean['order_purchase_timestamp'].dt.strftime('%Y-%m')
 
-    # Merge dengan payments
-    orders_payments = orders_clean.merge(payments, on='order_id', how='left')
-
-    # Merge dengan order_items
-    orders_items = orders_clean.merge(order_items, on='order_id', how='left')
-
-    return orders_clean, orders_payments, orders_items
-
-# Jalankan preprocess
-orders_processed, orders_payments, orders_items = preprocess_data()
-
-@st.cache_data(show_spinner=False)
-def translate_text(text, target_lang='id'):
+    # Rollup freight per order, sejajar dengan timeline orders_clean
+    freight_per_order = order_items.groupby('order_key')['freight_value'].agg(['sum', 'size'])
+    orders_clean['freight_total'] = orders_clean['order_key'].map(freight_per_order['sum']).fillna(0.0)
+    orders_clean['item_count'] = orders_clean['order_key'].map(freight_per_order['size']).fillna(0).astype('int32')
+
+    return orders_clean
+
+def join_payments(orders_clean):
+    return merge_on_key(orders_clean, payments, on='order_key', how='left')
+
+def join_items(orders_clean):
+    return merge_on_key(orders_clean, order_items, on='order_key', how='left')
+
+def slice_period(df, period):
+    # period (None, None): data tanggal tidak tersedia, pakai semua baris
+    start, end = period
+    return df if start is None else slice_by_time(df, start, end)
+
+# Histogram freight per item per hari (bin tetap), untuk rentang tanggal mana pun
+def freight_histogram_of(orders_items):
+    items = orders_items[orders_items['freight_value'] > 0]
+    freight = items['freight_value'].to_numpy()
+    # 200 bin halus sampai kuantil 99.5%, sisanya satu bin overflow
+    upper = float(np.quantile(freight, 0.995)) if len(freight) else 1.0
+    edges = np.append(np.linspace(0.0, upper, 201), max(float(freight.max()) if len(freight) else 0.0, upper) + 1.0)
+    return build_daily_histogram(items['order_purchase_timestamp'], freight, edges)
+
+# Histogram waktu kirim (bin 1 hari, 0-100 hari) per hari pembelian, order delivered saja
+def delivery_histogram_of(orders_clean):
+    delivered = orders_clean[
+        (orders_clean['order_status'] == 'delivered') &
+        (orders_clean['delivery_days'] <= 100)
+    ]
+    edges = np.arange(0, 101, dtype=np.float64)
+    return build_daily_histogram(delivered['order_purchase_timestamp'], delivered['delivery_days'], edges)
+
+# Fakta seller per bulan (volume, revenue, freight, pengiriman, review)
+def seller_facts_of(orders_clean):
+    return build_seller_facts(orders_clean, order_items, data["order_reviews"], data["sellers"])
+
+def rfm_of(period_orders, period_payments):
+    current_date = period_orders['order_purchase_timestamp'].max()
+    return calculate_rfm(period_payments, current_date=current_date)
+
+# Graf dataset turunan order, satu per proses. Halaman meminta node yang
+# dipakainya lewat run.get(...); node tanpa parameter dihitung sekali,
+# node per periode di-memo per rentang tanggal (lihat utils/graph.py).
+# Node shared=True (frame besar & RFM) disimpan di FrameCache: LRU dengan
+# budget byte, tingkat disk Feather ter-memory-map dibagi antar worker.
+# Kuncinya aman lintas proses karena orders, order_items & payments selalu
+# dimuat pertama dengan urutan yang sama, jadi surrogate key-nya identik.
+# Namespace = digest CSV + skema, ditambah versi kode node shared dan modul
+# yang dipanggilnya (termasuk interning id & SCHEMAS di data_loader).
+SHARED_NODE_CODE = [
+    preprocess_orders, join_payments, join_items, slice_period, rfm_of,
+    utils.data_loader, utils.operations, utils.rfm, utils.timeline,
+]
+
+@st.cache_resource
+def load_frame_cache():
     try:
-        return GoogleTranslator(source='auto', target=target_lang).translate(text)
-    except:
-        return text
+        namespace = "-".join([
+            source_digest(["orders", "order_items", "order_payments"], data.base_path),
+            code_version(*SHARED_NODE_CODE),
+        ])
+        return default_frame_cache(namespace, data.base_path)
+    except OSError:
+        # Folder cache read-only: graf tetap jalan dengan memo per proses saja
+        return None
+
+@st.cache_resource
+def load_graph():
+    graph = ComputeGraph(store=load_frame_cache())
+    graph.add("orders", preprocess_orders, shared=True)
+    graph.add("orders_payments", join_payments, deps=["orders"], shared=True)
+    graph.add("orders_items", join_items, deps=["orders"], shared=True)
+    # Cube agregat harian untuk KPI & tren Executive Overview
+    graph.add("daily_cube", build_daily_cube, deps=["orders", "orders_payments", "orders_items"])
+    graph.add("freight_histogram", freight_histogram_of, deps=["orders_items"])
+    graph.add("delivery_histogram", delivery_histogram_of, deps=["orders"])
+    graph.add("seller_facts", seller_facts_of, deps=["orders"])
+    # Ketiga frame terurut per timestamp: cukup binary search + slice
+    graph.add("orders_filtered", slice_period, deps=["orders"], params=["period"])
+    graph.add("orders_payments_filtered", slice_period, deps=["orders_payments"], params=["period"])
+    graph.add("orders_items_filtered", slice_period, deps=["orders_items"], params=["period"])
+    graph.add("rfm", rfm_of, deps=["orders_filtered", "orders_payments_filtered"], shared=True)
+    return graph
+
+run = load_graph().run()
+orders_processed = run.get("orders")
+
+# Satu translator per proses: cache SQLite persisten + backend batch
+# (TRANSLATION_BACKEND=identity untuk mode offline)
+@st.cache_resource
+def get_translator():
+    return Translator(get_backend(), TranslationStore(default_store_path()))
+
+# Tabel fakta ulasan x produk x kategori, dibangun sekali per proses dan
+# terurut per kategori (lihat utils/reviews.py)
+@st.cache_resource
+def load_review_facts():
+    return build_review_facts(data["order_reviews"], order_items, data["products"], data["product_cat"])
+
+# Indeks terbalik atas judul + isi ulasan; disimpan di data/.cache dan hanya
+# ulasan baru yang diindeks saat data bertambah
+@st.cache_resource
+def load_review_index():
+    index, _ = open_index(load_review_facts().texts(), default_index_path())
+    return index
+
+# Hitungan kata/bigram per (kategori, bulan, bucket rating), sekali per proses
+@st.cache_resource
+def load_keyword_counts():
+    return build_keyword_counts(load_review_facts())
+
+# Satu baris per MQL + deal-nya, terurut per first_contact_date (sekali per proses)
+@st.cache_resource
+def load_lead_facts():
+    return build_lead_facts(data["leads_qualified"], data["leads_closed"])
     
 # Sidebar Navigation
 st.sidebar.title("📋 Dashboard Menu")
@@ -129,49 +247,26 @@ if has_valid_dates:
     end_date = st.sidebar.date_input("📅 Tanggal Selesai:", value=max_date, min_value=min_date, max_value=max_date)
 
     if start_date <= end_date:
-        date_mask = (
-            (orders_processed['order_purchase_timestamp'].dt.date >= start_date) & 
-            (orders_processed['order_purchase_timestamp'].dt.date <= end_date)
-        )
-        orders_filtered = orders_processed[date_mask]
-
-        filtered_order_ids = orders_filtered['order_id'].tolist()
-        orders_payments_filtered = orders_payments[orders_payments['order_id'].isin(filtered_order_ids)]
-        orders_items_filtered = orders_items[orders_items['order_id'].isin(filtered_order_ids)]
-
-        st.sidebar.info(f"📊 {len(orders_filtered):,} pesanan dipilih")
+        period_start, period_end = start_date, end_date
+        # Jumlah pesanan cukup dari dua binary search, tanpa memotong frame
+        lo, hi = time_bounds(orders_processed, start_date, end_date)
+        st.sidebar.info(f"📊 {hi - lo:,} pesanan dipilih")
     else:
         st.sidebar.error("⚠️ Tanggal mulai tidak boleh lebih besar dari tanggal selesai")
-        orders_filtered, orders_payments_filtered, orders_items_filtered = orders_processed, orders_payments, orders_items
+        period_start, period_end = min_date, max_date
 else:
-    orders_filtered, orders_payments_filtered, orders_items_filtered = orders_processed, orders_payments, orders_items
+    period_start, period_end = None, None
     st.sidebar.warning("⚠️ Data tanggal tidak tersedia")
 
-# Pastikan kolom month dan year_month tetap ada setelah filter
-if 'month' not in orders_filtered.columns:
-    orders_filtered['month'] = orders_filtered['order_purchase_timestamp'].dt.to_period("M").astype(str)
-if 'year_month' not in orders_filtered.columns:
-    orders_filtered['year_month'] = orders_filtered['order_purchase_timestamp'].dt.strftime('%Y-%m')
+# Frame per periode tidak dipotong di sini: tiap halaman meminta node yang
+# dipakainya dari graf, dan hanya node itu yang dihitung (atau diambil dari memo)
+run.bind(period=(period_start, period_end))
     
 # ================================
 # 📌 HALAMAN: EXECUTIVE OVERVIEW
 # ================================
 from datetime import timedelta
 
-# Tentukan periode sebelumnya dengan panjang waktu yang sama
-period_length = end_date - start_date
-prev_start_date = start_date - period_length - timedelta(days=1)
-prev_end_date = start_date - timedelta(days=1)
-
-# Filter data untuk periode sebelumnya
-prev_mask = (
-    (orders_processed['order_purchase_timestamp'].dt.date >= prev_start_date) &
-    (orders_processed['order_purchase_timestamp'].dt.date <= prev_end_date)
-)
-prev_orders_data = orders_processed[prev_mask]
-prev_order_ids = prev_orders_data['order_id'].tolist()
-prev_payments_data = orders_payments[orders_payments['order_id'].isin(prev_order_ids)]
-
 # Fungsi untuk hitung growth
 def calc_growth(current, previous, cap=999):
     if previous > 0:
@@ -183,6 +278,23 @@ def calc_growth(current, previous, cap=999):
 # --- EXECUTIVE OVERVIEW ---
 if page == "Executive Overview":
     st.header("📌 Executive Overview")
+    customers = data["customers"]
+    products = data["products"]
+    orders_filtered, orders_payments_filtered, daily_cube = run.get(
+        "orders_filtered", "orders_payments_filtered", "daily_cube"
+    )
+
+    # Tentukan periode sebelumnya dengan panjang waktu yang sama
+    period_length = end_date - start_date
+    prev_start_date = start_date - period_length - timedelta(days=1)
+    prev_end_date = start_date - timedelta(days=1)
+
+    # KPI periode ini & periode sebelumnya dijawab dari cube harian
+    current_kpi = daily_cube.totals(period_start, period_end)
+    prev_kpi = daily_cube.totals(prev_start_date, prev_end_date)
+    # Pelanggan unik dihitung tepat dari potongan orders (bukan estimasi HLL
+    # cube), karena dipakai untuk rasio Orders per Customer & growth
+    prev_orders_slice = slice_period(orders_processed, (prev_start_date, prev_end_date))
 
     # ===================
     # KPI METRICS
@@ -190,23 +302,23 @@ if page == "Executive Overview":
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        total_revenue = orders_payments_filtered['payment_value'].sum()
-        prev_revenue = prev_payments_data['payment_value'].sum() if not prev_payments_data.empty else 0
+        total_revenue = current_kpi['revenue']
+        prev_revenue = prev_kpi['revenue']
         st.metric("💰 Total Revenue", f"€ {total_revenue:,.0f}", delta=calc_growth(total_revenue, prev_revenue))
 
     with col2:
-        total_orders = orders_filtered['order_id'].nunique()
-        prev_orders = prev_orders_data['order_id'].nunique() if not prev_orders_data.empty else 0
+        total_orders = current_kpi['orders']
+        prev_orders = prev_kpi['orders']
         st.metric("📦 Total Orders", f"{total_orders:,}", delta=calc_growth(total_orders, prev_orders))
 
     with col3:
-        total_customers = orders_filtered['customer_id'].nunique()
-        prev_customers = prev_orders_data['customer_id'].nunique() if not prev_orders_data.empty else 0
+        total_customers = orders_filtered['customer_key'].nunique()
+        prev_customers = prev_orders_slice['customer_key'].nunique()
         st.metric("🧑‍🤝‍🧑 Unique Customers", f"{total_customers:,}", delta=calc_growth(total_customers, prev_customers))
 
     with col4:
-        avg_order_value = orders_payments_filtered['payment_value'].mean() or 0
-        prev_avg = prev_payments_data['payment_value'].mean() or 0
+        avg_order_value = current_kpi['avg_order_value']
+        prev_avg = prev_kpi['avg_order_value']
         st.metric("💳 Avg Order Value", f"€ {avg_order_value:,.0f}", delta=calc_growth(avg_order_value, prev_avg))
 
     st.markdown("---")
@@ -220,11 +332,8 @@ if page == "Executive Overview":
     with col1:
         st.subheader("📈 Order Volume & Revenue Trend")
         
-        # Aggregate data by month
-        monthly_stats = orders_payments_filtered.groupby('year_month').agg({
-            'order_id': 'nunique',
-            'payment_value': 'sum'
-        }).reset_index()
+        # Aggregate data by month (jumlah potongan cube harian)
+        monthly_stats = daily_cube.monthly(period_start, period_end)
         
         # Create dual-axis chart
         fig_trend = go.Figure()
@@ -232,7 +341,7 @@ if page == "Executive Overview":
         # Add orders line
         fig_trend.add_trace(go.Scatter(
             x=monthly_stats['year_month'],
-            y=monthly_stats['order_id'],
+            y=monthly_stats['orders'],
             mode='lines+markers',
             name='Orders',
             line=dict(color='#1f77b4', width=3),
@@ -242,7 +351,7 @@ if page == "Executive Overview":
         # Add revenue bars
         fig_trend.add_trace(go.Bar(
             x=monthly_stats['year_month'],
-            y=monthly_stats['payment_value'],
+            y=monthly_stats['revenue'],
             name='Revenue',
             opacity=0.7,
             yaxis='y2'
@@ -268,11 +377,12 @@ if page == "Executive Overview":
         st.metric("🎯 Orders per Customer", f"{conversion_rate:.1f}%")
         
         # Average items per order
-        avg_items = orders_items_filtered.groupby('order_id')['order_item_id'].count().mean()
+        avg_items = current_kpi['avg_items']
         st.metric("📦 Avg Items per Order", f"{avg_items:.1f}")
         
-        # Top payment method
-        top_payment = payments['payment_type'].value_counts().index[0] if not payments.empty else "N/A"
+        # Top payment method (seluruh histori, dari rincian payment_type di cube)
+        payment_mix = daily_cube.payment_mix(None, None)
+        top_payment = payment_mix.loc[payment_mix['count'].idxmax(), 'payment_type'] if not payment_mix.empty else "N/A"
         st.metric("💳 Top Payment Method", top_payment)
 
     # ===================
@@ -280,18 +390,8 @@ if page == "Executive Overview":
     # ===================
     st.subheader("👥 Customer Acquisition Analysis")
     
-    # Calculate first order date for each customer
-    first_order = orders_filtered.groupby('customer_id')['order_purchase_timestamp'].min().reset_index()
-    first_order['first_order_month'] = first_order['order_purchase_timestamp'].dt.strftime('%Y-%m')
-    
-    # Merge with all orders
-    orders_with_first = orders_filtered.merge(first_order, on='customer_id', suffixes=('', '_first'))
-    orders_with_first['customer_type'] = orders_with_first.apply(
-        lambda x: 'New' if x['year_month'] == x['first_order_month'] else 'Returning', axis=1
-    )
-    
-    # Group by month and customer type
-    customer_trend = orders_with_first.groupby(['year_month', 'customer_type']).size().reset_index(name='count')
+    # Label New/Returning per order dihitung vektorisasi oleh cohort engine
+    customer_trend = customer_type_trend(orders_filtered)
     
     fig_customers = px.bar(
         customer_trend, 
@@ -305,25 +405,38 @@ if page == "Executive Overview":
     fig_customers.update_layout(height=400)
     st.plotly_chart(fig_customers, use_container_width=True)
 
+    with st.expander("📅 Cohort Retention Matrix"):
+        retention = retention_matrix(orders_filtered)
+        if not retention.empty:
+            fig_retention = px.imshow(
+                retention * 100,
+                labels={'x': 'Months Since First Order', 'y': 'Cohort', 'color': 'Retention (%)'},
+                color_continuous_scale='Blues',
+                aspect='auto',
+                title='Monthly Cohort Retention (%)'
+            )
+            st.plotly_chart(fig_retention, use_container_width=True)
+        else:
+            st.info("Cohort data not available")
+
     # ===================
     # 📌 Top States by Orders (Bar Chart + Table Sejajar)
     # ===================
     st.subheader("🗺️ Top States by Orders")
 
     # Merge customers with orders to get state info
-    customer_orders = orders_filtered.merge(customers, on='customer_id', how='left')
-    # Pastikan payment_value numerik
-    orders_payments_filtered['payment_value'] = pd.to_numeric(orders_payments_filtered['payment_value'], errors='coerce')
+    customer_orders = merge_on_key(orders_filtered, customers, on='customer_key', how='left')
+    # payment_value sudah float64 (SCHEMAS); frame periode dibagi antar sesi, jangan diubah in-place
     # Join customer_orders dengan payments untuk dapatkan payment_value
     customer_orders_payments = customer_orders.merge(
-        orders_payments_filtered[['order_id', 'payment_value']],
-        on='order_id',
+        orders_payments_filtered[['order_key', 'payment_value']],
+        on='order_key',
         how='left'
     )
 
     # Hitung total_orders & total_revenue per state
-    state_orders = customer_orders_payments.groupby('customer_state').agg(
-        total_orders=('order_id', 'count'),
+    state_orders = customer_orders_payments.groupby('customer_state', observed=True).agg(
+        total_orders=('order_key', 'count'),
         total_revenue=('payment_value', 'sum')
     ).reset_index()
 
@@ -373,8 +486,8 @@ if page == "Executive Overview":
     st.subheader("🏆 Top Product Categories")
 
     if not products.empty and not order_items.empty:
-        product_sales = order_items.merge(products, on='product_id', how='left')
-        category_sales = product_sales.groupby('product_category_name').agg(
+        product_sales = merge_on_key(order_items, products, on='product_key', how='left')
+        category_sales = product_sales.groupby('product_category_name', observed=True).agg(
             items_sold=('order_item_id', 'count')
         ).reset_index().rename(columns={'product_category_name': 'Category'})
 
@@ -415,8 +528,6 @@ if page == "Executive Overview":
         
     with col1:
         # Revenue
-        total_revenue = orders_payments_filtered['payment_value'].sum()
-        prev_revenue = prev_payments_data['payment_value'].sum() if not prev_payments_data.empty else 0
         revenue_growth = calc_growth(total_revenue, prev_revenue)
         
         st.info(f"""
@@ -428,8 +539,6 @@ if page == "Executive Overview":
     
     with col2:
         # Customers
-        total_customers = orders_filtered['customer_id'].nunique()
-        prev_customers = prev_orders_data['customer_id'].nunique() if not prev_orders_data.empty else 0
         customers_growth = calc_growth(total_customers, prev_customers)
     
         st.success(f"""
@@ -441,8 +550,6 @@ if page == "Executive Overview":
     
     with col3:
         # Orders
-        total_orders = orders_filtered['order_id'].nunique()
-        prev_orders = prev_orders_data['order_id'].nunique() if not prev_orders_data.empty else 0
         orders_growth = calc_growth(total_orders, prev_orders)
     
         st.warning(f"""
@@ -459,55 +566,26 @@ if page == "Executive Overview":
 elif page == "Customer & Market Analysis":
     st.header("📌 Customer & Market Analysis")
     st.markdown("*Memahami customer behavior dan market opportunity*")
+    customers = data["customers"]
+    orders_filtered, orders_payments_filtered = run.get("orders_filtered", "orders_payments_filtered")
+    # Centroid per kota/provinsi (beberapa ribu baris), bukan ~1 juta titik geolocation.
+    # Tanpa file geolocation maupun cache centroid (mis. mode offline), peta tampil kosong.
+    try:
+        geo_city = data["geo_city"]
+        geo_state = data["geo_state"]
+    except FileNotFoundError as e:
+        st.warning(f"📍 Data geolocation tidak tersedia, peta ditampilkan tanpa titik: {e}")
+        geo_city = pd.DataFrame(columns=['geolocation_city', 'geolocation_state', 'geolocation_lat', 'geolocation_lng'])
+        geo_state = pd.DataFrame(columns=['geolocation_state', 'geolocation_lat', 'geolocation_lng'])
     
     # ===================
     # Customer Segmentation - RFM Analysis
     # ===================
     st.subheader("🎯 Customer Segmentation (RFM Analysis)")
     
-    @st.cache_data
-    def calculate_rfm():
-        # Calculate RFM metrics
-        current_date = orders_filtered['order_purchase_timestamp'].max()
-        
-        rfm_data = orders_payments_filtered.groupby('customer_id').agg({
-            'order_purchase_timestamp': lambda x: (current_date - x.max()).days,  # Recency
-            'order_id': 'nunique',  # Frequency
-            'payment_value': 'sum'  # Monetary
-        }).reset_index()
-        
-        rfm_data.columns = ['customer_id', 'recency', 'frequency', 'monetary']
-        
-        # Create RFM scores (1-5 scale)
-        rfm_data['R_score'] = pd.qcut(rfm_data['recency'], 5, labels=[5,4,3,2,1])
-        rfm_data['F_score'] = pd.qcut(rfm_data['frequency'].rank(method='first'), 5, labels=[1,2,3,4,5])
-        rfm_data['M_score'] = pd.qcut(rfm_data['monetary'], 5, labels=[1,2,3,4,5])
-        
-        # Create RFM segment
-        rfm_data['RFM_Score'] = rfm_data['R_score'].astype(str) + rfm_data['F_score'].astype(str) + rfm_data['M_score'].astype(str)
-        
-        # Define customer segments
-        def segment_customers(row):
-            if row['RFM_Score'] in ['555', '554', '544', '545', '454', '455', '445']:
-                return 'Champions'
-            elif row['RFM_Score'] in ['543', '444', '435', '355', '354', '345', '344', '335']:
-                return 'Loyal Customers'
-            elif row['RFM_Score'] in ['553', '551', '552', '541', '542', '533', '532', '531', '452', '451']:
-                return 'Potential Loyalists'
-            elif row['RFM_Score'] in ['512', '511', '422', '421', '412', '411', '311']:
-                return 'New Customers'
-            elif row['RFM_Score'] in ['155', '154', '144', '214', '215', '115', '114']:
-                return 'At Risk'
-            elif row['RFM_Score'] in ['155', '154', '144', '214', '215', '115']:
-                return 'Cannot Lose Them'
-            else:
-                return 'Others'
-        
-        rfm_data['segment'] = rfm_data.apply(segment_customers, axis=1)
-        return rfm_data
-    
     try:
-        rfm_data = calculate_rfm()
+        # Node "rfm" di-memo per rentang tanggal yang dipilih
+        rfm_data = run.get("rfm")
         
         col1, col2 = st.columns([2, 1])
         
@@ -532,6 +610,7 @@ elif page == "Customer & Market Analysis":
         with col2:
             # Segment Distribution
             segment_counts = rfm_data['segment'].value_counts()
+            segment_counts = segment_counts[segment_counts > 0]
             fig_segments = px.pie(
                 values=segment_counts.values,
                 names=segment_counts.index,
@@ -550,20 +629,17 @@ elif page == "Customer & Market Analysis":
     st.subheader("🗺️ Top Cities by Orders")
 
     # Merge orders & customers untuk info city
-    customer_geo = orders_filtered.merge(customers, on='customer_id', how='left')
+    customer_geo = merge_on_key(orders_filtered, customers, on='customer_key', how='left')
 
     # Hitung total orders & unique customers per city
-    city_stats = customer_geo.groupby(['customer_city', 'customer_state']).agg(
-        total_orders=('order_id', 'nunique'),
-        unique_customers=('customer_id', 'nunique')
+    city_stats = customer_geo.groupby(['customer_city', 'customer_state'], observed=True).agg(
+        total_orders=('order_key', 'nunique'),
+        unique_customers=('customer_key', 'nunique')
     ).reset_index()
 
-    # Ambil satu titik (pertama) per city-state
-    geo_city_unique = geolocation.drop_duplicates(subset=['geolocation_city', 'geolocation_state'])
-
-    # Merge dengan city stats
+    # Merge dengan centroid kota (median titik geolocation per city-state)
     city_geo = city_stats.merge(
-        geo_city_unique[['geolocation_city', 'geolocation_state', 'geolocation_lat', 'geolocation_lng']],
+        geo_city[['geolocation_city', 'geolocation_state', 'geolocation_lat', 'geolocation_lng']],
         left_on=['customer_city', 'customer_state'],
         right_on=['geolocation_city', 'geolocation_state'],
         how='left'
@@ -603,21 +679,12 @@ elif page == "Customer & Market Analysis":
 
     with col2:
         st.markdown("#### 🗺️ Map: Cities by Total Orders")
-        m_city = folium.Map(location=[-2.5489, 118.0149], zoom_start=5, tiles="CartoDB positron")
-        for _, row in top_cities.iterrows():
-            if pd.notna(row['geolocation_lat']) and pd.notna(row['geolocation_lng']):
-                folium.CircleMarker(
-                    location=[row['geolocation_lat'], row['geolocation_lng']],
-                    radius=6,  # <<< FIX ukuran titik jadi sama semua
-                    color='blue',
-                    fill=True,
-                    fill_opacity=0.7,
-                    popup=folium.Popup(f"""
-                        <b>City:</b> {row['customer_city']}<br>
-                        <b>Total Orders:</b> {row['total_orders']}<br>
-                    """, max_width=250)
-                ).add_to(m_city)
-        st_folium(m_city, width=700, height=500)
+        # Satu layer GeoJson (popup dibuat saat diklik); "All" digabung per sel grid
+        m_city = point_map(
+            top_cities, 'geolocation_lat', 'geolocation_lng', 'customer_city', 'total_orders',
+            'City', 'Total Orders', color='blue', radius=6
+        )
+        st_folium(m_city, width=700, height=500, returned_objects=[], key="map_city")
 
     # ===================
     # 📌 Top States by Orders
@@ -625,17 +692,11 @@ elif page == "Customer & Market Analysis":
     st.subheader("🗺️ Top States by Orders")
 
     # Hitung total orders & revenue per state
-    state_geo = customer_geo.groupby('customer_state').agg(
-        total_orders=('order_id', 'nunique'),
-        total_revenue=('order_id', lambda x: orders_payments_filtered[orders_payments_filtered['order_id'].isin(x.index)]['payment_value'].sum())
-    ).reset_index()
-
-    # Ambil satu titik (pertama) per state
-    geo_state_unique = geolocation.drop_duplicates(subset=['geolocation_state'])
+    state_geo = state_totals(customer_geo, orders_payments_filtered)
 
-    # Merge dengan state stats
+    # Merge dengan centroid provinsi
     state_geo = state_geo.merge(
-        geo_state_unique[['geolocation_state', 'geolocation_lat', 'geolocation_lng']],
+        geo_state[['geolocation_state', 'geolocation_lat', 'geolocation_lng']],
         left_on='customer_state',
         right_on='geolocation_state',
         how='left'
@@ -675,21 +736,11 @@ elif page == "Customer & Market Analysis":
 
     with col2:
         st.markdown("#### 🗺️ Map: States by Total Orders")
-        m_state = folium.Map(location=[-2.5489, 118.0149], zoom_start=5, tiles="CartoDB positron")
-        for _, row in top_states.iterrows():
-            if pd.notna(row['geolocation_lat']) and pd.notna(row['geolocation_lng']):
-                folium.CircleMarker(
-                    location=[row['geolocation_lat'], row['geolocation_lng']],
-                    radius=8,  # <<< FIX ukuran titik jadi sama semua
-                    color='green',
-                    fill=True,
-                    fill_opacity=0.7,
-                    popup=folium.Popup(f"""
-                        <b>State:</b> {row['customer_state']}<br>
-                        <b>Total Orders:</b> {row['total_orders']}<br>
-                    """, max_width=250)
-                ).add_to(m_state)
-        st_folium(m_state, width=700, height=500)
+        m_state = point_map(
+            top_states, 'geolocation_lat', 'geolocation_lng', 'customer_state', 'total_orders',
+            'State', 'Total Orders', color='green', radius=8
+        )
+        st_folium(m_state, width=700, height=500, returned_objects=[], key="map_state")
 
 
     # ===================
@@ -701,20 +752,25 @@ elif page == "Customer & Market Analysis":
     
     with col1:
         # Customer Lifetime Value Distribution
-        clv_data = orders_payments_filtered.groupby('customer_id').agg({
+        clv_data = orders_payments_filtered.groupby('customer_key').agg({
             'payment_value': 'sum',
-            'order_id': 'nunique'
+            'order_key': 'nunique'
         }).reset_index()
-        clv_data.columns = ['customer_id', 'total_spent', 'order_count']
+        clv_data.columns = ['customer_key', 'total_spent', 'order_count']
         
-        fig_clv = px.histogram(
-            clv_data,
-            x='total_spent',
-            nbins=50,
+        # Dibin di server: browser hanya menerima 50 bar, bukan satu titik per customer
+        clv_counts, clv_edges = histogram(clv_data['total_spent'], 50)
+        fig_clv = go.Figure(bar_trace(
+            clv_counts, clv_edges,
+            hovertemplate='€ %{customdata[0]:,.0f}–%{customdata[1]:,.0f}: %{y} customer<extra></extra>'
+        ))
+        fig_clv.update_layout(
             title='Customer Lifetime Value Distribution',
-            labels={'total_spent': 'Total Spent (€)', 'count': 'Number of Customers'}
+            xaxis_title='Total Spent (€)',
+            yaxis_title='Number of Customers',
+            bargap=0.05,
+            height=350
         )
-        fig_clv.update_layout(height=350)
         st.plotly_chart(fig_clv, use_container_width=True)
         
         # CLV Statistics
@@ -725,14 +781,18 @@ elif page == "Customer & Market Analysis":
     
     with col2:
         # Purchase Frequency
-        fig_freq = px.histogram(
-            clv_data,
-            x='order_count',
-            nbins=20,
+        freq_counts, freq_edges = histogram(clv_data['order_count'], 20, integer=True)
+        fig_freq = go.Figure(bar_trace(
+            freq_counts, freq_edges,
+            hovertemplate='%{customdata[0]:.0f}–%{customdata[1]:.0f} orders: %{y} customer<extra></extra>'
+        ))
+        fig_freq.update_layout(
             title='Purchase Frequency Distribution',
-            labels={'order_count': 'Number of Orders', 'count': 'Number of Customers'}
+            xaxis_title='Number of Orders',
+            yaxis_title='Number of Customers',
+            bargap=0.05,
+            height=350
         )
-        fig_freq.update_layout(height=350)
         st.plotly_chart(fig_freq, use_container_width=True)
         
         # Frequency Statistics
@@ -761,7 +821,7 @@ elif page == "Customer & Market Analysis":
     
     with col2:
         # Payment method trend over time
-        payment_trend = orders_payments_filtered.groupby(['year_month', 'payment_type']).size().reset_index(name='count')
+        payment_trend = orders_payments_filtered.groupby(['year_month', 'payment_type'], observed=True).size().reset_index(name='count')
         fig_payment_trend = px.line(
             payment_trend,
             x='year_month',
@@ -780,7 +840,7 @@ elif page == "Customer & Market Analysis":
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        total_customers = orders_filtered['customer_id'].nunique()
+        total_customers = orders_filtered['customer_key'].nunique()
         avg_clv = clv_data['total_spent'].mean() if 'clv_data' in locals() else 0
         st.info(f"""
         **Customer Base**
@@ -791,7 +851,7 @@ elif page == "Customer & Market Analysis":
     
     with col2:
         top_payment = payments['payment_type'].value_counts().index[0]
-        top_state = customer_geo.groupby('customer_state').size().idxmax()
+        top_state = customer_geo.groupby('customer_state', observed=True).size().idxmax()
         st.success(f"""
         **Market Preferences**
         - Top Payment: {top_payment}
@@ -818,27 +878,31 @@ elif page == "Customer & Market Analysis":
 elif page == "Product & Leads Performance":
     st.header("📌 Product & Leads Performance")
     st.markdown("*Mengoptimalkan product mix dan inventory management*")
+    products = data["products"]
+    order_reviews = data["order_reviews"]
+    orders_filtered = run.get("orders_filtered")
     
     # ===================
     # Category Performance - Treemap
     # ===================
     st.subheader("📊 Category Performance")
     
+    # Dikunci pada rentang tanggal: orders_filtered berubah bersama filter periode
     @st.cache_data
-    def get_category_performance():
+    def get_category_performance(period_start, period_end):
         if not products.empty and not order_items.empty:
             # Merge order items with products
-            product_sales = order_items.merge(products, on='product_id', how='left')
+            product_sales = merge_on_key(order_items, products, on='product_key', how='left')
             
             # Filter by date range
-            order_ids_filtered = orders_filtered['order_id'].tolist()
-            product_sales_filtered = product_sales[product_sales['order_id'].isin(order_ids_filtered)]
+            order_keys_filtered = orders_filtered['order_key'].to_numpy()
+            product_sales_filtered = product_sales[product_sales['order_key'].isin(order_keys_filtered)]
             
             # Calculate category performance
-            category_performance = product_sales_filtered.groupby('product_category_name').agg({
+            category_performance = product_sales_filtered.groupby('product_category_name', observed=True).agg({
                 'order_item_id': 'count',
                 'price': 'sum',
-                'product_id': 'nunique'
+                'product_key': 'nunique'
             }).reset_index()
             
             category_performance.columns = ['category', 'total_items_sold', 'total_revenue', 'unique_products']
@@ -847,7 +911,7 @@ elif page == "Product & Leads Performance":
             return category_performance
         return pd.DataFrame()
     
-    category_perf = get_category_performance()
+    category_perf = get_category_performance(period_start, period_end)
     
     if not category_perf.empty:
         col1, col2 = st.columns([2, 1])
@@ -880,35 +944,35 @@ elif page == "Product & Leads Performance":
     st.subheader("⭐ Product Rating vs Sales Performance")
 
     @st.cache_data
-    def get_product_rating_sales():
+    def get_product_rating_sales(period_start, period_end):
         if not products.empty and not order_items.empty and not order_reviews.empty:
             # Gabungkan order_items dengan produk
-            product_sales = order_items.merge(products, on='product_id', how='left')
+            product_sales = merge_on_key(order_items, products, on='product_key', how='left')
 
-            # Filter berdasarkan order_id dalam rentang tanggal yang dipilih
-            order_ids_filtered = orders_filtered['order_id'].tolist()
-            product_sales_filtered = product_sales[product_sales['order_id'].isin(order_ids_filtered)]
+            # Filter berdasarkan order_key dalam rentang tanggal yang dipilih
+            order_keys_filtered = orders_filtered['order_key'].to_numpy()
+            product_sales_filtered = product_sales[product_sales['order_key'].isin(order_keys_filtered)]
 
             # Hitung volume penjualan dan pendapatan
-            product_metrics = product_sales_filtered.groupby(['product_id', 'product_category_name']).agg({
+            product_metrics = product_sales_filtered.groupby(['product_key', 'product_category_name'], observed=True).agg({
                 'order_item_id': 'count',
                 'price': 'sum'
             }).reset_index()
 
             # Tambahkan atribut produk tambahan (jika tersedia)
-            selected_cols = ['product_id', 'product_name_lenght', 'product_description_lenght',
+            selected_cols = ['product_key', 'product_name_lenght', 'product_description_lenght',
                             'product_photos_qty', 'product_weight_g', 'product_length_cm',
                             'product_height_cm', 'product_width_cm']
             selected_cols = [col for col in selected_cols if col in products.columns]
-            product_metrics = product_metrics.merge(products[selected_cols], on='product_id', how='left')
+            product_metrics = product_metrics.merge(products[selected_cols], on='product_key', how='left')
 
             # Gabungkan dengan order_reviews untuk hitung rata-rata rating produk
-            reviews_joined = order_items.merge(order_reviews[['order_id', 'review_score']], on='order_id', how='left')
-            avg_rating = reviews_joined.groupby('product_id')['review_score'].mean().reset_index()
+            reviews_joined = order_items.merge(order_reviews[['order_key', 'review_score']], on='order_key', how='left')
+            avg_rating = reviews_joined.groupby('product_key')['review_score'].mean().reset_index()
             avg_rating.rename(columns={'review_score': 'avg_rating'}, inplace=True)
 
             # Gabungkan dengan metrics
-            product_metrics = product_metrics.merge(avg_rating, on='product_id', how='left')
+            product_metrics = product_metrics.merge(avg_rating, on='product_key', how='left')
 
             # Rename kolom untuk visualisasi
             product_metrics = product_metrics.rename(columns={
@@ -928,7 +992,7 @@ elif page == "Product & Leads Performance":
         return pd.DataFrame()
 
     # Panggil data
-    product_rating_sales = get_product_rating_sales()
+    product_rating_sales = get_product_rating_sales(period_start, period_end)
 
     # Visualisasi
     if not product_rating_sales.empty:
@@ -958,104 +1022,83 @@ elif page == "Product & Leads Performance":
 
 
     # ===================
-    # Lead Funnel Analysis (Simulated)
+    # Lead Funnel Analysis (MQL -> Closed Deal)
     # ===================
     st.subheader("🔄 Lead Conversion Funnel")
-    
-    # Since we don't have actual lead data, we'll simulate it based on product categories
+
+    # Dikunci pada rentang tanggal (first_contact_date) dari filter periode
     @st.cache_data
-    def simulate_lead_funnel():
-        if not category_perf.empty:
-            # Simulate lead data based on category performance
-            funnel_data = category_perf.head(10).copy()
-            
-            # Simulate funnel stages
-            funnel_data['leads_generated'] = funnel_data['total_items_sold'] * np.random.uniform(2, 5, len(funnel_data))
-            funnel_data['leads_qualified'] = funnel_data['leads_generated'] * np.random.uniform(0.3, 0.7, len(funnel_data))
-            funnel_data['leads_closed'] = funnel_data['leads_qualified'] * np.random.uniform(0.1, 0.4, len(funnel_data))
-            
-            # Calculate conversion rates
-            funnel_data['qualification_rate'] = funnel_data['leads_qualified'] / funnel_data['leads_generated']
-            funnel_data['closing_rate'] = funnel_data['leads_closed'] / funnel_data['leads_qualified']
-            funnel_data['overall_conversion'] = funnel_data['leads_closed'] / funnel_data['leads_generated']
-            
-            return funnel_data
-        return pd.DataFrame()
-    
-    lead_funnel = simulate_lead_funnel()
-    
-    if not lead_funnel.empty:
+    def lead_funnel_for_period(period_start, period_end):
+        period_leads = leads_in_period(load_lead_facts(), period_start, period_end)
+        return {
+            'totals': funnel_totals(period_leads),
+            'origin': conversion_by(period_leads, 'origin'),
+            'landing_page': conversion_by(period_leads, 'landing_page_id', min_leads=10),
+            'segment': deals_by(period_leads, 'business_segment'),
+            'lead_type': deals_by(period_leads, 'lead_type'),
+            'time_to_close': time_to_close_histogram(period_leads),
+        }
+
+    lead_funnel = lead_funnel_for_period(period_start, period_end)
+    lead_totals = lead_funnel['totals']
+
+    if lead_totals['leads'] > 0:
         col1, col2 = st.columns(2)
-        
+
         with col1:
-            # Funnel visualization
-            total_leads = lead_funnel['leads_generated'].sum()
-            total_qualified = lead_funnel['leads_qualified'].sum()
-            total_closed = lead_funnel['leads_closed'].sum()
-            
             fig_funnel = go.Figure(go.Funnel(
-                y=['Leads Generated', 'Leads Qualified', 'Leads Closed'],
-                x=[total_leads, total_qualified, total_closed],
+                y=['Marketing Qualified Leads', 'Closed Deals'],
+                x=[lead_totals['leads'], lead_totals['closed']],
                 textinfo="value+percent initial"
             ))
             fig_funnel.update_layout(title='Overall Lead Conversion Funnel')
             st.plotly_chart(fig_funnel, use_container_width=True)
-        
+
         with col2:
-            # Conversion rates by category
+            # Conversion rate per sumber lead
             fig_conversion = px.bar(
-                lead_funnel.head(8),
-                x='category',
-                y='overall_conversion',
-                title='Conversion Rate by Category',
-                labels={'overall_conversion': 'Conversion Rate', 'category': 'Category'}
+                lead_funnel['origin'],
+                x='origin',
+                y='conversion',
+                hover_data=['leads', 'closed'],
+                title='Conversion Rate by Lead Origin',
+                labels={'conversion': 'Conversion Rate', 'origin': 'Origin', 'leads': 'MQL', 'closed': 'Closed'}
             )
-
-            fig_conversion.update_layout(xaxis=dict(tickangle=45))
+            fig_conversion.update_layout(xaxis=dict(tickangle=45), yaxis=dict(tickformat='.0%'))
             st.plotly_chart(fig_conversion, use_container_width=True)
-
+    else:
+        st.info("Tidak ada lead (MQL) pada periode yang dipilih.")
 
     # ===================
-    # Lead Segmentation (Simulated)
+    # Lead Segmentation (deal closed)
     # ===================
     st.subheader("🎯 Lead Segmentation")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        # Simulated lead segmentation by business type
-        business_segments = {
-            'Retail': 35,
-            'Wholesale': 25,
-            'E-commerce': 20,
-            'B2B': 15,
-            'Others': 5
-        }
-        
-        fig_segments = px.pie(
-            values=list(business_segments.values()),
-            names=list(business_segments.keys()),
-            title='Lead Segmentation by Business Type'
-        )
-        st.plotly_chart(fig_segments, use_container_width=True)
-    
-    with col2:
-        # Lead origin simulation
-        lead_origins = {
-            'Organic Search': 30,
-            'Social Media': 25,
-            'Email Campaign': 20,
-            'Referral': 15,
-            'Direct': 10
-        }
-        
-        fig_origins = px.bar(
-            x=list(lead_origins.keys()),
-            y=list(lead_origins.values()),
-            title='Lead Sources Distribution',
-            labels={'x': 'Lead Source', 'y': 'Percentage (%)'}
-        )
-        st.plotly_chart(fig_origins, use_container_width=True)
+
+    if lead_totals['closed'] > 0:
+        col1, col2 = st.columns(2)
+
+        with col1:
+            fig_segments = px.pie(
+                lead_funnel['segment'].head(10),
+                values='deals',
+                names='business_segment',
+                title='Closed Deals by Business Segment (Top 10)'
+            )
+            st.plotly_chart(fig_segments, use_container_width=True)
+
+        with col2:
+            fig_lead_type = px.bar(
+                lead_funnel['lead_type'],
+                x='lead_type',
+                y='deals',
+                color='median_days_to_close',
+                title='Closed Deals by Lead Type',
+                labels={'lead_type': 'Lead Type', 'deals': 'Closed Deals',
+                        'median_days_to_close': 'Median Hari ke Closing'}
+            )
+            st.plotly_chart(fig_lead_type, use_container_width=True)
+    else:
+        st.info("Belum ada deal closed pada periode yang dipilih.")
 
     # ===================
     # Inventory Status (Simulated)
@@ -1118,39 +1161,48 @@ elif page == "Product & Leads Performance":
             st.plotly_chart(fig_out_stock, use_container_width=True)
 
     # ===================
-    # Product-Lead Correlation (Simulated)
+    # Landing Page & Time-to-Close
     # ===================
-    st.subheader("🎯 Product-Lead Correlation Analysis")
-    
-    if not lead_funnel.empty:
+    st.subheader("🎯 Landing Page & Time-to-Close")
+
+    if lead_totals['leads'] > 0:
         col1, col2 = st.columns(2)
-        
+
         with col1:
-            # Products with highest closing rate
-            top_converting = lead_funnel.nlargest(10, 'closing_rate')[['category', 'closing_rate', 'leads_closed']]
-            
-            fig_top_convert = px.bar(
-                top_converting,
-                x='closing_rate',
-                y='category',
-                orientation='h',
-                title='Top 10 Categories by Closing Rate',
-                labels={'closing_rate': 'Closing Rate', 'category': 'Category'}
-            )
-            st.plotly_chart(fig_top_convert, use_container_width=True)
-        
+            # Landing page dengan conversion tertinggi (minimal 10 MQL)
+            top_landing = lead_funnel['landing_page'].nlargest(10, 'conversion')
+            if not top_landing.empty:
+                fig_top_convert = px.bar(
+                    top_landing.assign(landing_page=top_landing['landing_page_id'].astype(str).str[:8]),
+                    x='conversion',
+                    y='landing_page',
+                    orientation='h',
+                    hover_data=['landing_page_id', 'leads', 'closed'],
+                    title='Top 10 Landing Pages by Conversion Rate (min. 10 MQL)',
+                    labels={'conversion': 'Conversion Rate', 'landing_page': 'Landing Page'}
+                )
+                fig_top_convert.update_layout(xaxis=dict(tickformat='.0%'))
+                st.plotly_chart(fig_top_convert, use_container_width=True)
+            else:
+                st.info("Belum ada landing page dengan minimal 10 MQL.")
+
         with col2:
-            # Lead volume vs conversion rate
-            fig_volume_conversion = px.scatter(
-                lead_funnel,
-                x='leads_generated',
-                y='closing_rate',
-                size='total_revenue',
-                color='qualification_rate',
-                title='Lead Volume vs Conversion Rate',
-                labels={'leads_generated': 'Leads Generated', 'closing_rate': 'Closing Rate'}
-            )
-            st.plotly_chart(fig_volume_conversion, use_container_width=True)
+            time_to_close = lead_funnel['time_to_close']
+            if not time_to_close.empty:
+                fig_close_time = go.Figure(go.Bar(
+                    x=(time_to_close['bin_start'] + time_to_close['bin_end']) / 2,
+                    y=time_to_close['deals'],
+                    width=time_to_close['bin_end'] - time_to_close['bin_start'],
+                    customdata=time_to_close[['bin_start', 'bin_end']],
+                    hovertemplate='%{customdata[0]:.0f}–%{customdata[1]:.0f} hari: %{y} deal<extra></extra>'
+                ))
+                fig_close_time.update_layout(
+                    title=f"Time to Close (median {lead_totals['median_days_to_close']:.0f} hari)",
+                    xaxis_title='Hari sejak first contact', yaxis_title='Closed Deals', bargap=0.05
+                )
+                st.plotly_chart(fig_close_time, use_container_width=True)
+            else:
+                st.info("Belum ada deal closed pada periode yang dipilih.")
 
     # ===================
     # Performance Summary
@@ -1176,19 +1228,19 @@ elif page == "Product & Leads Performance":
             st.info("**Product data not available**")
     
     with col2:
-        if not lead_funnel.empty:
-            avg_conversion = lead_funnel['overall_conversion'].mean()
-            avg_qualification = lead_funnel['qualification_rate'].mean()
-            avg_closing = lead_funnel['closing_rate'].mean()
-            
+        if lead_totals['leads'] > 0:
+            # Median NaN jika belum ada deal closed pada periode ini
+            median_close = lead_totals['median_days_to_close']
+            median_close_text = "N/A" if pd.isna(median_close) else f"{median_close:.0f} hari"
             st.success(f"""
             **Lead Performance**
-            - Avg Conversion: {avg_conversion:.1%}
-            - Avg Qualification: {avg_qualification:.1%}
-            - Avg Closing: {avg_closing:.1%}
+            - MQL: {lead_totals['leads']:,}
+            - Closed Deals: {lead_totals['closed']:,}
+            - Conversion: {lead_totals['conversion']:.1%}
+            - Median Time to Close: {median_close_text}
             """)
         else:
-            st.success("**Lead data simulated**")
+            st.success("**Lead data not available**")
     
     with col3:
         st.warning(f"""
@@ -1225,30 +1277,32 @@ elif page == "Product & Leads Performance":
 elif page == "Operational Excellence":
     st.header("📌 Operational Excellence")
     st.markdown("**Meningkatkan efisiensi operasional dan customer satisfaction**")
+    orders_filtered, orders_items_filtered, freight_histogram, delivery_histogram = run.get(
+        "orders_filtered", "orders_items_filtered", "freight_histogram", "delivery_histogram"
+    )
     
     # Metrics Overview
     col1, col2, col3, col4 = st.columns(4)
     
     # Calculate key operational metrics using available data
     # Calculate delivery time for delivered orders
+    # delivery_days (approved -> delivered) sudah dihitung di preprocess
     delivered_orders = orders_filtered[
         (orders_filtered['order_status'] == 'delivered') & 
-        (orders_filtered['order_delivered_customer_date'].notna()) &
-        (orders_filtered['order_approved_at'].notna())
-    ].copy()
+        (orders_filtered['delivery_days'].notna())
+    ]
     
     if not delivered_orders.empty:
-        delivered_orders['order_approved_at'] = pd.to_datetime(delivered_orders['order_approved_at'])
-        delivered_orders['order_delivered_customer_date'] = pd.to_datetime(delivered_orders['order_delivered_customer_date'])
-        delivered_orders['delivery_time'] = (delivered_orders['order_delivered_customer_date'] - 
-                                           delivered_orders['order_approved_at']).dt.days
-        avg_delivery_time = delivered_orders['delivery_time'].mean()
+        avg_delivery_time = delivered_orders['delivery_days'].mean()
     else:
         avg_delivery_time = 0
     
-    # Use order_items from filtered data
-    total_freight_cost = order_items['freight_value'].sum() if 'freight_value' in order_items.columns else 0
-    avg_freight_per_order = order_items.groupby('order_id')['freight_value'].sum().mean() if 'freight_value' in order_items.columns else 0
+    # Freight per order sudah di-rollup di preprocess, tinggal potongan periode
+    orders_with_items = orders_filtered[orders_filtered['item_count'] > 0]
+    total_freight_cost = orders_with_items['freight_total'].sum()
+    avg_freight_per_order = orders_with_items['freight_total'].mean() if not orders_with_items.empty else 0
+    freight_counts = freight_histogram.window(period_start, period_end)
+    delivery_counts = delivery_histogram.window(period_start, period_end)
     
     with col1:
         st.metric("📦 Avg Delivery Time", f"{avg_delivery_time:.1f} days")
@@ -1270,21 +1324,25 @@ elif page == "Operational Excellence":
         st.subheader("⏱️ Order Processing Time Distribution")
         
         if not delivered_orders.empty:
-            # Filter outliers (delivery time > 100 days)
-            delivered_clean = delivered_orders[delivered_orders['delivery_time'] <= 100]
-            
-            if not delivered_clean.empty:
-                fig_processing = px.histogram(
-                    delivered_clean, 
-                    x='delivery_time',
-                    nbins=30,
+            # Outlier (> 100 hari) sudah dikeluarkan dari histogram harian;
+            # bin 1 hari digabung jadi <= 30 bar
+            if delivery_counts.sum() > 0:
+                bar_counts, bar_edges = coarsen(delivery_counts, delivery_histogram.edges, 30)
+                fig_processing = go.Figure(bar_trace(
+                    bar_counts, bar_edges,
+                    marker_color='#1f77b4',
+                    hovertemplate='%{customdata[0]:.0f}–%{customdata[1]:.0f} hari: %{y} order<extra></extra>'
+                ))
+                fig_processing.update_layout(
                     title="Distribution of Order Processing Time (Days)",
-                    labels={'delivery_time': 'Days to Deliver', 'count': 'Number of Orders'},
-                    color_discrete_sequence=['#1f77b4']
+                    xaxis_title='Days to Deliver',
+                    yaxis_title='Number of Orders',
+                    bargap=0.05
                 )
                 
                 # Add average line
-                avg_proc_time = delivered_clean['delivery_time'].mean()
+                delivery_days = delivered_orders['delivery_days']
+                avg_proc_time = delivery_days[delivery_days <= 100].mean()
                 fig_processing.add_vline(x=avg_proc_time, line_dash="dash", line_color="red", 
                                     annotation_text=f"Avg: {avg_proc_time:.1f} days")
                 
@@ -1297,82 +1355,133 @@ elif page == "Operational Excellence":
     with col2:
         st.subheader("🚚 Freight Cost Analysis")
         
-        if 'freight_value' in order_items.columns:
-            freight_data = order_items[order_items['freight_value'] > 0].copy()
+        if freight_counts.sum() > 0:
+            # Potong di kuantil 95% periode (dari histogram), lalu gabung jadi <= 30 bar
+            edges = freight_histogram.edges
+            q95 = histogram_quantile(freight_counts, edges, 0.95)
+            keep = max(1, int(np.searchsorted(edges, q95, side='left')))
+            median_freight = histogram_quantile(freight_counts[:keep], edges[:keep + 1], 0.5)
+            bar_counts, bar_edges = coarsen(freight_counts[:keep], edges[:keep + 1], 30)
+
+            fig_freight = go.Figure(bar_trace(
+                bar_counts, bar_edges,
+                marker_color='#2ca02c',
+                hovertemplate='€ %{customdata[0]:.2f}–%{customdata[1]:.2f}: %{y} item<extra></extra>'
+            ))
+            fig_freight.update_layout(
+                title="Freight Cost Distribution",
+                xaxis_title='Freight Cost (€)',
+                yaxis_title='Number of Items',
+                bargap=0.05
+            )
+            fig_freight.add_vline(
+                x=median_freight, 
+                line_dash="dash", 
+                line_color="red",
+                annotation_text=f"Median: € {median_freight:.2f}"
+            )
             
-            if not freight_data.empty:
-                q95 = freight_data['freight_value'].quantile(0.95)
-                freight_clean = freight_data[freight_data['freight_value'] <= q95]
-                
-                fig_freight = px.histogram(
-                    freight_clean,
-                    x='freight_value',
-                    nbins=30,
-                    title="Freight Cost Distribution",
-                    labels={
-                        'freight_value': 'Freight Cost (€)',
-                        'count': 'Number of Items'
-                    },
-                    color_discrete_sequence=['#2ca02c']
-                )
-                
-                median_freight = freight_clean['freight_value'].median()
-                fig_freight.add_vline(
-                    x=median_freight, 
-                    line_dash="dash", 
-                    line_color="red",
-                    annotation_text=f"Median: € {median_freight:.2f}"
-                )
-                
-                st.plotly_chart(fig_freight, use_container_width=True)
-            else:
-                st.info("No freight cost data available")
+            st.plotly_chart(fig_freight, use_container_width=True)
         else:
-            st.info("Freight cost data not available in dataset")
+            st.info("No freight cost data available")
+
+    # Row 1b: SLA percentiles per bulan / state / seller
+    st.subheader("📏 SLA Percentiles")
+
+    sla_metrics = {
+        'Delivery (approved → customer)': 'delivery_days',
+        'Approval Lag (purchase → approved)': 'approval_lag_days',
+        'Carrier Handoff (approved → carrier)': 'carrier_handoff_days',
+        'Lateness vs Estimate': 'lateness_days',
+    }
+    sla_dimensions = {'Bulan': 'year_month', 'State': 'customer_state', 'Seller': 'seller_key'}
+    col1, col2 = st.columns(2)
+    with col1:
+        sla_metric_label = st.selectbox("Metrik SLA (hari):", list(sla_metrics.keys()), index=0)
+    with col2:
+        sla_dimension_label = st.selectbox("Kelompokkan per:", list(sla_dimensions.keys()), index=0)
+    sla_metric = sla_metrics[sla_metric_label]
+    sla_by = sla_dimensions[sla_dimension_label]
+
+    if sla_by == 'customer_state':
+        customer_state = data["customers"].set_index('customer_key')['customer_state']
+        sla_frame = orders_filtered.assign(customer_state=orders_filtered['customer_key'].map(customer_state))
+    elif sla_by == 'seller_key':
+        # Satu baris per (order, seller); kolom durasi ikut dari orders saat merge
+        sla_frame = orders_items_filtered.drop_duplicates(['order_key', 'seller_key'])
+    else:
+        sla_frame = orders_filtered
+
+    sla_table = sla_percentiles(sla_frame, sla_metric, sla_by, min_count=5)
+    if not sla_table.empty:
+        sla_table['on_time_rate'] = on_time_rate(sla_frame, by=sla_by).reindex(sla_table[sla_by]).to_numpy() * 100
+        if sla_by == 'year_month':
+            sla_table = sla_table.sort_values('year_month')
+        else:
+            sla_table = sla_table.head(20)
+        if sla_by == 'seller_key':
+            sla_table.insert(0, 'seller_id', data.decode('seller', sla_table['seller_key']))
+            sla_table = sla_table.drop(columns='seller_key')
+        st.dataframe(
+            sla_table,
+            column_config={
+                'year_month': 'Bulan',
+                'customer_state': 'State',
+                'seller_id': 'Seller ID',
+                'orders': 'Orders',
+                'p50': st.column_config.NumberColumn('P50', format="%.1f"),
+                'p90': st.column_config.NumberColumn('P90', format="%.1f"),
+                'p95': st.column_config.NumberColumn('P95', format="%.1f"),
+                'on_time_rate': st.column_config.NumberColumn('On-time (%)', format="%.1f%%"),
+            },
+            use_container_width=True,
+            hide_index=True
+        )
+        st.caption("Minimal 5 order per grup. State/Seller: 20 grup dengan order terbanyak. "
+                   "On-time = sampai paling lambat di tanggal estimasi.")
+    else:
+        st.info("Belum cukup data untuk SLA pada periode ini.")
 
     # Row 2: Seller Performance (sendiri, bawah)
     st.subheader("🏆 Seller Performance Analysis")
 
-    # Check if we have seller data and delivery times
-    if not delivered_orders.empty and 'seller_id' in order_items.columns:
-        # Merge delivery data with seller info
-        seller_delivery = delivered_orders.merge(
-            order_items[['order_id', 'seller_id']], on='order_id', how='inner'
+    # Ringkasan per seller dijumlah dari partisi bulanan (periode dibulatkan ke bulan penuh)
+    seller_facts = run.get("seller_facts")
+    seller_performance = seller_facts.summary(
+        month_code(period_start) if period_start is not None else None,
+        month_code(period_end) if period_end is not None else None,
+    )
+    # Minimal 5 order yang sudah terkirim agar rata-rata pengiriman bermakna
+    seller_performance = seller_performance[seller_performance['delivered'] >= 5]
+
+    if not seller_performance.empty:
+        # 50 seller dengan volume order terbesar
+        top_volume_sellers = top_n(seller_performance, 'orders', n=50)
+        fig_seller = px.scatter(
+            top_volume_sellers,
+            x='orders',
+            y='avg_delivery_days',
+            size='revenue',
+            color='late_rate',
+            hover_data=['seller_city', 'seller_state', 'p90_delivery_days', 'review_score'],
+            title="Seller Performance: Volume vs Delivery Time (Top 50 by Orders)",
+            labels={
+                'orders': 'Number of Orders',
+                'avg_delivery_days': 'Average Delivery Time (Days)',
+                'late_rate': 'Late Rate',
+                'revenue': 'Revenue (€)',
+                'p90_delivery_days': 'P90 Delivery (Days)',
+                'review_score': 'Avg Review',
+                'seller_city': 'City',
+                'seller_state': 'State'
+            },
+            color_continuous_scale='OrRd'
         )
-        
-        if not seller_delivery.empty:
-            # Calculate seller performance metrics
-            seller_performance = seller_delivery.groupby('seller_id').agg({
-                'delivery_time': 'mean',
-                'order_id': 'nunique'
-            }).reset_index()
-            
-            seller_performance.columns = ['seller_id', 'avg_delivery_time', 'order_volume']
-            
-            # Filter sellers with at least 5 orders
-            seller_performance = seller_performance[seller_performance['order_volume'] >= 5]
-            
-            if not seller_performance.empty:
-                fig_seller = px.scatter(
-                    seller_performance.head(50),  # Top 50 sellers
-                    x='order_volume',
-                    y='avg_delivery_time',
-                    size='order_volume',
-                    title="Seller Performance: Volume vs Delivery Time",
-                    labels={
-                        'order_volume': 'Number of Orders',
-                        'avg_delivery_time': 'Average Delivery Time (Days)'
-                    },
-                    color_discrete_sequence=['#ff7f0e']
-                )
-                
-                st.plotly_chart(fig_seller, use_container_width=True)
-            else:
-                st.info("Insufficient seller data for performance analysis")
-        else:
-            st.info("Unable to link delivery data with seller information")
+
+        st.plotly_chart(fig_seller, use_container_width=True)
+        st.caption("Periode filter dibulatkan ke bulan penuh untuk metrik seller.")
     else:
-        st.info("Seller performance data not available")
+        st.info("Insufficient seller data for performance analysis")
     
     # Row 3: Operational Insights & Recommendations
     st.subheader("🎯 Key Operational Insights")
@@ -1381,8 +1490,8 @@ elif page == "Operational Excellence":
     
     with col1:
         if not delivered_orders.empty:
-            q25 = delivered_orders['delivery_time'].quantile(0.25)
-            q75 = delivered_orders['delivery_time'].quantile(0.75)
+            q25 = delivered_orders['delivery_days'].quantile(0.25)
+            q75 = delivered_orders['delivery_days'].quantile(0.75)
             
             st.markdown("""
             **⚡ Processing Efficiency**
@@ -1423,9 +1532,8 @@ elif page == "Operational Excellence":
             """)
     
     with col3:
-        if 'freight_value' in order_items.columns:
-            freight_stats = order_items['freight_value'].describe()
-            median_freight = freight_stats['50%']
+        if freight_counts.sum() > 0:
+            median_freight = histogram_quantile(freight_counts, freight_histogram.edges, 0.5)
             
             st.markdown("""
             **🚛 Logistics Optimization**
@@ -1469,6 +1577,8 @@ elif page == "Operational Excellence":
     if not orders_filtered.empty:
         status_summary = orders_filtered['order_status'].value_counts().reset_index()
         status_summary.columns = ['Order Status', 'Count']
+        # order_status kategorikal: buang status yang tidak muncul di periode ini
+        status_summary = status_summary[status_summary['Count'] > 0]
         status_summary['Percentage'] = (status_summary['Count'] / status_summary['Count'].sum() * 100).round(1)
         
         col1, col2 = st.columns(2)
@@ -1497,50 +1607,59 @@ elif page == "Operational Excellence":
         st.info("No order data available for the selected period")
     
     # Additional seller performance table if available
-    if 'seller_performance' in locals() and not seller_performance.empty:
+    if not seller_performance.empty:
         st.subheader("📊 Seller Performance Summary")
-        
-        # Top and bottom performers
-        top_performers = seller_performance.nsmallest(10, 'avg_delivery_time')
-        bottom_performers = seller_performance.nlargest(10, 'avg_delivery_time')
+
+        seller_metrics = {
+            'Avg Delivery (Days)': 'avg_delivery_days',
+            'P90 Delivery (Days)': 'p90_delivery_days',
+            'Late Rate': 'late_rate',
+            'Avg Review': 'review_score',
+            'Revenue (€)': 'revenue',
+            'Total Orders': 'orders',
+        }
+        ranking_label = st.selectbox("Peringkat seller berdasarkan:", list(seller_metrics.keys()), index=0)
+        ranking_metric = seller_metrics[ranking_label]
+        # Untuk metrik waktu/telat, nilai kecil = lebih baik
+        lower_is_better = ranking_metric in ('avg_delivery_days', 'p90_delivery_days', 'late_rate')
+
+        # Top and bottom performers (partial sort, bukan sort seluruh seller)
+        top_performers = top_n(seller_performance, ranking_metric, n=10, ascending=lower_is_better)
+        bottom_performers = top_n(seller_performance, ranking_metric, n=10, ascending=not lower_is_better)
+
+        top_performers = top_performers.assign(
+            seller_id=data.decode('seller', top_performers['seller_key']),
+            late_pct=top_performers['late_rate'] * 100
+        )
+        bottom_performers = bottom_performers.assign(
+            seller_id=data.decode('seller', bottom_performers['seller_key']),
+            late_pct=bottom_performers['late_rate'] * 100
+        )
+        table_columns = ['seller_id', 'seller_city', 'seller_state', 'orders', 'revenue',
+                         'avg_delivery_days', 'p90_delivery_days', 'late_pct', 'review_score']
+        table_config = {
+            'seller_id': 'Seller ID',
+            'seller_city': 'City',
+            'seller_state': 'State',
+            'orders': 'Total Orders',
+            'revenue': st.column_config.NumberColumn('Revenue (€)', format="%.0f"),
+            'avg_delivery_days': st.column_config.NumberColumn('Avg Delivery (Days)', format="%.1f"),
+            'p90_delivery_days': st.column_config.NumberColumn('P90 Delivery (Days)', format="%.0f"),
+            'late_pct': st.column_config.NumberColumn('Late Rate', format="%.1f%%"),
+            'review_score': st.column_config.NumberColumn('Avg Review', format="%.2f"),
+        }
         
         col1, col2 = st.columns(2)
         
         with col1:
-            st.markdown("**🏆 Top Performers (Fastest Delivery)**")
-            if not top_performers.empty:
-                st.dataframe(
-                    top_performers[['seller_id', 'avg_delivery_time', 'order_volume']].round(1),
-                    column_config={
-                        'seller_id': 'Seller ID',
-                        'avg_delivery_time': st.column_config.NumberColumn(
-                            'Avg Delivery (Days)',
-                            format="%.1f"
-                        ),
-                        'order_volume': 'Total Orders'
-                    },
-                    use_container_width=True
-                )
-            else:
-                st.info("No top performer data available")
+            st.markdown(f"**🏆 Top Performers ({ranking_label})**")
+            st.dataframe(top_performers[table_columns], column_config=table_config,
+                         use_container_width=True, hide_index=True)
         
         with col2:
-            st.markdown("**⚠️ Needs Improvement (Slowest Delivery)**")
-            if not bottom_performers.empty:
-                st.dataframe(
-                    bottom_performers[['seller_id', 'avg_delivery_time', 'order_volume']].round(1),
-                    column_config={
-                        'seller_id': 'Seller ID',
-                        'avg_delivery_time': st.column_config.NumberColumn(
-                            'Avg Delivery (Days)',
-                            format="%.1f"
-                        ),
-                        'order_volume': 'Total Orders'
-                    },
-                    use_container_width=True
-                )
-            else:
-                st.info("No underperformer data available")
+            st.markdown(f"**⚠️ Needs Improvement ({ranking_label})**")
+            st.dataframe(bottom_performers[table_columns], column_config=table_config,
+                         use_container_width=True, hide_index=True)
 
 # ================================
 # 📌 Customer Preference Analysis
@@ -1548,11 +1667,8 @@ elif page == "Operational Excellence":
 elif page == "Customer Preference Analysis":
     st.header("📌 Customer Preference Analysis")
     st.markdown("*Analisis ulasan pelanggan untuk memahami preferensi & pengalaman customer*")
-
-    # Merge review dengan products
-    reviews_products = order_reviews.merge(order_items, on='order_id', how='left') \
-                                    .merge(products, on='product_id', how='left') \
-                                    .merge(product_category_name_translation, on='product_category_name', how='left')
+    # Review + produk + kategori sudah di-merge sekali (cache lintas sesi)
+    review_facts = load_review_facts()
 
     # Filter Section - Rapi dalam container
     with st.container():
@@ -1563,8 +1679,7 @@ elif page == "Customer Preference Analysis":
         
         with col_filter1:
             # Dropdown untuk pilih produk
-            product_options = reviews_products['product_category_name_english'].dropna().unique().tolist()
-            product_options.sort()
+            product_options = review_facts.categories
             selected_product = st.selectbox("📦 Pilih Kategori Produk:", product_options)
         
         with col_filter2:
@@ -1579,10 +1694,9 @@ elif page == "Customer Preference Analysis":
         st.markdown("---")
 
     # Filter data sesuai kriteria yang dipilih
-    filtered_reviews = reviews_products[
-        (reviews_products['product_category_name_english'] == selected_product) &
-        (reviews_products['review_score'].isin(rating_filter))
-    ]
+    # Ambil rentang baris kategori dulu, lalu filter rating hanya di baris itu
+    category_reviews = review_facts.for_category(selected_product)
+    filtered_reviews = category_reviews[category_reviews['review_score'].isin(rating_filter)].copy()
 
     # Header dengan metrics utama
     st.markdown(f"### 📊 Overview: {selected_product}")
@@ -1660,8 +1774,6 @@ elif page == "Customer Preference Analysis":
     with col1:
         # Tren review dari waktu ke waktu
         if not filtered_reviews.empty:
-            # Konversi tanggal
-            filtered_reviews['review_creation_date'] = pd.to_datetime(filtered_reviews['review_creation_date'], errors='coerce')
             trend_reviews = filtered_reviews.copy()
             trend_reviews['year_month'] = trend_reviews['review_creation_date'].dt.to_period('M')
             reviews_over_time = trend_reviews.groupby('year_month').agg({
@@ -1702,10 +1814,6 @@ elif page == "Customer Preference Analysis":
     with col2:
         # Analisis rating berdasarkan bulan
         if not filtered_reviews.empty:
-            # Pastikan tanggal sudah terkonversi
-            if 'review_creation_date' not in filtered_reviews.columns or filtered_reviews['review_creation_date'].dtype == 'object':
-                filtered_reviews['review_creation_date'] = pd.to_datetime(filtered_reviews['review_creation_date'], errors='coerce')
-            
             filtered_reviews['month'] = filtered_reviews['review_creation_date'].dt.month
             filtered_reviews['weekday'] = filtered_reviews['review_creation_date'].dt.day_name()
             
@@ -1729,6 +1837,45 @@ elif page == "Customer Preference Analysis":
     # Analisis kata kunci dalam ulasan
     st.markdown("### 🔍 Analisis Kata Kunci Ulasan")
 
+    # Kata/bigram paling khas ulasan positif vs negatif untuk kategori terpilih
+    keyword_counts = load_keyword_counts()
+    keyword_months = keyword_counts.months(selected_product)
+    if keyword_months:
+        month_labels = [label for _, label in keyword_months]
+        if len(month_labels) > 1:
+            start_label, end_label = st.select_slider(
+                "📅 Rentang bulan ulasan:",
+                options=month_labels,
+                value=(month_labels[0], month_labels[-1])
+            )
+        else:
+            start_label = end_label = month_labels[0]
+        keyword_month_code = {label: code for code, label in keyword_months}
+        top_positive_terms, top_negative_terms = keyword_counts.top_terms(
+            selected_product, keyword_month_code[start_label], keyword_month_code[end_label], n=10
+        )
+
+        col_kw1, col_kw2 = st.columns(2)
+        for col, terms, title, color in (
+            (col_kw1, top_positive_terms, "Kata Khas Ulasan Positif (4-5)", "#2ca02c"),
+            (col_kw2, top_negative_terms, "Kata Khas Ulasan Negatif (1-2)", "#d62728"),
+        ):
+            with col:
+                if terms.empty:
+                    st.info("Belum cukup ulasan untuk analisis kata kunci.")
+                    continue
+                terms = terms.assign(strength=terms['z_score'].abs()).iloc[::-1]
+                fig_terms = px.bar(
+                    terms, x='strength', y='term', orientation='h', title=title,
+                    hover_data={'positive': True, 'negative': True, 'strength': ':.2f'},
+                    labels={'strength': 'Kekhasan (z-score log-odds)', 'term': 'Kata / Bigram',
+                            'positive': 'Muncul di ulasan positif', 'negative': 'Muncul di ulasan negatif'}
+                )
+                fig_terms.update_traces(marker_color=color)
+                st.plotly_chart(fig_terms, use_container_width=True)
+        st.caption("Kekhasan dihitung dengan log-odds berprior Dirichlet antara ulasan positif dan negatif, "
+                   "dari semua ulasan berkomentar di kategori ini (tidak terpengaruh filter rating).")
+
     # Opsi terjemahan
     translate_option = st.checkbox("🌐 Tampilkan terjemahan ke Bahasa Indonesia")
 
@@ -1746,13 +1893,15 @@ elif page == "Customer Preference Analysis":
                 if not positive_reviews.empty:
                     # Siapkan data untuk tabel
                     positive_data = []
-                    for _, review in positive_reviews.head(5).iterrows():
-                        title = review['review_comment_title'] or "-"
-                        message = review['review_comment_message']
-                        
-                        if translate_option:
-                            title = translate_text(title, target_lang='id')
-                            message = translate_text(message, target_lang='id')
+                    top_positive = positive_reviews.head(5)
+                    titles = top_positive['review_comment_title'].tolist()
+                    messages = top_positive['review_comment_message'].tolist()
+                    if translate_option:
+                        titles = get_translator().translate_many(titles, target_lang='id')
+                        messages = get_translator().translate_many(messages, target_lang='id')
+
+                    for (_, review), title, message in zip(top_positive.iterrows(), titles, messages):
+                        title = title or "-"
                         
                         # Potong pesan jika terlalu panjang
                         message_short = message[:200] + "..." if len(message) > 200 else message
@@ -1786,13 +1935,15 @@ elif page == "Customer Preference Analysis":
                 if not negative_reviews.empty:
                     # Siapkan data untuk tabel
                     negative_data = []
-                    for _, review in negative_reviews.head(5).iterrows():
-                        title = review['review_comment_title'] or "-"
-                        message = review['review_comment_message']
-                        
-                        if translate_option:
-                            title = translate_text(title, target_lang='id')
-                            message = translate_text(message, target_lang='id')
+                    top_negative = negative_reviews.head(5)
+                    titles = top_negative['review_comment_title'].tolist()
+                    messages = top_negative['review_comment_message'].tolist()
+                    if translate_option:
+                        titles = get_translator().translate_many(titles, target_lang='id')
+                        messages = get_translator().translate_many(messages, target_lang='id')
+
+                    for (_, review), title, message in zip(top_negative.iterrows(), titles, messages):
+                        title = title or "-"
                         
                         # Potong pesan jika terlalu panjang
                         message_short = message[:200] + "..." if len(message) > 200 else message
@@ -1840,7 +1991,9 @@ elif page == "Customer Preference Analysis":
                 search_term = st.text_input(
                     "🔍 Pencarian Cerdas", 
                     placeholder="Cari kata kunci dalam judul atau isi ulasan...",
-                    help="Pencarian akan mencari di judul dan isi ulasan"
+                    help="Pencarian di judul dan isi ulasan, tanpa membedakan huruf besar/aksen. "
+                         "Beberapa kata = semua harus ada, pisahkan dengan OR untuk salah satu, "
+                         "akhiri dengan * untuk awalan kata (mis. entreg*)."
                 )
             
             with col2:
@@ -1850,7 +2003,8 @@ elif page == "Customer Preference Analysis":
                     'Rating (Tinggi → Rendah)': 'review_score_desc',
                     'Rating (Rendah → Tinggi)': 'review_score_asc',
                     'Harga (Tinggi → Rendah)': 'price_desc',
-                    'Harga (Rendah → Tinggi)': 'price_asc'
+                    'Harga (Rendah → Tinggi)': 'price_asc',
+                    'Relevansi Pencarian': 'relevance'
                 }
                 sort_by = st.selectbox(
                     "🧾 Urutkan berdasarkan:", 
@@ -1874,26 +2028,15 @@ elif page == "Customer Preference Analysis":
 
         # Filter berdasarkan kata kunci pencarian
         if search_term:
-            mask = (
-                review_table['review_comment_title'].str.contains(search_term, case=False, na=False) |
-                review_table['review_comment_message'].str.contains(search_term, case=False, na=False)
-            )
-            review_table = review_table[mask]
+            # Hasil indeks sudah terurut relevansi; petakan ke baris tabel fakta
+            hit_ids, _ = load_review_index().search(search_term)
+            hit_rows = pd.Index(review_facts.positions[hit_ids])
+            review_table = review_table.loc[hit_rows[hit_rows.isin(review_table.index)]]
             
             if review_table.empty:
                 st.warning(f"🔍 Tidak ditemukan ulasan yang mengandung kata '{search_term}'")
                 st.stop()
 
-        # Terjemahan jika diperlukan
-        if translate_option:
-            with st.spinner("🌐 Menerjemahkan ulasan..."):
-                review_table['review_comment_title'] = review_table['review_comment_title'].apply(
-                    lambda x: translate_text(x, 'id') if pd.notnull(x) and str(x).strip() != '' else x
-                )
-                review_table['review_comment_message'] = review_table['review_comment_message'].apply(
-                    lambda x: translate_text(x, 'id') if pd.notnull(x) and str(x).strip() != '' else x
-                )
-
         # Aplikasikan pengurutan
         sort_column = sort_options[sort_by]
         if sort_column == 'review_score_desc':
@@ -1904,11 +2047,32 @@ elif page == "Customer Preference Analysis":
             review_table_sorted = review_table.sort_values(by='price', ascending=False)
         elif sort_column == 'price_asc':
             review_table_sorted = review_table.sort_values(by='price', ascending=True)
+        elif sort_column == 'relevance' and search_term:
+            review_table_sorted = review_table
         else:
             review_table_sorted = review_table.sort_values(by='review_creation_date', ascending=False)
 
+        # Paginasi: hanya halaman yang tampil yang diterjemahkan
+        col_page1, col_page2 = st.columns([1, 3])
+        with col_page1:
+            page_size = st.selectbox("Baris per halaman:", [25, 50, 100], index=0)
+        total_rows = len(review_table_sorted)
+        total_pages = max(1, -(-total_rows // page_size))
+        with col_page2:
+            table_page = st.number_input("Halaman:", min_value=1, max_value=total_pages, value=1, step=1)
+        page_offset = (int(table_page) - 1) * page_size
+        page_rows = review_table_sorted.iloc[page_offset:page_offset + page_size].copy()
+        st.caption(f"Menampilkan baris {page_offset + 1:,}–{page_offset + len(page_rows):,} dari {total_rows:,} ulasan")
+
+        # Terjemahan jika diperlukan
+        if translate_option:
+            with st.spinner("🌐 Menerjemahkan ulasan..."):
+                translator = get_translator()
+                page_rows['review_comment_title'] = translator.translate_series(page_rows['review_comment_title'], 'id')
+                page_rows['review_comment_message'] = translator.translate_series(page_rows['review_comment_message'], 'id')
+
         # Ganti nama kolom untuk tampilan
-        display_table = review_table_sorted.rename(columns={
+        display_table = page_rows.rename(columns={
             'review_score': 'Rating',
             'review_comment_title': 'Judul Ulasan',
             'review_comment_message': 'Isi Ulasan',
@@ -2024,6 +2188,11 @@ elif page == "Customer Preference Analysis":
 elif page == "Strategic Recommendations":
     st.header("📌 Strategic Recommendations")
     st.markdown("*Actionable insights untuk growth strategy dan business optimization*")
+    customers = data["customers"]
+    products = data["products"]
+    orders_filtered, orders_payments_filtered, orders_items_filtered = run.get(
+        "orders_filtered", "orders_payments_filtered", "orders_items_filtered"
+    )
 
     # ===================
     # Business Intelligence Summary
@@ -2032,19 +2201,19 @@ elif page == "Strategic Recommendations":
     
     # Calculate key business metrics
     total_revenue = orders_payments_filtered['payment_value'].sum()
-    total_orders = orders_filtered['order_id'].nunique()
-    total_customers = orders_filtered['customer_id'].nunique()
+    total_orders = orders_filtered['order_key'].nunique()
+    total_customers = orders_filtered['customer_key'].nunique()
     avg_order_value = orders_payments_filtered['payment_value'].mean()
     
     # Customer metrics
-    customer_orders = orders_filtered.merge(customers, on='customer_id', how='left')
-    orders_per_customer = customer_orders.groupby('customer_id').size().mean()
+    customer_orders = merge_on_key(orders_filtered, customers, on='customer_key', how='left')
+    orders_per_customer = customer_orders.groupby('customer_key').size().mean()
     
     # Product performance
     if not products.empty and not order_items.empty:
-        product_sales = orders_items_filtered.merge(products, on='product_id', how='left')
-        top_category = product_sales.groupby('product_category_name')['order_item_id'].count().idxmax()
-        category_revenue = product_sales.groupby('product_category_name')['price'].sum().max()
+        product_sales = merge_on_key(orders_items_filtered, products, on='product_key', how='left')
+        top_category = product_sales.groupby('product_category_name', observed=True)['order_item_id'].count().idxmax()
+        category_revenue = product_sales.groupby('product_category_name', observed=True)['price'].sum().max()
     else:
         top_category = "N/A"
         category_revenue = 0
@@ -2458,3 +2627,23 @@ elif page == "Strategic Recommendations":
 # Footer
 st.markdown("---")
 st.markdown("📊 NAH Team | SSDC E-Commerce 2025")
+
+# Waktu render halaman & tabel yang sudah dimuat (hanya yang benar-benar dipakai)
+with st.sidebar.expander("⏱️ Waktu Muat Data"):
+    st.caption(f"Render halaman: {time.perf_counter() - page_start:.2f} detik")
+    for table_name, (seconds, status) in data.timings.items():
+        rate = data.throughput(table_name)
+        rate_text = f", {rate / 2**20:.1f} MB/s" if rate else ""
+        st.caption(f"{table_name}: {seconds:.2f} detik ({status}{rate_text})")
+    # Node graf yang diminta halaman ini: dihitung di rerun ini atau dari memo
+    st.caption("Dataset turunan:")
+    for node_name, seconds, status in run.trace:
+        st.caption(f"{node_name}: {seconds:.2f} detik ({status})")
+    frame_cache = load_frame_cache()
+    if frame_cache is not None:
+        usage = frame_cache.usage()
+        st.caption(
+            f"Frame cache: {usage['memory_entries']} frame, {usage['memory_bytes'] / 2**20:,.0f} MB di memori | "
+            f"hit memori {usage['memory_hits']}, hit disk {usage['disk_hits']}, miss {usage['misses']}, "
+            f"evict {usage['memory_evictions']}/{usage['disk_evictions']}"
+        )
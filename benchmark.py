@@ -0,0 +1,298 @@
+"""Benchmark dashboard.
+
+    python benchmark.py warm-start --data-dir data --runs 3
+    python benchmark.py histogram --rows 100000 1000000 10000000
+    python benchmark.py stream-ingest --orders 50000000 --chunksize 1000000
+
+warm-start: waktu sampai halaman pertama selesai dirender di proses baru,
+dengan cache Parquet sudah hangat dan mode offline aktif (tanpa unduhan).
+
+histogram: ukuran payload JSON dan waktu bangun+serialisasi figure untuk
+px.histogram (semua baris dikirim ke browser) dibanding hitungan NumPy di
+server yang dirender sebagai bar (utils/binning.py).
+
+stream-ingest: bangkitkan CSV orders/items/payments/reviews sintetis lalu
+jalankan ingest streaming (utils/streaming.py) di proses baru; dilaporkan
+waktu dan puncak memori (max RSS) proses tersebut.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app2.py")
+DEFAULT_PAGE = "Executive Overview"
+DEFAULT_HISTOGRAM_ROWS = [100_000, 1_000_000, 10_000_000]
+DEFAULT_STREAM_ORDERS = 50_000_000
+
+
+def first_page(page):
+    # Dijalankan di proses anak: render satu halaman lewat AppTest Streamlit
+    from streamlit.testing.v1 import AppTest
+
+    start = time.perf_counter()
+    at = AppTest.from_file(APP_PATH, default_timeout=600)
+    at.run()
+    if page != DEFAULT_PAGE:
+        at.sidebar.radio[0].set_value(page)
+        at.run()
+    return {
+        "seconds": time.perf_counter() - start,
+        "exceptions": [e.message for e in at.exception],
+    }
+
+
+def _run_child(data_dir, page):
+    # App membaca folder "data" relatif terhadap working directory
+    workdir = os.path.dirname(os.path.abspath(data_dir))
+    env = dict(os.environ, DASHBOARD_OFFLINE="1")
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "_first-page", "--page", page],
+        cwd=workdir, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def warm_start(data_dir, runs, page, cold):
+    if os.path.basename(os.path.normpath(data_dir)) != "data":
+        raise SystemExit("--data-dir harus bernama 'data' (path yang dibaca app2.py)")
+
+    os.environ["DASHBOARD_OFFLINE"] = "1"
+    sys.path.insert(0, os.path.dirname(APP_PATH))
+    from utils.data_loader import CACHE_DIR_NAME, warm_cache
+
+    results = {}
+    if cold:
+        # Salinan CSV tanpa folder .cache: biaya parse CSV di boot pertama
+        with tempfile.TemporaryDirectory() as tmp:
+            cold_dir = os.path.join(tmp, "data")
+            shutil.copytree(data_dir, cold_dir, ignore=shutil.ignore_patterns(CACHE_DIR_NAME))
+            results["cold cache"] = [_run_child(cold_dir, page)]
+
+    statuses = warm_cache(data_dir)
+    missing = [name for name, status in statuses.items() if status == "missing"]
+    print(f"cache hangat; sumber tidak tersedia: {', '.join(missing) or '-'}")
+    results["warm cache"] = [_run_child(data_dir, page) for _ in range(runs)]
+
+    print(f"halaman: {page} (mode offline)")
+    for label, samples in results.items():
+        seconds = sorted(sample["seconds"] for sample in samples)
+        errors = sum(len(sample["exceptions"]) for sample in samples)
+        print(
+            f"{label:<11} n={len(seconds)}  min={seconds[0]:.2f}s  "
+            f"median={seconds[len(seconds) // 2]:.2f}s  exceptions={errors}"
+        )
+
+
+def _timed_payload(build):
+    # Waktu bangun figure + to_json (yang dikirim Streamlit ke browser)
+    start = time.perf_counter()
+    payload = build().to_json()
+    return time.perf_counter() - start, len(payload.encode("utf-8"))
+
+
+def histogram_payload(rows_list, n_bins, seed):
+    import numpy as np
+    import pandas as pd
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    sys.path.insert(0, os.path.dirname(APP_PATH))
+    from utils.binning import bar_trace, histogram
+
+    rng = np.random.default_rng(seed)
+    print(f"{'rows':>11}  {'mode':<10} {'payload':>12} {'seconds':>9}")
+    for rows in rows_list:
+        # Bentuk mirip total_spent: lognormal berekor panjang
+        frame = pd.DataFrame({"value": rng.lognormal(4.5, 0.9, rows).astype(np.float32)})
+        results = {
+            "px": _timed_payload(lambda: px.histogram(frame, x="value", nbins=n_bins)),
+            "server": _timed_payload(lambda: go.Figure(bar_trace(*histogram(frame["value"], n_bins)))),
+        }
+        for mode, (seconds, size) in results.items():
+            print(f"{rows:>11,}  {mode:<10} {size / 1024:>10,.1f}KB {seconds:>8.2f}s")
+
+
+def _hex_ids(keys, salt):
+    # Id hex 32 karakter yang deterministik dari indeks (dua hash splitmix64)
+    import numpy as np
+    from utils.cube import _hash64
+
+    halves = [_hash64(np.asarray(keys, dtype=np.int64) * 16 + salt * 2 + part) for part in (0, 1)]
+    shifts = np.arange(60, -4, -4, dtype=np.uint64)
+    nibbles = np.concatenate([(h[:, None] >> shifts) & np.uint64(15) for h in halves], axis=1)
+    chars = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)[nibbles.astype(np.int64)]
+    return np.ascontiguousarray(chars).view("S32").ravel().astype(str)
+
+
+def synthetic_orders(out_dir, n_orders, chunksize, seed=0):
+    """Tulis CSV sintetis berformat Olist, per chunk supaya generator sendiri hemat memori."""
+    import numpy as np
+    import pandas as pd
+    from utils.data_loader import DATASET_FILES
+
+    rng = np.random.default_rng(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    n_customers, n_products, n_sellers = max(1, int(n_orders * 0.95)), 32_951, 3_095
+    categories = np.array([f"kategori_{i:02d}" for i in range(71)], dtype=object)
+    pd.DataFrame({
+        "product_id": _hex_ids(np.arange(n_products), 2),
+        "product_category_name": categories[rng.integers(0, len(categories), n_products)],
+    }).to_csv(os.path.join(out_dir, "products_dataset.csv"), index=False)
+
+    start = pd.Timestamp("2017-01-01").value // 10**9
+    fmt = "%Y-%m-%d %H:%M:%S"
+    statuses = np.array(["delivered"] * 97 + ["shipped", "canceled", "invoiced"], dtype=object)
+    for lo in range(0, n_orders, chunksize):
+        n = min(chunksize, n_orders - lo)
+        index = np.arange(lo, lo + n)
+        order_ids = _hex_ids(index, 0)
+        purchase = pd.to_datetime(start + rng.integers(0, 730 * 86400, n), unit="s")
+        approved = purchase + pd.to_timedelta(rng.integers(600, 2 * 86400, n), unit="s")
+        delivered = approved + pd.to_timedelta(rng.gamma(2.0, 5.0, n) * 86400, unit="s").floor("s")
+        estimated = (purchase + pd.to_timedelta(rng.integers(15, 40, n), unit="D")).normalize()
+        status = statuses[rng.integers(0, len(statuses), n)]
+        orders = pd.DataFrame({
+            "order_id": order_ids,
+            "customer_id": _hex_ids(rng.integers(0, n_customers, n), 1),
+            "order_status": status,
+            "order_purchase_timestamp": purchase,
+            "order_approved_at": approved,
+            "order_delivered_carrier_date": approved + pd.Timedelta(days=1),
+            "order_delivered_customer_date": delivered.where(status == "delivered"),
+            "order_estimated_delivery_date": estimated,
+        })
+
+        per_order = 1 + rng.poisson(0.15, n)
+        item_orders = np.repeat(np.arange(n), per_order)
+        first = np.repeat(np.cumsum(per_order) - per_order, per_order)
+        items = pd.DataFrame({
+            "order_id": order_ids[item_orders],
+            "order_item_id": np.arange(len(item_orders)) - first + 1,
+            "product_id": _hex_ids(rng.integers(0, n_products, len(item_orders)), 2),
+            "seller_id": _hex_ids(rng.integers(0, n_sellers, len(item_orders)), 3),
+            "shipping_limit_date": purchase[item_orders] + pd.Timedelta(days=6),
+            "price": rng.lognormal(4.3, 0.8, len(item_orders)).round(2),
+            "freight_value": rng.lognormal(2.8, 0.5, len(item_orders)).round(2),
+        })
+        order_value = np.bincount(item_orders, weights=items["price"] + items["freight_value"], minlength=n)
+        payments = pd.DataFrame({
+            "order_id": order_ids,
+            "payment_sequential": 1,
+            "payment_type": np.array(["credit_card", "boleto", "voucher", "debit_card"])[
+                rng.choice(4, n, p=[0.74, 0.19, 0.05, 0.02])],
+            "payment_installments": rng.integers(1, 10, n),
+            "payment_value": order_value.round(2),
+        })
+        reviewed = rng.random(n) < 0.99
+        reviews = pd.DataFrame({
+            "review_id": _hex_ids(index[reviewed], 4),
+            "order_id": order_ids[reviewed],
+            "review_score": rng.choice([1, 2, 3, 4, 5], reviewed.sum(), p=[0.11, 0.03, 0.08, 0.19, 0.59]),
+            "review_comment_title": "",
+            "review_comment_message": "",
+            "review_creation_date": delivered[reviewed].normalize(),
+            "review_answer_timestamp": delivered[reviewed] + pd.Timedelta(days=1),
+        })
+
+        for name, frame in (("orders", orders), ("order_items", items),
+                            ("order_payments", payments), ("order_reviews", reviews)):
+            path = os.path.join(out_dir, DATASET_FILES[name])
+            frame.to_csv(path, mode="w" if lo == 0 else "a", header=lo == 0, index=False, date_format=fmt)
+
+
+def stream_child(data_dir, chunksize):
+    # Dijalankan di proses anak: max RSS-nya hanya milik ingest, bukan generator
+    import resource
+    from utils.streaming import stream_aggregates
+
+    start = time.perf_counter()
+    result = stream_aggregates(data_dir, chunksize=chunksize)
+    return {
+        "seconds": time.perf_counter() - start,
+        # Linux: ru_maxrss dalam KB
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "cube_days": len(result.cube.metrics),
+        "customers": result.n_customers,
+        "seller_partials": len(result.seller_facts.partials),
+        "category_rows": len(result.categories),
+        "sample_rows": len(result.sample),
+    }
+
+
+def stream_ingest(n_orders, chunksize, data_dir, keep):
+    sys.path.insert(0, os.path.dirname(APP_PATH))
+    from utils.streaming import STREAM_COLUMNS
+    from utils.data_loader import DATASET_FILES
+
+    tmp = None
+    if data_dir is None:
+        tmp = tempfile.mkdtemp(prefix="stream-bench-")
+        data_dir = tmp
+    try:
+        if not os.path.exists(os.path.join(data_dir, DATASET_FILES["orders"])):
+            start = time.perf_counter()
+            synthetic_orders(data_dir, n_orders, chunksize)
+            print(f"data sintetis: {n_orders:,} order di {data_dir} ({time.perf_counter() - start:.0f}s)")
+        csv_bytes = sum(os.path.getsize(os.path.join(data_dir, DATASET_FILES[name])) for name in STREAM_COLUMNS)
+
+        env = dict(os.environ, DASHBOARD_OFFLINE="1")
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "_stream-child",
+             "--data-dir", os.path.abspath(data_dir), "--chunksize", str(chunksize)],
+            cwd=os.path.dirname(APP_PATH), env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"CSV {csv_bytes / 2**30:.1f} GB, chunk {chunksize:,} baris")
+        print(f"ingest {result['seconds']:.0f}s, puncak memori {result['peak_rss_mb']:,.0f} MB")
+        print(f"agregat: {result['cube_days']} hari, {result['customers']:,} customer, "
+              f"{result['seller_partials']:,} partisi seller, {result['category_rows']:,} baris kategori, "
+              f"sampel {result['sample_rows']:,} order")
+    finally:
+        if tmp is not None and not keep:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dashboard E-Commerce")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_warm = sub.add_parser("warm-start", help="waktu sampai halaman pertama (proses baru, cache hangat)")
+    p_warm.add_argument("--data-dir", default="data")
+    p_warm.add_argument("--runs", type=int, default=3)
+    p_warm.add_argument("--page", default=DEFAULT_PAGE)
+    p_warm.add_argument("--cold", action="store_true", help="bandingkan juga dengan boot tanpa cache Parquet")
+
+    p_hist = sub.add_parser("histogram", help="payload & waktu render px.histogram vs binning di server")
+    p_hist.add_argument("--rows", type=int, nargs="+", default=DEFAULT_HISTOGRAM_ROWS)
+    p_hist.add_argument("--bins", type=int, default=50)
+    p_hist.add_argument("--seed", type=int, default=0)
+
+    p_stream = sub.add_parser("stream-ingest", help="puncak memori ingest streaming pada data sintetis")
+    p_stream.add_argument("--orders", type=int, default=DEFAULT_STREAM_ORDERS)
+    p_stream.add_argument("--chunksize", type=int, default=1_000_000)
+    p_stream.add_argument("--data-dir", default=None, help="folder data sintetis (dibuat jika belum ada)")
+    p_stream.add_argument("--keep", action="store_true", help="jangan hapus data sintetis sementara")
+
+    p_stream_child = sub.add_parser("_stream-child")
+    p_stream_child.add_argument("--data-dir", required=True)
+    p_stream_child.add_argument("--chunksize", type=int, default=1_000_000)
+
+    p_child = sub.add_parser("_first-page")
+    p_child.add_argument("--page", default=DEFAULT_PAGE)
+
+    args = parser.parse_args()
+    if args.command == "warm-start":
+        warm_start(args.data_dir, args.runs, args.page, args.cold)
+    elif args.command == "histogram":
+        histogram_payload(args.rows, args.bins, args.seed)
+    elif args.command == "stream-ingest":
+        stream_ingest(args.orders, args.chunksize, args.data_dir, args.keep)
+    elif args.command == "_stream-child":
+        print(json.dumps(stream_child(args.data_dir, args.chunksize)))
+    elif args.command == "_first-page":
+        print(json.dumps(first_page(args.page)))
@@ -0,0 +1,124 @@
+"""Smoke test: semua halaman app2.py dirender tanpa exception.
+
+Dataset Olist tidak ikut di repo, jadi test ini membangkitkan versi kecil
+berformat sama (generator di benchmark.py) di folder sementara bernama
+"data" lalu menjalankan app lewat AppTest Streamlit dengan mode offline.
+"""
+import os
+import shutil
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+st = pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import benchmark  # noqa: E402
+from utils.data_loader import DATASET_FILES  # noqa: E402
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_DIR, "app2.py")
+PAGES = [
+    "Executive Overview",
+    "Customer & Market Analysis",
+    "Product & Leads Performance",
+    "Customer Preference Analysis",
+    "Operational Excellence",
+    "Strategic Recommendations",
+]
+N_ORDERS = 3_000
+STATES = ["SP", "RJ", "MG", "RS", "PR"]
+
+
+def _write_dataset(data_dir):
+    benchmark.synthetic_orders(data_dir, N_ORDERS, chunksize=N_ORDERS, seed=1)
+    rng = np.random.default_rng(1)
+
+    n_customers = max(1, int(N_ORDERS * 0.95))
+    state = np.array(STATES)[rng.integers(0, len(STATES), n_customers)]
+    pd.DataFrame({
+        "customer_id": benchmark._hex_ids(np.arange(n_customers), 1),
+        "customer_unique_id": benchmark._hex_ids(rng.integers(0, n_customers, n_customers), 5),
+        "customer_zip_code_prefix": rng.integers(1000, 1100, n_customers),
+        "customer_city": np.char.add("kota_", state),
+        "customer_state": state,
+    }).to_csv(os.path.join(data_dir, DATASET_FILES["customers"]), index=False)
+
+    pd.DataFrame({
+        "geolocation_zip_code_prefix": np.arange(1000, 1100),
+        "geolocation_lat": rng.uniform(-30, -5, 100),
+        "geolocation_lng": rng.uniform(-55, -35, 100),
+        "geolocation_city": [f"kota_{STATES[i % len(STATES)]}" for i in range(100)],
+        "geolocation_state": [STATES[i % len(STATES)] for i in range(100)],
+    }).to_csv(os.path.join(data_dir, DATASET_FILES["geolocation"]), index=False)
+
+    n_sellers = 3_095
+    pd.DataFrame({
+        "seller_id": benchmark._hex_ids(np.arange(n_sellers), 3),
+        "seller_zip_code_prefix": rng.integers(1000, 1100, n_sellers),
+        "seller_city": "kota_SP",
+        "seller_state": np.array(STATES)[rng.integers(0, len(STATES), n_sellers)],
+    }).to_csv(os.path.join(data_dir, DATASET_FILES["sellers"]), index=False)
+
+    pd.DataFrame({
+        "product_category_name": [f"kategori_{i:02d}" for i in range(71)],
+        "product_category_name_english": [f"category_{i:02d}" for i in range(71)],
+    }).to_csv(os.path.join(data_dir, DATASET_FILES["product_cat"]), index=False)
+
+    # Data leads kecil dan ikut di repo
+    for name in ("leads_qualified", "leads_closed"):
+        shutil.copy(os.path.join(REPO_DIR, "data", DATASET_FILES[name]), data_dir)
+
+
+@pytest.fixture(scope="module")
+def app_dir(tmp_path_factory):
+    workdir = tmp_path_factory.mktemp("app")
+    _write_dataset(str(workdir / "data"))
+    return workdir
+
+
+@pytest.fixture
+def app_env(app_dir, monkeypatch):
+    # App membaca folder "data" relatif terhadap working directory
+    monkeypatch.chdir(app_dir)
+    monkeypatch.setenv("DASHBOARD_OFFLINE", "1")
+    monkeypatch.setenv("TRANSLATION_BACKEND", "identity")
+    return app_dir
+
+
+@pytest.mark.parametrize("boot", ["cold", "warm"])
+def test_all_pages_render(app_env, boot):
+    # "cold": cache frame di disk kosong (boot pertama); "warm": frame dibaca
+    # ulang dari file Feather yang ditulis boot sebelumnya
+    if boot == "cold":
+        shutil.rmtree(app_env / "data" / ".cache", ignore_errors=True)
+    # Cache resource/data Streamlit global per proses: mulai dari proses "baru"
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    at = AppTest.from_file(APP_PATH, default_timeout=300)
+    at.run()
+    assert not at.exception, [e.message for e in at.exception]
+    for page in PAGES[1:]:
+        at.sidebar.radio[0].set_value(page)
+        at.run()
+        assert not at.exception, (page, [e.message for e in at.exception])
+
+
+def test_product_page_follows_period(app_env):
+    # Fungsi st.cache_data di halaman produk dikunci pada rentang tanggal,
+    # jadi mengganti periode harus mengganti isi tabel kategori
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    at = AppTest.from_file(APP_PATH, default_timeout=300)
+    at.run()
+    at.sidebar.radio[0].set_value("Product & Leads Performance")
+    at.run()
+    full_period = at.dataframe[0].value.copy()
+
+    start = at.sidebar.date_input[0].value
+    at.sidebar.date_input[1].set_value(start.replace(month=start.month % 12 + 1))
+    at.run()
+    assert not at.exception, [e.message for e in at.exception]
+    assert not at.dataframe[0].value.equals(full_period)
@@ -0,0 +1,42 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from utils.cube import build_daily_cube  # noqa: E402
+
+
+def frames(n=3_000, seed=0):
+    rng = np.random.default_rng(seed)
+    orders = pd.DataFrame({
+        "order_key": np.arange(n),
+        "customer_key": rng.integers(0, 2_000, n),
+        "order_purchase_timestamp": pd.Timestamp("2018-01-01")
+        + pd.to_timedelta(rng.integers(0, 90 * 86400, n), unit="s"),
+    })
+    payments = orders.assign(
+        payment_type=rng.choice(["credit_card", "boleto"], n),
+        payment_value=rng.gamma(2.0, 50.0, n),
+    )
+    items = orders.assign(order_item_id=1)
+    return orders, payments, items
+
+
+def test_customer_sketch_is_opt_in():
+    cube = build_daily_cube(*frames())
+    assert cube.customer_registers is None
+    assert "customers" not in cube.totals(None, None)
+
+
+def test_sketch_estimate_and_merge():
+    orders, payments, items = frames()
+    full = build_daily_cube(orders, payments, items, customer_sketch=True)
+    exact = orders["customer_key"].nunique()
+    assert abs(full.totals(None, None)["customers"] - exact) / exact < 0.05
+
+    half = orders["order_key"] % 2 == 0
+    merged = build_daily_cube(orders[half], payments[half], items[half], customer_sketch=True).merge(
+        build_daily_cube(orders[~half], payments[~half], items[~half], customer_sketch=True)
+    )
+    assert merged.totals(None, None) == pytest.approx(full.totals(None, None))
+    np.testing.assert_array_equal(merged.customer_registers, full.customer_registers)
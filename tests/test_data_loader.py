@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+import utils.data_loader as data_loader  # noqa: E402
+from utils.data_loader import DATASET_FILES, load_table  # noqa: E402
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("DASHBOARD_OFFLINE", "1")
+    pd.DataFrame({
+        "product_category_name": ["beleza_saude", "esporte_lazer"],
+        "product_category_name_english": ["health_beauty", "sports_leisure"],
+    }).to_csv(tmp_path / DATASET_FILES["product_cat"], index=False)
+    return tmp_path
+
+
+def test_touched_csv_hits_cache_on_read_only_dir(data_dir, monkeypatch):
+    assert load_table("product_cat", str(data_dir))[1] == "rebuilt"
+
+    # Isi sama, mtime berubah; manifest tidak bisa ditulis (folder read-only)
+    csv_path = data_dir / DATASET_FILES["product_cat"]
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def read_only(base_path, manifest):
+        raise PermissionError("read-only")
+
+    monkeypatch.setattr(data_loader, "_write_manifest", read_only)
+    df, status = load_table("product_cat", str(data_dir))
+    assert status == "hit"
+    assert list(df["product_category_name_english"]) == ["health_beauty", "sports_leisure"]
+
+
+@pytest.mark.parametrize("engine", ["c", "pyarrow"])
+def test_dates_parsed_as_ns_with_any_engine(tmp_path, engine):
+    path = tmp_path / DATASET_FILES["order_reviews"]
+    pd.DataFrame({
+        "review_id": ["r1", "r2"],
+        "order_id": ["o1", "o2"],
+        "review_score": [5, 1],
+        "review_creation_date": ["2018-01-02 00:00:00", ""],
+        "review_answer_timestamp": ["2018-01-03 10:11:12", "2018-01-04 00:00:00"],
+    }).to_csv(path, index=False)
+
+    df = data_loader.read_csv_with_schema("order_reviews", str(path), engine=engine)
+    assert df["review_creation_date"].dtype == "datetime64[ns]"
+    assert df["review_answer_timestamp"].dtype == "datetime64[ns]"
+    assert df["review_creation_date"].isna().tolist() == [False, True]
+
+
+def test_centroids_do_not_keep_geolocation_resident(data_dir):
+    pd.DataFrame({
+        "geolocation_zip_code_prefix": [1000, 1000, 2000],
+        "geolocation_lat": [-10.0, -12.0, -20.0],
+        "geolocation_lng": [-40.0, -42.0, -50.0],
+        "geolocation_city": ["a", "a", "b"],
+        "geolocation_state": ["SP", "SP", "RJ"],
+    }).to_csv(data_dir / DATASET_FILES["geolocation"], index=False)
+
+    data = data_loader.LazyData(str(data_dir))
+    geo_zip = data["geo_zip"]
+    assert data.timings["geo_zip"][1] == "rebuilt"
+    assert "geolocation" not in data.loaded()
+    assert geo_zip.set_index("geolocation_zip_code_prefix")["geolocation_lat"].to_dict() == {
+        1000: -11.0, 2000: -20.0,
+    }
+
+    # Sumber yang sudah ada di registry dipakai ulang, bukan dibaca lagi
+    data["geolocation"]
+    assert data["geo_city"]["geolocation_city"].tolist() == ["a", "b"]
@@ -0,0 +1,42 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+from utils.frame_cache import FrameCache, code_version  # noqa: E402
+
+
+def test_disk_tier_shared_between_instances(tmp_path):
+    df = pd.DataFrame({"key": [1, 2, 3], "name": ["a", "b", None]})
+    FrameCache(str(tmp_path), namespace="v1").put("orders", df)
+
+    cached, tier = FrameCache(str(tmp_path), namespace="v1").get("orders")
+    assert tier == "disk"
+    pd.testing.assert_frame_equal(pd.DataFrame(cached), df)
+
+
+def test_namespace_change_misses(tmp_path):
+    FrameCache(str(tmp_path), namespace="v1").put("orders", pd.DataFrame({"key": [1]}))
+    assert FrameCache(str(tmp_path), namespace="v2").get("orders") == (None, None)
+
+
+def test_unserializable_frame_kept_in_memory(tmp_path):
+    cache = FrameCache(str(tmp_path))
+    # Kolom object campuran tidak bisa ditulis sebagai Feather
+    df = pd.DataFrame({"mixed": [1, "a", 2.5]})
+    shared = cache.put("mixed", df)
+    assert list(shared["mixed"]) == [1, "a", 2.5]
+    cached, tier = cache.get("mixed")
+    assert cached is shared and tier == "memory"
+    assert not list(tmp_path.iterdir())
+
+
+def test_code_version_tracks_source():
+    def first(df):
+        return df
+
+    def second(df):
+        return df.copy()
+
+    assert code_version(first) == code_version(first)
+    assert code_version(first) != code_version(second)
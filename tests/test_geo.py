@@ -0,0 +1,21 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from utils.geo import state_totals  # noqa: E402
+
+
+def test_state_totals_count_each_payment_once():
+    # Order 1: dua item + dua pembayaran (voucher & kartu), order 3 tanpa pembayaran
+    customer_orders = pd.DataFrame({
+        "order_key": [1, 1, 2, 3, 4],
+        "customer_state": ["SP", "SP", "SP", "RJ", "RJ"],
+    })
+    payments = pd.DataFrame({
+        "order_key": [1, 1, 2, 4, 9],
+        "payment_value": [30.0, 70.0, 50.0, 20.0, 999.0],
+    })
+    totals = state_totals(customer_orders, payments).set_index("customer_state")
+    assert totals["total_orders"].to_dict() == {"RJ": 2, "SP": 2}
+    # Revenue = jumlah pembayaran per order, bukan per baris join item x pembayaran
+    assert totals["total_revenue"].to_dict() == {"RJ": 20.0, "SP": 150.0}
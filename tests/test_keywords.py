@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from utils.keywords import (  # noqa: E402
+    NEGATIVE, POSITIVE, PRIOR_WEIGHT, build_keyword_counts, review_terms, score_bucket,
+)
+from utils.sellers import month_code  # noqa: E402
+
+WORDS = ["entrega", "rapida", "produto", "otimo", "atraso", "quebrado", "bom", "ruim", "chegou", "prazo"]
+
+
+def review_facts(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    messages = [" ".join(rng.choice(WORDS, rng.integers(2, 6))) for _ in range(n)]
+    frame = pd.DataFrame({
+        "review_id": rng.integers(0, n - 20, n),  # sebagian ulasan punya beberapa item
+        "product_category_name_english": pd.Categorical(rng.choice(["bed_bath", "toys"], n)),
+        "review_comment_message": messages,
+        "review_creation_date": pd.Timestamp("2018-01-01") + pd.to_timedelta(rng.integers(0, 120, n), unit="D"),
+        "review_score": rng.integers(1, 6, n),
+    })
+    frame.loc[::25, "review_comment_message"] = None
+    return frame
+
+
+def long_counts(frame):
+    # Versi lugas: satu baris per (ulasan, term) lalu groupby
+    frame = frame.dropna(subset=["review_comment_message"])
+    frame = frame.drop_duplicates(["review_id", "product_category_name_english"])
+    rows = frame.assign(term=frame["review_comment_message"].map(review_terms)).explode("term")
+    rows = rows.dropna(subset=["term"])
+    rows["bucket"] = score_bucket(rows["review_score"].to_numpy())
+    rows["month"] = [month_code(ts) for ts in rows["review_creation_date"]]
+    return rows
+
+
+def test_bucket_counts_match_groupby():
+    frame = review_facts()
+    counts = build_keyword_counts(SimpleNamespace(frame=frame))
+    start, end = month_code("2018-02-01"), month_code("2018-03-31")
+    matrix = counts.bucket_counts("toys", start, end)
+
+    rows = long_counts(frame)
+    rows = rows[(rows["product_category_name_english"] == "toys") & rows["month"].between(start, end)]
+    expected = rows.groupby(["bucket", "term"]).size()
+    vocabulary = list(counts.vocabulary)
+    got = {
+        (bucket, vocabulary[term]): int(matrix[bucket, term])
+        for bucket, term in zip(*np.nonzero(matrix))
+    }
+    assert got == {key: int(value) for key, value in expected.items()}
+
+
+def test_top_terms_match_sorted_log_odds():
+    frame = review_facts()
+    counts = build_keyword_counts(SimpleNamespace(frame=frame))
+    top_positive, top_negative = counts.top_terms("bed_bath", n=5, min_count=3)
+
+    rows = long_counts(frame)
+    global_counts = rows.groupby("term").size()
+    prior = PRIOR_WEIGHT * global_counts / global_counts.sum()
+    mine = rows[rows["product_category_name_english"] == "bed_bath"]
+    table = pd.DataFrame({
+        "positive": mine[mine["bucket"] == POSITIVE].groupby("term").size(),
+        "negative": mine[mine["bucket"] == NEGATIVE].groupby("term").size(),
+    }).reindex(counts.vocabulary).fillna(0)  # urutan kosakata: nlargest memecah seri berdasar posisi
+    n_pos, n_neg = table["positive"].sum(), table["negative"].sum()
+    alpha = prior.reindex(table.index)
+    table = table[table["positive"] + table["negative"] >= 3]
+    alpha = alpha[table.index]
+    delta = (
+        np.log((table["positive"] + alpha) / (n_pos + prior.sum() - table["positive"] - alpha))
+        - np.log((table["negative"] + alpha) / (n_neg + prior.sum() - table["negative"] - alpha))
+    )
+    table["z_score"] = delta / np.sqrt(1 / (table["positive"] + alpha) + 1 / (table["negative"] + alpha))
+
+    expected_pos = table[table["z_score"] > 0].sort_values("z_score", ascending=False, kind="stable").head(5)
+    expected_neg = table[table["z_score"] < 0].sort_values("z_score", kind="stable").head(5)
+    assert top_positive["term"].tolist() == expected_pos.index.tolist()
+    assert top_negative["term"].tolist() == expected_neg.index.tolist()
+    np.testing.assert_allclose(top_positive["z_score"], expected_pos["z_score"])
+    np.testing.assert_array_equal(top_positive["positive"], expected_pos["positive"])
+
+
+def test_review_terms_drop_stopwords_and_digits():
+    assert review_terms("Não chegou o produto 2 vezes") == ["nao", "chegou", "produto", "vezes",
+                                                           "nao chegou", "chegou produto", "produto vezes"]
@@ -0,0 +1,39 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from utils.operations import LIFECYCLE_COLUMNS, add_lifecycle_columns  # noqa: E402
+
+
+def orders():
+    ts = lambda values: pd.to_datetime(pd.Series(values))  # noqa: E731
+    return pd.DataFrame({
+        "order_purchase_timestamp": ts(["2018-01-01 10:00", "2018-01-02 23:00", "2018-01-03 08:00"]),
+        "order_approved_at": ts(["2018-01-01 16:00", "2018-01-03 01:00", None]),
+        "order_delivered_carrier_date": ts(["2018-01-02 09:00", "2018-01-04 00:00", None]),
+        "order_delivered_customer_date": ts(["2018-01-09 15:59", "2018-01-03 00:00", None]),
+        "order_estimated_delivery_date": ts(["2018-01-10", "2018-01-20", "2018-01-25"]),
+    })
+
+
+def test_delivery_days_matches_dt_days():
+    frame = add_lifecycle_columns(orders())
+    expected = (frame["order_delivered_customer_date"] - frame["order_approved_at"]).dt.days
+    # Termasuk nilai negatif (data kotor): dibulatkan ke bawah seperti .dt.days
+    np.testing.assert_array_equal(frame["delivery_days"].to_numpy(), expected.to_numpy(dtype=float))
+
+
+def test_other_durations_keep_fractions():
+    frame = add_lifecycle_columns(orders())
+    assert frame["approval_lag_days"].iloc[0] == pytest.approx(0.25)
+    assert frame["carrier_handoff_days"].iloc[1] == pytest.approx(23 / 24)
+    # Timestamp kosong -> NaN
+    assert np.isnan(frame["approval_lag_days"].iloc[2])
+    assert np.isnan(frame["lateness_days"].iloc[2])
+
+
+def test_no_epoch_columns_added():
+    frame = add_lifecycle_columns(orders())
+    assert not [col for col in frame.columns if col.endswith("_epoch")]
+    assert set(LIFECYCLE_COLUMNS) <= set(frame.columns)
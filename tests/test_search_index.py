@@ -0,0 +1,81 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+from utils.search_index import InvertedIndex, open_index  # noqa: E402
+
+DOCS = [
+    "Entrega rápida, produto ótimo",
+    "Não chegou, atraso na entrega",
+    None,
+    "",
+    "Produto chegou quebrado",
+    "entregaram antes do prazo",
+]
+
+
+def found(index, query):
+    return set(index.search(query)[0].tolist())
+
+
+@pytest.fixture
+def index():
+    return InvertedIndex().add_documents(DOCS)
+
+
+def test_and_vs_or(index):
+    assert found(index, "produto chegou") == {4}
+    assert found(index, "produto OR chegou") == {0, 1, 4}
+    assert found(index, "produto | atraso") == {0, 1, 4}
+
+
+def test_prefix(index):
+    assert found(index, "entreg*") == {0, 1, 5}
+    assert found(index, "entreg") == set()
+
+
+def test_accent_folding(index):
+    assert found(index, "rapida") == {0}
+    assert found(index, "NÃO") == {1}
+
+
+def test_empty_documents_keep_numbering(index):
+    assert len(index) == len(DOCS)
+    assert index.doc_lengths[2] == 0 and index.doc_lengths[3] == 0
+    assert found(index, "quebrado") == {4}
+
+
+def test_scores_sorted_descending(index):
+    _, scores = index.search("entreg* OR produto")
+    assert list(scores) == sorted(scores, reverse=True)
+
+
+def test_open_index_states(tmp_path):
+    path = str(tmp_path / "index.pkl")
+    _, status = open_index(DOCS, path)
+    assert status == "rebuilt"
+    _, status = open_index(DOCS, path)
+    assert status == "hit"
+
+    # Dokumen baru di akhir: hanya tambahan yang diindeks
+    appended = DOCS + ["atraso de novo"]
+    index, status = open_index(appended, path)
+    assert status == "updated"
+    assert found(index, "atraso") == {1, 6}
+
+    # Dokumen lama berubah: dibangun ulang
+    edited = ["Entrega lenta"] + appended[1:]
+    index, status = open_index(edited, path)
+    assert status == "rebuilt"
+    assert found(index, "lenta") == {0}
+    assert found(index, "rapida") == set()
+
+
+def test_open_index_without_writable_cache(tmp_path):
+    # Folder cache tidak bisa dibuat: indeks tetap dikembalikan dari memori
+    blocker = tmp_path / "cache"
+    blocker.write_text("")
+    index, status = open_index(DOCS, str(blocker / "index.pkl"))
+    assert status == "rebuilt"
+    assert found(index, "quebrado") == {4}
@@ -0,0 +1,96 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from utils.sellers import build_seller_facts, month_code, top_n  # noqa: E402
+
+
+def frames(n_orders=600, n_sellers=12, seed=0):
+    rng = np.random.default_rng(seed)
+    purchase = pd.Timestamp("2017-11-01") + pd.to_timedelta(rng.integers(0, 120 * 86400, n_orders), unit="s")
+    approved = purchase + pd.to_timedelta(rng.integers(600, 86400, n_orders), unit="s")
+    delivered_at = approved + pd.to_timedelta(rng.integers(1, 30 * 86400, n_orders), unit="s")
+    status = np.where(rng.random(n_orders) < 0.9, "delivered", "shipped")
+    orders = pd.DataFrame({
+        "order_key": np.arange(n_orders),
+        "order_status": status,
+        "order_purchase_timestamp": purchase,
+        "order_approved_at": approved,
+        "order_delivered_customer_date": pd.Series(delivered_at).where(status == "delivered"),
+        "order_estimated_delivery_date": (purchase + pd.Timedelta(days=15)).normalize(),
+    })
+    per_order = rng.integers(1, 4, n_orders)
+    item_orders = np.repeat(np.arange(n_orders), per_order)
+    items = pd.DataFrame({
+        "order_key": item_orders,
+        "order_item_id": 1,
+        "seller_key": rng.integers(0, n_sellers, len(item_orders)),
+        "price": rng.gamma(2.0, 40.0, len(item_orders)).round(2),
+        "freight_value": rng.gamma(2.0, 8.0, len(item_orders)).round(2),
+    })
+    reviews = pd.DataFrame({"order_key": np.arange(n_orders), "review_score": rng.integers(1, 6, n_orders)})
+    return orders, items, reviews
+
+
+def expected_summary(orders, items, reviews, start, end):
+    # Hitungan langsung dari baris mentah: filter bulan, lalu groupby seller
+    months = orders["order_purchase_timestamp"].dt.to_period("M")
+    window = orders[(months >= pd.Period(start, "M")) & (months <= pd.Period(end, "M"))]
+    rows = items.merge(window, on="order_key").merge(reviews, on="order_key", how="left")
+    per_order = rows.groupby(["seller_key", "order_key"]).agg(
+        revenue=("price", "sum"), status=("order_status", "first"), review_score=("review_score", "first"),
+        approved=("order_approved_at", "first"), delivered_at=("order_delivered_customer_date", "first"),
+    ).reset_index()
+    delivered = per_order[per_order["status"] == "delivered"]
+    days = (delivered["delivered_at"] - delivered["approved"]).dt.days
+    return pd.DataFrame({
+        "orders": per_order.groupby("seller_key").size(),
+        "revenue": per_order.groupby("seller_key")["revenue"].sum(),
+        "avg_delivery_days": days.groupby(delivered["seller_key"]).mean(),
+        "p90_delivery_days": days.groupby(delivered["seller_key"]).quantile(0.9, interpolation="higher"),
+        "review_score": per_order.groupby("seller_key")["review_score"].mean(),
+    })
+
+
+def test_summary_matches_groupby():
+    orders, items, reviews = frames()
+    facts = build_seller_facts(orders, items, reviews)
+    summary = facts.summary(month_code("2017-12-01"), month_code("2018-01-31")).set_index("seller_key")
+    expected = expected_summary(orders, items, reviews, "2017-12", "2018-01")
+
+    assert summary["orders"].to_dict() == expected["orders"].to_dict()
+    for col in ["revenue", "avg_delivery_days", "review_score"]:
+        np.testing.assert_allclose(summary[col], expected.loc[summary.index, col])
+    np.testing.assert_array_equal(summary["p90_delivery_days"], expected.loc[summary.index, "p90_delivery_days"])
+
+
+def test_merge_across_months_equals_full_build():
+    orders, items, reviews = frames()
+    cutoff = orders["order_purchase_timestamp"] < pd.Timestamp("2018-01-01")
+    early, late = orders[cutoff], orders[~cutoff]
+    merged = build_seller_facts(early, items[items["order_key"].isin(early["order_key"])], reviews).merge(
+        build_seller_facts(late, items[items["order_key"].isin(late["order_key"])], reviews)
+    )
+    full = build_seller_facts(orders, items, reviews)
+
+    pd.testing.assert_frame_equal(merged.partials, full.partials, check_dtype=False)
+    pd.testing.assert_frame_equal(merged.delivery_hist, full.delivery_hist, check_dtype=False)
+    pd.testing.assert_frame_equal(merged.summary(), full.summary(), check_dtype=False)
+
+
+@pytest.mark.parametrize("ascending", [False, True])
+def test_top_n_matches_stable_sort_with_ties(ascending):
+    summary = pd.DataFrame({
+        "seller_key": np.arange(12),
+        "orders": [5, 1, 7, 3, 9, 4, 6, 2, 8, 5, 3, 4],
+        # Banyak nilai kembar tepat di batas n, plus NaN
+        "score": [4.0, 5.0, 4.0, 3.0, 4.0, np.nan, 4.0, 2.0, 5.0, 4.0, 1.0, 4.0],
+    })
+    expected = (
+        summary[(summary["orders"] >= 2) & summary["score"].notna()]
+        .sort_values("score", ascending=ascending, kind="stable")
+        .head(4)
+    )
+    result = top_n(summary, "score", n=4, ascending=ascending, min_orders=2)
+    assert result["seller_key"].tolist() == expected["seller_key"].tolist()
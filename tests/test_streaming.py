@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+import benchmark  # noqa: E402
+from utils.data_loader import DATASET_FILES  # noqa: E402
+from utils.streaming import hash_key, stream_aggregates  # noqa: E402
+
+N_ORDERS = 2_000
+CHUNKSIZE = 500
+
+
+@pytest.fixture(scope="module")
+def data_dir(tmp_path_factory):
+    path = tmp_path_factory.mktemp("stream") / "data"
+    benchmark.synthetic_orders(str(path), N_ORDERS, chunksize=N_ORDERS, seed=2)
+    # Chunk pertama tanpa satu pun payment_type: tipe kolom spill tetap
+    # harus string, bukan null, agar chunk berikutnya bisa ditulis
+    payments_path = path / DATASET_FILES["order_payments"]
+    payments = pd.read_csv(payments_path)
+    payments.loc[: CHUNKSIZE - 1, "payment_type"] = None
+    payments.to_csv(payments_path, index=False)
+    return path
+
+
+def test_customer_stats_match_in_memory(data_dir, tmp_path):
+    result = stream_aggregates(str(data_dir), chunksize=CHUNKSIZE, n_buckets=4, output_dir=str(tmp_path))
+
+    orders = pd.read_csv(data_dir / DATASET_FILES["orders"], parse_dates=["order_purchase_timestamp"])
+    payments = pd.read_csv(data_dir / DATASET_FILES["order_payments"])
+    joined = orders.merge(payments, on="order_id", how="left")
+    joined["customer_key"] = hash_key(joined["customer_id"])
+    grouped = joined.groupby("customer_key")
+    expected = pd.DataFrame({
+        "last_purchase": grouped["order_purchase_timestamp"].max(),
+        "frequency": grouped["order_id"].nunique(),
+        "monetary": grouped["payment_value"].sum(),
+    })
+
+    stats = result.customer_stats().set_index("customer_key").sort_index()
+    assert result.n_customers == len(expected)
+    assert stats.index.is_unique
+    pd.testing.assert_frame_equal(stats, expected.sort_index(), check_dtype=False)
+    assert len(result.rfm()) == len(expected)
+    assert os.path.dirname(result.customer_stats_path) == str(tmp_path)
@@ -0,0 +1,55 @@
+import sys
+import types
+
+import pytest
+
+pytest.importorskip("pandas")
+
+from utils.translation import GoogleBackend, IdentityBackend, TranslationStore, Translator  # noqa: E402
+
+
+def test_second_translate_many_hits_store_only():
+    backend = IdentityBackend()
+    translator = Translator(backend, TranslationStore(":memory:"))
+    texts = ["bom produto", "chegou atrasado", "bom produto", None, "  "]
+
+    assert translator.translate_many(texts) == texts
+    assert backend.calls == 1
+
+    calls = backend.calls
+    assert translator.translate_many(texts) == texts
+    assert backend.calls - calls == 0
+
+
+class FakeGoogleTranslator:
+    """Pengganti deep_translator.GoogleTranslator: satu request per translate()."""
+
+    requests = []
+
+    def __init__(self, source, target):
+        self.target = target
+
+    def translate(self, text):
+        FakeGoogleTranslator.requests.append(text)
+        return "\n".join(f"{self.target}:{line}" for line in text.split("\n"))
+
+
+@pytest.fixture
+def fake_google(monkeypatch):
+    FakeGoogleTranslator.requests = []
+    module = types.ModuleType("deep_translator")
+    module.GoogleTranslator = FakeGoogleTranslator
+    monkeypatch.setitem(sys.modules, "deep_translator", module)
+    return FakeGoogleTranslator
+
+
+def test_google_backend_sends_one_request_per_group(fake_google):
+    backend = GoogleBackend(max_chars=30)
+    texts = ["bom", "muito bom\nrecomendo", "ruim", "x" * 40]
+
+    assert backend.translate_batch(texts, "id") == [
+        "id:bom", "id:muito bom recomendo", "id:ruim", "id:" + "x" * 40,
+    ]
+    # Tiga teks pendek dalam satu request, teks panjang sendiri
+    assert fake_google.requests == ["bom\nmuito bom recomendo\nruim", "x" * 40]
+    assert backend.requests == 2
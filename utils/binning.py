@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+
+def bin_index(values, edges):
+    # Indeks bin 0..n_bins-1; nilai di luar rentang masuk bin pertama/terakhir
+    return np.clip(np.searchsorted(edges, values, side="right") - 1, 0, len(edges) - 2)
+
+
+def histogram_quantile(counts, edges, q):
+    """Kuantil perkiraan dari histogram (interpolasi linear di dalam bin)."""
+    counts = np.asarray(counts, dtype=np.float64)
+    total = counts.sum()
+    if total == 0:
+        return float("nan")
+    cumulative = np.cumsum(counts)
+    target = q * total
+    i = int(np.searchsorted(cumulative, target, side="left"))
+    before = cumulative[i - 1] if i > 0 else 0.0
+    fraction = (target - before) / counts[i] if counts[i] else 0.0
+    return float(edges[i] + fraction * (edges[i + 1] - edges[i]))
+
+
+def coarsen(counts, edges, max_bins):
+    """Gabungkan bin berurutan agar jumlah bar tidak lebih dari ``max_bins``."""
+    counts = np.asarray(counts)
+    edges = np.asarray(edges, dtype=np.float64)
+    factor = max(1, -(-len(counts) // max_bins))
+    if factor == 1:
+        return counts, edges
+    starts = np.arange(0, len(counts), factor)
+    return np.add.reduceat(counts, starts), np.append(edges[starts], edges[-1])
+
+
+def histogram(values, n_bins, lo=None, hi=None, integer=False):
+    """Hitungan histogram dengan NumPy di server: ``(counts, edges)``.
+
+    ``lo``/``hi`` default ke min/maks data; nilai di luarnya diabaikan.
+    ``integer=True`` memakai bin selebar satu yang berpusat di bilangan bulat
+    (lalu digabung bila lebih dari ``n_bins``), cocok untuk data hitungan.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(1, dtype=np.float64)
+    lo = float(values.min()) if lo is None else float(lo)
+    hi = float(values.max()) if hi is None else float(hi)
+    if integer:
+        edges = np.arange(np.floor(lo), np.floor(hi) + 2, dtype=np.float64) - 0.5
+        counts, edges = np.histogram(values, bins=edges)
+        return coarsen(counts, edges, n_bins)
+    if hi <= lo:
+        hi = lo + 1.0
+    return np.histogram(values, bins=n_bins, range=(lo, hi))
+
+
+def bar_trace(counts, edges, **kwargs):
+    """go.Bar dari hitungan histogram: hanya n_bins titik yang dikirim ke browser."""
+    edges = np.asarray(edges, dtype=np.float64)
+    return go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=np.asarray(counts),
+        width=np.diff(edges),
+        customdata=np.column_stack([edges[:-1], edges[1:]]),
+        **kwargs,
+    )
+
+
+class DailyHistogram:
+    """Histogram per hari dengan batas bin tetap.
+
+    ``counts`` berukuran (n_hari, n_bin) dan rapat (termasuk hari kosong),
+    sehingga histogram rentang tanggal mana pun cukup menjumlah potongan
+    baris, tanpa menyentuh data per item.
+    """
+
+    def __init__(self, days, counts, edges):
+        self.days = days
+        self.counts = counts
+        self.edges = edges
+
+    def _bounds(self, start_date, end_date):
+        # None berarti tidak dibatasi di sisi tersebut
+        lo = 0 if start_date is None else self.days.searchsorted(pd.Timestamp(start_date), side="left")
+        hi = len(self.days) if end_date is None else self.days.searchsorted(pd.Timestamp(end_date), side="right")
+        return lo, hi
+
+    def window(self, start_date, end_date):
+        lo, hi = self._bounds(start_date, end_date)
+        return self.counts[lo:hi].sum(axis=0)
+
+
+def build_daily_histogram(timestamps, values, edges):
+    """Bangun ``DailyHistogram`` dari pasangan (timestamp, nilai)."""
+    edges = np.asarray(edges, dtype=np.float64)
+    n_bins = len(edges) - 1
+    days_of = pd.Series(timestamps).dt.normalize()
+    values = np.asarray(values, dtype=np.float64)
+    valid = days_of.notna().to_numpy() & ~np.isnan(values)
+    if not valid.any():
+        return DailyHistogram(pd.DatetimeIndex([]), np.zeros((0, n_bins), dtype=np.int64), edges)
+
+    days_of = days_of[valid]
+    days = pd.date_range(days_of.min(), days_of.max(), freq="D")
+    cells = days.get_indexer(days_of) * n_bins + bin_index(values[valid], edges)
+    counts = np.bincount(cells, minlength=len(days) * n_bins).reshape(len(days), n_bins)
+    return DailyHistogram(days, counts, edges)
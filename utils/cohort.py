@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+
+def _month_codes(timestamps):
+    # Bulan sebagai integer (tahun * 12 + bulan - 1) supaya perbandingan murah
+    return (timestamps.dt.year * 12 + timestamps.dt.month - 1).to_numpy(dtype="int64")
+
+
+def _month_labels(codes):
+    # Format 'YYYY-MM' hanya untuk kode bulan unik, bukan per baris
+    codes = np.asarray(codes, dtype=np.int64)
+    unique_codes, inverse = np.unique(codes, return_inverse=True)
+    labels = np.array([f"{code // 12}-{code % 12 + 1:02d}" for code in unique_codes], dtype=object)
+    return labels[inverse]
+
+
+def assign_cohorts(orders, customer_col="customer_key", time_col="order_purchase_timestamp"):
+    """Hitung bulan order, bulan cohort (order pertama) dan label New/Returning.
+
+    Bulan pertama tiap customer dihitung dengan groupby-transform, lalu label
+    ditentukan dengan perbandingan array; tidak ada merge atau apply per baris.
+    """
+    valid = orders[time_col].notna() & orders[customer_col].notna()
+    orders = orders[valid]
+    order_month = _month_codes(orders[time_col])
+    first_month = pd.Series(order_month, index=orders.index).groupby(orders[customer_col].to_numpy()).transform("min")
+    first_month = first_month.to_numpy()
+
+    return pd.DataFrame({
+        customer_col: orders[customer_col].to_numpy(),
+        "order_month": order_month,
+        "cohort_month": first_month,
+        "customer_type": np.where(order_month == first_month, "New", "Returning"),
+    }, index=orders.index)
+
+
+def customer_type_trend(orders, customer_col="customer_key", time_col="order_purchase_timestamp"):
+    """Jumlah order New vs Returning per bulan (kolom year_month, customer_type, count)."""
+    cohorts = assign_cohorts(orders, customer_col, time_col)
+    trend = cohorts.groupby(["order_month", "customer_type"]).size().reset_index(name="count")
+    trend.insert(0, "year_month", _month_labels(trend["order_month"]))
+    return trend.drop(columns="order_month")
+
+
+def retention_matrix(orders, customer_col="customer_key", time_col="order_purchase_timestamp"):
+    """Matriks retensi cohort bulanan.
+
+    Baris = bulan cohort, kolom = jumlah bulan sejak order pertama, nilai =
+    proporsi customer cohort yang masih order di bulan tersebut.
+    """
+    cohorts = assign_cohorts(orders, customer_col, time_col)
+    if cohorts.empty:
+        return pd.DataFrame()
+
+    active = cohorts.drop_duplicates([customer_col, "order_month"])
+    active = active.assign(months_since=active["order_month"] - active["cohort_month"])
+    counts = active.groupby(["cohort_month", "months_since"]).size().unstack(fill_value=0)
+    matrix = counts.div(counts[0], axis=0)
+    matrix.index = _month_labels(matrix.index)
+    matrix.index.name = "cohort"
+    matrix.columns.name = "months_since_first_order"
+    return matrix
@@ -0,0 +1,198 @@
+import numpy as np
+import pandas as pd
+
+# Presisi HyperLogLog: 2^14 register per hari (~0.8% galat standar)
+HLL_PRECISION = 14
+
+
+def _hash64(keys):
+    # splitmix64: hash integer yang cepat dan tersebar rata, full vectorized
+    x = np.asarray(keys, dtype=np.int64).astype(np.uint64)
+    with np.errstate(over="ignore"):
+        x = x + np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _highest_bit(x):
+    # Indeks bit tertinggi (0..63) untuk x > 0, tanpa konversi ke float
+    x = x.copy()
+    position = np.zeros(len(x), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        upper = x >> np.uint64(shift)
+        has_upper = upper != 0
+        position += shift * has_upper
+        x = np.where(has_upper, upper, x)
+    return position
+
+
+def hll_registers(groups, keys, n_groups, precision=HLL_PRECISION):
+    """Bangun register HyperLogLog per grup (mis. per hari).
+
+    Hasilnya array uint8 (n_groups, 2^precision). Sketch beberapa grup bisa
+    digabung dengan ``max`` elemen per elemen (lihat ``hll_count``).
+    """
+    m = 1 << precision
+    registers = np.zeros((n_groups, m), dtype=np.uint8)
+    if len(keys) == 0:
+        return registers
+
+    hashed = _hash64(keys)
+    bucket = (hashed >> np.uint64(64 - precision)).astype(np.int64)
+    remaining = hashed << np.uint64(precision)
+    max_rank = 64 - precision + 1
+    rank = np.full(len(hashed), max_rank, dtype=np.int64)
+    nonzero = remaining != 0
+    rank[nonzero] = 64 - _highest_bit(remaining[nonzero])
+    rank = np.minimum(rank, max_rank)
+
+    cell = np.asarray(groups, dtype=np.int64) * m + bucket
+    best = pd.Series(rank).groupby(cell).max()
+    registers.reshape(-1)[best.index.to_numpy()] = best.to_numpy()
+    return registers
+
+
+def hll_count(registers):
+    """Estimasi jumlah distinct dari satu atau lebih baris register."""
+    registers = np.asarray(registers)
+    if registers.ndim == 2:
+        if len(registers) == 0:
+            return 0.0
+        registers = registers.max(axis=0)
+    m = len(registers)
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.ldexp(1.0, -registers.astype(np.int64)))
+    zeros = int(np.count_nonzero(registers == 0))
+    # Koreksi rentang kecil (linear counting)
+    if estimate <= 2.5 * m and zeros > 0:
+        estimate = m * np.log(m / zeros)
+    return float(estimate)
+
+
+class DailyCube:
+    """Agregat harian untuk KPI Executive Overview.
+
+    ``metrics`` berisi satu baris per tanggal (rapat, termasuk hari tanpa
+    order) dengan revenue, jumlah pembayaran, order, item dan rincian per
+    ``payment_type``, sehingga rentang mana pun cukup dijawab dengan
+    menjumlah potongan baris.
+
+    ``customer_registers`` (opsional, lihat ``build_daily_cube``): sketch
+    HyperLogLog pelanggan unik per hari, untuk estimasi yang bisa digabung
+    antar partisi. Tanpa sketch, ``totals`` tidak punya kunci ``customers``.
+    """
+
+    def __init__(self, metrics, customer_registers, payment_types):
+        self.metrics = metrics
+        self.customer_registers = customer_registers
+        self.payment_types = payment_types
+
+    def merge(self, other):
+        """Gabungkan dengan cube dari partisi data lain (order yang berbeda).
+
+        Metrik dijumlah per tanggal dan register HLL digabung dengan ``max``,
+        jadi hasilnya sama dengan cube yang dibangun dari gabungan datanya.
+        """
+        if len(other.metrics) == 0:
+            return self
+        if len(self.metrics) == 0:
+            return other
+        days = pd.date_range(
+            min(self.metrics.index[0], other.metrics.index[0]),
+            max(self.metrics.index[-1], other.metrics.index[-1]),
+            freq="D",
+        )
+        columns = list(self.metrics.columns) + [c for c in other.metrics.columns if c not in self.metrics.columns]
+        metrics = self.metrics.reindex(index=days, columns=columns, fill_value=0).add(
+            other.metrics.reindex(index=days, columns=columns, fill_value=0)
+        )
+        registers = None
+        if self.customer_registers is not None and other.customer_registers is not None:
+            registers = np.zeros((len(days), self.customer_registers.shape[1]), dtype=np.uint8)
+            for cube in (self, other):
+                rows = days.get_indexer(cube.metrics.index)
+                registers[rows] = np.maximum(registers[rows], cube.customer_registers)
+        payment_types = sorted(set(self.payment_types) | set(other.payment_types))
+        return DailyCube(metrics, registers, payment_types)
+
+    def _bounds(self, start_date, end_date):
+        # None berarti tidak dibatasi di sisi tersebut
+        days = self.metrics.index
+        lo = 0 if start_date is None else days.searchsorted(pd.Timestamp(start_date), side="left")
+        hi = len(days) if end_date is None else days.searchsorted(pd.Timestamp(end_date), side="right")
+        return lo, hi
+
+    def totals(self, start_date, end_date):
+        lo, hi = self._bounds(start_date, end_date)
+        sums = self.metrics.iloc[lo:hi][["revenue", "payments", "orders", "items"]].sum()
+        totals = {
+            "revenue": float(sums["revenue"]),
+            "payments": int(sums["payments"]),
+            "orders": int(sums["orders"]),
+            "items": int(sums["items"]),
+            "avg_order_value": float(sums["revenue"] / sums["payments"]) if sums["payments"] else 0.0,
+            "avg_items": float(sums["items"] / sums["orders"]) if sums["orders"] else 0.0,
+        }
+        if self.customer_registers is not None:
+            # Estimasi HLL (galat ~0.8%): untuk rasio/growth pakai hitungan tepat
+            totals["customers"] = round(hll_count(self.customer_registers[lo:hi]))
+        return totals
+
+    def monthly(self, start_date, end_date):
+        lo, hi = self._bounds(start_date, end_date)
+        window = self.metrics.iloc[lo:hi]
+        monthly = window.groupby(window.index.strftime("%Y-%m"))[["orders", "revenue"]].sum()
+        monthly = monthly[monthly["orders"] > 0]
+        return monthly.rename_axis("year_month").reset_index()
+
+    def payment_mix(self, start_date, end_date):
+        lo, hi = self._bounds(start_date, end_date)
+        window = self.metrics.iloc[lo:hi]
+        return pd.DataFrame({
+            "payment_type": self.payment_types,
+            "count": [int(window[f"count_{t}"].sum()) for t in self.payment_types],
+            "revenue": [float(window[f"revenue_{t}"].sum()) for t in self.payment_types],
+        })
+
+
+def build_daily_cube(orders, orders_payments, orders_items, time_col="order_purchase_timestamp",
+                     customer_sketch=False):
+    """Bangun ``DailyCube`` dari frame hasil preprocess (sekali per proses).
+
+    ``customer_sketch=True`` juga membangun register HLL pelanggan per hari
+    (~16 KB per hari); hanya perlu jika cube akan digabung antar partisi.
+    """
+    order_days = orders[time_col].dt.normalize()
+    valid = order_days.notna()
+    if not valid.any():
+        empty = pd.DataFrame(columns=["revenue", "payments", "orders", "items"], index=pd.DatetimeIndex([]))
+        registers = np.zeros((0, 1 << HLL_PRECISION), dtype=np.uint8) if customer_sketch else None
+        return DailyCube(empty, registers, [])
+
+    days = pd.date_range(order_days[valid].min(), order_days[valid].max(), freq="D")
+    metrics = pd.DataFrame(index=days)
+    metrics["orders"] = order_days[valid].value_counts().reindex(days, fill_value=0)
+
+    payment_days = orders_payments[time_col].dt.normalize()
+    paid = orders_payments["payment_value"].notna()
+    metrics["revenue"] = orders_payments["payment_value"].groupby(payment_days).sum().reindex(days, fill_value=0.0)
+    metrics["payments"] = paid.groupby(payment_days).sum().reindex(days, fill_value=0)
+
+    by_type = orders_payments[paid].groupby(
+        [payment_days[paid], orders_payments.loc[paid, "payment_type"]], observed=True
+    )["payment_value"].agg(["count", "sum"])
+    payment_types = sorted(by_type.index.get_level_values(1).unique().astype(str))
+    for payment_type in payment_types:
+        per_type = by_type.xs(payment_type, level=1)
+        metrics[f"count_{payment_type}"] = per_type["count"].reindex(days, fill_value=0)
+        metrics[f"revenue_{payment_type}"] = per_type["sum"].reindex(days, fill_value=0.0)
+
+    item_days = orders_items[time_col].dt.normalize()
+    metrics["items"] = orders_items["order_item_id"].notna().groupby(item_days).sum().reindex(days, fill_value=0)
+
+    registers = None
+    if customer_sketch:
+        day_position = days.get_indexer(order_days[valid])
+        registers = hll_registers(day_position, orders.loc[valid, "customer_key"], len(days))
+    return DailyCube(metrics, registers, payment_types)
@@ -1,40 +1,620 @@
 import pandas as pd
+import numpy as np
 import os
-import gdown
-
-def load_all_data(base_path="data"):
-    # File Google Drive untuk geolocation
-    geolocation_url = "https://drive.google.com/uc?id=1RgX0EAZfPbpwEaABInGf71JnCz8wLyoz"
-    geolocation_path = os.path.join(base_path, 'geolocation_dataset.csv')
-
-    # Download hanya jika file belum ada
-    if not os.path.exists(geolocation_path):
-        os.makedirs(base_path, exist_ok=True)
-        gdown.download(geolocation_url, geolocation_path, quiet=False)
-
-    # Load semua dataset
-    customers = pd.read_csv(os.path.join(base_path, 'customers_dataset.csv'))
-    geolocation = pd.read_csv(geolocation_path)
-    leads_qualified = pd.read_csv(os.path.join(base_path, 'marketing_qualified_leads_dataset.csv'))
-    leads_closed = pd.read_csv(os.path.join(base_path, 'closed_deals_dataset.csv'))
-    order_items = pd.read_csv(os.path.join(base_path, 'order_items_dataset.csv'))
-    order_payments = pd.read_csv(os.path.join(base_path, 'order_payments_dataset.csv'))
-    order_reviews = pd.read_csv(os.path.join(base_path, 'order_reviews_dataset.csv'))
-    orders = pd.read_csv(os.path.join(base_path, 'orders_dataset.csv'))
-    product_cat = pd.read_csv(os.path.join(base_path, 'product_category_name_translation.csv'))
-    products = pd.read_csv(os.path.join(base_path, 'products_dataset.csv'))
-    sellers = pd.read_csv(os.path.join(base_path, 'sellers_dataset.csv'))
-
-    return {
-        "orders": orders,
-        "order_items": order_items,
-        "order_payments": order_payments,
-        "order_reviews": order_reviews,
-        "products": products,
-        "product_cat": product_cat,
-        "customers": customers,
-        "sellers": sellers,
-        "geolocation": geolocation,
-        "leads_qualified": leads_qualified,
-        "leads_closed": leads_closed,
-    }
+import json
+import hashlib
+import argparse
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.frozen import freeze
+from utils.geo import centroids
+from utils.sources import OFFLINE_ENV, ensure_file, offline_mode
+
+# Nama tabel -> nama file CSV di folder data
+DATASET_FILES = {
+    "orders": "orders_dataset.csv",
+    "order_items": "order_items_dataset.csv",
+    "order_payments": "order_payments_dataset.csv",
+    "order_reviews": "order_reviews_dataset.csv",
+    "products": "products_dataset.csv",
+    "product_cat": "product_category_name_translation.csv",
+    "customers": "customers_dataset.csv",
+    "sellers": "sellers_dataset.csv",
+    "geolocation": "geolocation_dataset.csv",
+    "leads_qualified": "marketing_qualified_leads_dataset.csv",
+    "leads_closed": "closed_deals_dataset.csv",
+}
+
+# Ingest paralel: jumlah thread dan engine read_csv ("c" atau "pyarrow")
+INGEST_WORKERS_ENV = "DASHBOARD_INGEST_WORKERS"
+CSV_ENGINE_ENV = "DASHBOARD_CSV_ENGINE"
+
+# Cache kolumnar (Parquet) disimpan di <base_path>/.cache
+CACHE_DIR_NAME = ".cache"
+MANIFEST_NAME = "manifest.json"
+_manifest_lock = threading.Lock()
+
+# Tipe kolom yang dipakai berulang di skema
+ID = "string[pyarrow]"
+CAT = "category"
+
+# Skema eksplisit per dataset: dtype untuk read_csv dan kolom tanggal yang
+# di-parse saat load. Nilai uang tetap float64 supaya total revenue tidak
+# kehilangan presisi; kolom lain memakai lebar sekecil mungkin.
+SCHEMAS = {
+    "orders": {
+        "dtype": {
+            "order_id": ID,
+            "customer_id": ID,
+            "order_status": CAT,
+        },
+        "dates": [
+            "order_purchase_timestamp",
+            "order_approved_at",
+            "order_delivered_carrier_date",
+            "order_delivered_customer_date",
+            "order_estimated_delivery_date",
+        ],
+    },
+    "order_items": {
+        "dtype": {
+            "order_id": ID,
+            "order_item_id": "int8",
+            "product_id": ID,
+            "seller_id": ID,
+            "price": "float64",
+            "freight_value": "float64",
+        },
+        "dates": ["shipping_limit_date"],
+    },
+    "order_payments": {
+        "dtype": {
+            "order_id": ID,
+            "payment_sequential": "int8",
+            "payment_type": CAT,
+            "payment_installments": "int8",
+            "payment_value": "float64",
+        },
+        "dates": [],
+    },
+    "order_reviews": {
+        "dtype": {
+            "review_id": ID,
+            "order_id": ID,
+            "review_score": "int8",
+        },
+        "dates": ["review_creation_date", "review_answer_timestamp"],
+    },
+    "products": {
+        "dtype": {
+            "product_id": ID,
+            "product_category_name": CAT,
+            "product_name_lenght": "float32",
+            "product_description_lenght": "float32",
+            "product_photos_qty": "float32",
+            "product_weight_g": "float32",
+            "product_length_cm": "float32",
+            "product_height_cm": "float32",
+            "product_width_cm": "float32",
+        },
+        "dates": [],
+    },
+    "product_cat": {
+        "dtype": {
+            "product_category_name": CAT,
+            "product_category_name_english": CAT,
+        },
+        "dates": [],
+    },
+    "customers": {
+        "dtype": {
+            "customer_id": ID,
+            "customer_unique_id": ID,
+            "customer_zip_code_prefix": "int32",
+            "customer_city": CAT,
+            "customer_state": CAT,
+        },
+        "dates": [],
+    },
+    "sellers": {
+        "dtype": {
+            "seller_id": ID,
+            "seller_zip_code_prefix": "int32",
+            "seller_city": CAT,
+            "seller_state": CAT,
+        },
+        "dates": [],
+    },
+    "geolocation": {
+        "dtype": {
+            "geolocation_zip_code_prefix": "int32",
+            "geolocation_lat": "float32",
+            "geolocation_lng": "float32",
+            "geolocation_city": CAT,
+            "geolocation_state": CAT,
+        },
+        "dates": [],
+    },
+    "leads_qualified": {
+        "dtype": {
+            "mql_id": ID,
+            "landing_page_id": CAT,
+            "origin": CAT,
+        },
+        "dates": ["first_contact_date"],
+    },
+    "leads_closed": {
+        "dtype": {
+            "mql_id": ID,
+            "seller_id": ID,
+            "sdr_id": CAT,
+            "sr_id": CAT,
+            "business_segment": CAT,
+            "lead_type": CAT,
+            "lead_behaviour_profile": CAT,
+            "has_company": CAT,
+            "has_gtin": CAT,
+            "average_stock": CAT,
+            "business_type": CAT,
+            "declared_product_catalog_size": "float32",
+            "declared_monthly_revenue": "float32",
+        },
+        "dates": ["won_date"],
+    },
+}
+
+
+# Tabel turunan: nama -> (tabel sumber, kolom grup). Dihitung sekali dari
+# sumbernya lalu di-cache sebagai Parquet kecil, sehingga halaman peta tidak
+# perlu membaca ~1 juta baris geolocation.
+DERIVED_TABLES = {
+    "geo_zip": ("geolocation", ["geolocation_zip_code_prefix"]),
+    "geo_city": ("geolocation", ["geolocation_city", "geolocation_state"]),
+    "geo_state": ("geolocation", ["geolocation_state"]),
+}
+# Naikkan jika cara menghitung tabel turunan berubah
+DERIVED_VERSION = 1
+# Resolusi kolom tanggal: engine pyarrow menghasilkan [s], engine C [ns];
+# keduanya disamakan agar isi cache tidak bergantung engine yang membangunnya
+DATE_DTYPE = "datetime64[ns]"
+
+
+def _schema_key(name):
+    # Perubahan skema ikut membatalkan cache tabel tersebut
+    if name in DERIVED_TABLES:
+        source, keys = DERIVED_TABLES[name]
+        schema = json.dumps([DERIVED_VERSION, keys, SCHEMAS.get(source, {})], sort_keys=True)
+    else:
+        schema = json.dumps([DATE_DTYPE, SCHEMAS.get(name, {})], sort_keys=True)
+    return hashlib.sha1(schema.encode()).hexdigest()[:12]
+
+
+def default_workers():
+    return int(os.environ.get(INGEST_WORKERS_ENV, min(8, os.cpu_count() or 1)))
+
+
+def default_engine():
+    return os.environ.get(CSV_ENGINE_ENV, "c")
+
+
+def _parse_dates(df, schema):
+    for col in schema.get("dates", []):
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors="coerce").astype(DATE_DTYPE)
+    return df
+
+
+def read_csv_with_schema(name, path, engine=None):
+    schema = SCHEMAS.get(name, {})
+    # Engine pyarrow mem-parse dengan banyak thread dan melepas GIL
+    df = pd.read_csv(path, dtype=schema.get("dtype"), engine=engine or default_engine())
+    return _parse_dates(df, schema)
+
+
+def iter_csv_chunks(name, path, chunksize, usecols=None):
+    """Baca CSV per potongan ``chunksize`` baris dengan skema yang sama.
+
+    Untuk data yang tidak muat di memori (lihat utils/streaming.py).
+    """
+    schema = SCHEMAS.get(name, {})
+    dtype = schema.get("dtype")
+    if usecols is not None and dtype:
+        dtype = {col: kind for col, kind in dtype.items() if col in usecols}
+    for chunk in pd.read_csv(path, dtype=dtype, usecols=usecols, chunksize=chunksize):
+        yield _parse_dates(chunk, schema)
+
+
+def _file_hash(path, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _fingerprint(path, previous=None):
+    stat = os.stat(path)
+    fingerprint = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    # Hash hanya dihitung ulang kalau size/mtime berubah
+    if previous and all(previous.get(k) == fingerprint[k] for k in ("size", "mtime_ns")):
+        fingerprint["sha1"] = previous.get("sha1")
+    else:
+        fingerprint["sha1"] = _file_hash(path)
+    return fingerprint
+
+
+def _cache_dir(base_path):
+    return os.path.join(base_path, CACHE_DIR_NAME)
+
+
+def _read_manifest(base_path):
+    try:
+        with open(os.path.join(_cache_dir(base_path), MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(base_path, manifest):
+    path = os.path.join(_cache_dir(base_path), MANIFEST_NAME)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _update_manifest(base_path, name, fingerprint):
+    with _manifest_lock:
+        manifest = _read_manifest(base_path)
+        manifest[name] = fingerprint
+        _write_manifest(base_path, manifest)
+
+
+def _ensure_source(name, base_path):
+    # File lokal -> arsip lokal -> unduhan (kecuali mode offline), lihat utils/sources.py
+    csv_path = os.path.join(base_path, DATASET_FILES[name])
+    if ensure_file(csv_path) is None:
+        mode = " (mode offline)" if offline_mode() else ""
+        raise FileNotFoundError(f"{DATASET_FILES[name]} tidak ditemukan di {base_path}{mode}")
+    return csv_path
+
+
+def load_table(name, base_path="data", use_cache=True, engine=None):
+    """Baca satu tabel, lewat cache Parquet jika CSV-nya tidak berubah.
+
+    Mengembalikan tuple (DataFrame, status) dengan status "hit", "rebuilt"
+    atau "csv" (cache tidak dipakai / tidak bisa ditulis).
+    """
+    csv_path = _ensure_source(name, base_path)
+    if not use_cache:
+        return read_csv_with_schema(name, csv_path, engine), "csv"
+
+    manifest = _read_manifest(base_path)
+    cached = manifest.get(name)
+    fingerprint = _fingerprint(csv_path, previous=cached)
+    fingerprint["schema"] = _schema_key(name)
+    parquet_path = os.path.join(_cache_dir(base_path), f"{name}.parquet")
+
+    is_fresh = cached and all(cached.get(k) == fingerprint[k] for k in ("sha1", "schema"))
+    if is_fresh and os.path.exists(parquet_path):
+        try:
+            df = pd.read_parquet(parquet_path)
+        except Exception:
+            df = None
+        if df is not None:
+            # CSV disentuh tapi isinya sama: cukup perbarui size/mtime
+            if cached != fingerprint:
+                try:
+                    _update_manifest(base_path, name, fingerprint)
+                except OSError:
+                    # Folder cache read-only: Parquet-nya tetap valid
+                    pass
+            return df, "hit"
+
+    df = read_csv_with_schema(name, csv_path, engine)
+    try:
+        os.makedirs(_cache_dir(base_path), exist_ok=True)
+        tmp_path = f"{parquet_path}.{os.getpid()}.tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, parquet_path)
+    except (ImportError, OSError):
+        # pyarrow tidak tersedia atau folder read-only: tetap jalan tanpa cache
+        return df, "csv"
+
+    _update_manifest(base_path, name, fingerprint)
+    return df, "rebuilt"
+
+
+def load_derived(name, base_path="data", use_cache=True, load_source=None, engine=None):
+    """Baca tabel turunan (lihat DERIVED_TABLES), lewat cache Parquet.
+
+    Cache dianggap segar selama sha1 CSV sumber dan versi/skemanya sama.
+    Jika CSV sumber tidak ada tapi cache-nya ada, cache tetap dipakai tanpa
+    mencari/mengunduh sumbernya.
+    ``load_source`` dipanggil hanya jika tabel perlu dihitung ulang.
+    Status sama seperti ``load_table``.
+    """
+    source, keys = DERIVED_TABLES[name]
+    if load_source is None:
+        load_source = lambda: load_table(source, base_path, use_cache=use_cache, engine=engine)[0]
+    if not use_cache:
+        return centroids(load_source(), keys), "csv"
+
+    manifest = _read_manifest(base_path)
+    cached = manifest.get(name)
+    parquet_path = os.path.join(_cache_dir(base_path), f"{name}.parquet")
+    source_path = os.path.join(base_path, DATASET_FILES[source])
+    if os.path.exists(source_path):
+        source_sha1 = _fingerprint(source_path, previous=manifest.get(source))["sha1"]
+    else:
+        source_sha1 = cached.get("source_sha1") if cached else None
+    fingerprint = {"source_sha1": source_sha1, "schema": _schema_key(name)}
+
+    if cached == fingerprint and os.path.exists(parquet_path):
+        try:
+            return pd.read_parquet(parquet_path), "hit"
+        except Exception:
+            pass
+
+    df = centroids(load_source(), keys)
+    if fingerprint["source_sha1"] is None:
+        fingerprint["source_sha1"] = _fingerprint(source_path)["sha1"]
+    try:
+        os.makedirs(_cache_dir(base_path), exist_ok=True)
+        tmp_path = f"{parquet_path}.{os.getpid()}.tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, parquet_path)
+    except (ImportError, OSError):
+        return df, "csv"
+
+    _update_manifest(base_path, name, fingerprint)
+    return df, "rebuilt"
+
+
+def source_digest(names, base_path="data"):
+    """Digest isi + skema beberapa tabel sumber, untuk kunci cache hasil turunan.
+
+    Memakai sha1 di manifest selama size/mtime CSV tidak berubah.
+    """
+    manifest = _read_manifest(base_path)
+    h = hashlib.sha1()
+    for name in sorted(names):
+        csv_path = _ensure_source(name, base_path)
+        h.update(f"{name}:{_fingerprint(csv_path, previous=manifest.get(name))['sha1']}:{_schema_key(name)};".encode())
+    return h.hexdigest()
+
+
+# Entitas yang id hex 32 karakternya di-intern menjadi surrogate key int32.
+# Setiap tabel yang punya kolom <entitas>_id mendapat kolom <entitas>_key.
+ID_ENTITIES = {
+    "order": "order_id",
+    "customer": "customer_id",
+    "product": "product_id",
+    "seller": "seller_id",
+}
+
+
+class IdInterner:
+    """Kamus global id string -> int32 untuk satu entitas.
+
+    Id baru ditambahkan di belakang, jadi key yang sudah dibagikan tidak
+    pernah berubah meskipun tabel dimuat dalam urutan berbeda. Nilai kosong
+    mendapat key -1.
+    """
+
+    def __init__(self):
+        self._index = pd.Index([], dtype=object)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._index)
+
+    def encode(self, values):
+        values = pd.Index(values)
+        with self._lock:
+            codes = self._index.get_indexer(values)
+            unseen = values[(codes == -1) & values.notna()].unique()
+            if len(unseen):
+                self._index = self._index.append(unseen.astype(object))
+                codes = self._index.get_indexer(values)
+        return codes.astype("int32")
+
+    def decode(self, keys):
+        keys = np.asarray(keys)
+        decoded = self._index.take(np.where(keys < 0, 0, keys)).to_numpy(dtype=object)
+        decoded[keys < 0] = None
+        return decoded
+
+
+def merge_on_key(left, right, on, how="left"):
+    """Merge pada surrogate key; kolom kanan yang sudah ada di kiri (mis. id
+    string-nya) dibuang supaya tidak muncul pasangan kolom _x/_y."""
+    on = [on] if isinstance(on, str) else list(on)
+    duplicated = [col for col in right.columns if col in left.columns and col not in on]
+    return left.merge(right.drop(columns=duplicated), on=on, how=how)
+
+
+class LazyData(Mapping):
+    """Registry tabel yang dibaca saat pertama kali diakses, lalu disimpan.
+
+    Dipakai seperti dict biasa (``data["orders"]``), tapi halaman yang hanya
+    butuh orders & payments tidak ikut membayar geolocation atau leads.
+    ``timings`` mencatat lama load dan status cache tiap tabel, ``ids``
+    menyimpan kamus surrogate key per entitas (lihat ``IdInterner``).
+    Tabel dikembalikan sebagai ``FrozenFrame`` (lihat utils/frozen.py).
+    Tabel turunan di DERIVED_TABLES (mis. ``data["geo_city"]``) juga bisa
+    diakses dengan cara yang sama.
+    """
+
+    def __init__(self, base_path="data", use_cache=True, engine=None):
+        self.base_path = base_path
+        self.use_cache = use_cache
+        self.engine = engine
+        self.timings = {}
+        # Ukuran CSV sumber (byte), untuk throughput parse
+        self.source_bytes = {}
+        self.ids = {entity: IdInterner() for entity in ID_ENTITIES}
+        self._tables = {}
+        # Satu lock per tabel supaya tabel berbeda bisa dibaca bersamaan
+        self._locks = {name: threading.RLock() for name in self}
+
+    def __getitem__(self, name):
+        if name not in DATASET_FILES and name not in DERIVED_TABLES:
+            raise KeyError(name)
+        if name not in self._tables:
+            # Satu registry dipakai bersama oleh semua sesi Streamlit
+            with self._locks[name]:
+                if name not in self._tables:
+                    start = time.perf_counter()
+                    df, status = self._read(name)
+                    self._store(name, df, time.perf_counter() - start, status)
+        return self._tables[name]
+
+    def prefetch(self, names, workers=None):
+        """Baca beberapa tabel sumber bersamaan dengan thread pool.
+
+        Parse CSV/Parquet berjalan paralel (read_csv & pyarrow melepas GIL),
+        jadi cold start dibatasi file terbesar, bukan jumlah semua file.
+        Surrogate key tetap di-intern berurutan sesuai ``names``, sehingga
+        key-nya sama dengan pembacaan satu per satu.
+        """
+        names = [name for name in names if name in DATASET_FILES and name not in self._tables]
+        if not names:
+            return
+        turns = [threading.Event() for _ in names]
+
+        def fetch(i, name):
+            try:
+                with self._locks[name]:
+                    if name in self._tables:
+                        return
+                    start = time.perf_counter()
+                    df, status = load_table(name, self.base_path, use_cache=self.use_cache, engine=self.engine)
+                    seconds = time.perf_counter() - start
+                    if i > 0:
+                        turns[i - 1].wait()
+                    self._store(name, df, seconds, status)
+            finally:
+                turns[i].set()
+
+        workers = min(workers or default_workers(), len(names))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(fetch, i, name) for i, name in enumerate(names)]
+        for future in futures:
+            future.result()
+
+    def _read(self, name):
+        if name in DERIVED_TABLES:
+            # Tabel sumber hanya dibaca jika cache turunan perlu dibangun
+            # ulang. Pakai salinan di registry bila sudah ada; jika belum,
+            # baca langsung tanpa disimpan supaya geolocation (~1 juta
+            # baris) tidak ikut menetap di memori setelah centroid jadi.
+            source = DERIVED_TABLES[name][0]
+
+            def load_source():
+                if source in self._tables:
+                    return self._tables[source]
+                return load_table(source, self.base_path, use_cache=self.use_cache, engine=self.engine)[0]
+
+            return load_derived(name, self.base_path, use_cache=self.use_cache, load_source=load_source)
+        return load_table(name, self.base_path, use_cache=self.use_cache, engine=self.engine)
+
+    def _store(self, name, df, seconds, status):
+        for entity, id_col in ID_ENTITIES.items():
+            if id_col in df.columns:
+                df[f"{entity}_key"] = self.ids[entity].encode(df[id_col])
+        self.timings[name] = (seconds, status)
+        if name in DATASET_FILES:
+            csv_path = os.path.join(self.base_path, DATASET_FILES[name])
+            if os.path.exists(csv_path):
+                self.source_bytes[name] = os.path.getsize(csv_path)
+        # Satu salinan per proses untuk semua sesi: read-only
+        self._tables[name] = freeze(df)
+
+    def throughput(self, name):
+        """Byte CSV per detik untuk tabel yang benar-benar di-parse dari CSV."""
+        seconds, status = self.timings[name]
+        if status == "hit" or name not in self.source_bytes or seconds <= 0:
+            return None
+        return self.source_bytes[name] / seconds
+
+    def __iter__(self):
+        return iter([*DATASET_FILES, *DERIVED_TABLES])
+
+    def __len__(self):
+        return len(DATASET_FILES) + len(DERIVED_TABLES)
+
+    def loaded(self):
+        return list(self._tables)
+
+    def decode(self, entity, keys):
+        # Surrogate key -> id string asli, hanya untuk tampilan
+        return self.ids[entity].decode(keys)
+
+
+def load_all_data(base_path="data", use_cache=True, engine=None):
+    # Tabel baru dibaca saat diakses (lihat LazyData)
+    return LazyData(base_path, use_cache=use_cache, engine=engine)
+
+
+def warm_cache(base_path="data", workers=1, engine=None, use_cache=True, report=None):
+    """Bangun/cek ulang cache Parquet untuk semua tabel (dipakai sebelum deploy).
+
+    Tabel yang sumbernya tidak tersedia mendapat status "missing". Dengan
+    ``workers`` > 1 tabel sumber dibaca bersamaan. Jika ``report`` (dict)
+    diberikan, diisi nama -> (detik, byte CSV).
+    """
+    def warm(name):
+        start = time.perf_counter()
+        try:
+            status = load_table(name, base_path, use_cache=use_cache, engine=engine)[1]
+        except FileNotFoundError:
+            return "missing", 0.0, 0
+        csv_path = os.path.join(base_path, DATASET_FILES[name])
+        return status, time.perf_counter() - start, os.path.getsize(csv_path)
+
+    statuses = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for name, (status, seconds, size) in zip(DATASET_FILES, pool.map(warm, DATASET_FILES)):
+            statuses[name] = status
+            if report is not None:
+                report[name] = (seconds, size)
+    for name in DERIVED_TABLES:
+        try:
+            statuses[name] = load_derived(name, base_path, use_cache=use_cache, engine=engine)[1]
+        except FileNotFoundError:
+            statuses[name] = "missing"
+    return statuses
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kelola cache Parquet dataset dashboard")
+    parser.add_argument("command", choices=["warm"], help="warm: bangun cache untuk semua CSV")
+    parser.add_argument("--base-path", default="data")
+    parser.add_argument("--offline", action="store_true", help="jangan mengunduh file yang tidak ada")
+    parser.add_argument("--workers", type=int, default=default_workers(), help="jumlah tabel yang dibaca bersamaan")
+    parser.add_argument("--engine", choices=["c", "pyarrow"], default=None, help="engine read_csv")
+    parser.add_argument("--no-cache", action="store_true", help="selalu parse CSV (ukur waktu parse murni)")
+    args = parser.parse_args()
+    if args.offline:
+        os.environ[OFFLINE_ENV] = "1"
+
+    report = {}
+    start = time.perf_counter()
+    statuses = warm_cache(args.base_path, workers=args.workers, engine=args.engine,
+                          use_cache=not args.no_cache, report=report)
+    wall = time.perf_counter() - start
+    for table, status in statuses.items():
+        seconds, size = report.get(table, (None, 0))
+        if seconds and status != "hit":
+            print(f"{table:<18} {status:<8} {seconds:6.2f}s  {size / seconds / 2**20:8.1f} MB/s")
+        elif seconds:
+            print(f"{table:<18} {status:<8} {seconds:6.2f}s")
+        else:
+            print(f"{table:<18} {status}")
+    parsed = [seconds for seconds, _ in report.values() if seconds]
+    print(f"total {wall:.2f}s (workers={args.workers}); jumlah per tabel {sum(parsed):.2f}s, "
+          f"tabel terlama {max(parsed, default=0.0):.2f}s")
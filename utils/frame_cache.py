@@ -0,0 +1,186 @@
+import hashlib
+import inspect
+import os
+import threading
+from collections import OrderedDict
+
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from utils.data_loader import CACHE_DIR_NAME
+from utils.frozen import freeze
+
+# Hasil turunan dibagi antar proses worker di <base_path>/.cache/frames
+FRAMES_DIR_NAME = "frames"
+
+# Budget tiap tingkat (MB) bisa diatur lewat env var saat deploy
+MEMORY_BUDGET_ENV = "FRAME_CACHE_MEMORY_MB"
+DISK_BUDGET_ENV = "FRAME_CACHE_DISK_MB"
+
+
+def _frame_bytes(df):
+    # Harus dipanggil sebelum freeze(): memory_usage(deep=True) tidak bisa
+    # membaca buffer kolom object yang sudah read-only
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class FrameCache:
+    """Cache DataFrame turunan dua tingkat dengan budget byte dan LRU.
+
+    Tingkat memori dipakai bersama oleh semua sesi di satu proses. Tingkat
+    disk berupa file Feather (Arrow IPC) tanpa kompresi yang dibaca lewat
+    memory map, sehingga beberapa proses worker di host yang sama berbagi
+    page cache OS untuk hasil yang sama. Kolom numerik tanpa null
+    dikembalikan sebagai view zero-copy ke memory map dan read-only; kolom
+    string/kategori dimaterialisasi sekali per proses.
+
+    ``namespace`` masuk ke setiap kunci (digest file sumber + ``code_version``
+    kode yang menghitungnya), jadi hasil dari data atau kode lama tidak
+    pernah terbaca setelah CSV atau fungsinya berubah. Frame yang tidak bisa
+    diserialisasi Arrow hanya disimpan di tingkat memori.
+    """
+
+    def __init__(self, directory, namespace="", memory_bytes=512 << 20, disk_bytes=2 << 30):
+        self.directory = directory
+        self.namespace = namespace
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+        self._memory = OrderedDict()
+        self._memory_used = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        digest = hashlib.sha1(repr((self.namespace, key)).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.arrow")
+
+    def get(self, key):
+        """``(frame, tier)`` dengan tier "memory"/"disk", atau ``(None, None)``."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return self._memory[key][0], "memory"
+
+        path = self._path(key)
+        try:
+            df, size = self._open(path)
+            # mtime = waktu pakai terakhir, dasar LRU tingkat disk
+            os.utime(path)
+        except (OSError, pa.ArrowInvalid):
+            with self._lock:
+                self.stats["misses"] += 1
+            return None, None
+        self._remember(key, df, size)
+        with self._lock:
+            self.stats["disk_hits"] += 1
+        return df, "disk"
+
+    def put(self, key, df):
+        """Simpan ``df`` dan kembalikan versi read-only yang dibaca dari disk."""
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            feather.write_feather(df, tmp_path, compression="uncompressed")
+            os.replace(tmp_path, path)
+        except (OSError, pa.ArrowException, ValueError, TypeError):
+            # Disk penuh/read-only atau kolom yang tidak didukung Arrow (mis.
+            # object campuran): tetap dibagi antar sesi lewat tingkat memori
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            size = _frame_bytes(df)
+            shared = freeze(df)
+            self._remember(key, shared, size)
+            return shared
+        self._evict_disk(keep=os.path.basename(path))
+        shared, size = self._open(path)
+        self._remember(key, shared, size)
+        return shared
+
+    def get_or_compute(self, key, compute):
+        df, tier = self.get(key)
+        if df is None:
+            df, tier = self.put(key, compute()), None
+        return df, tier
+
+    def _open(self, path):
+        table = feather.read_table(path, memory_map=True)
+        # split_blocks: satu blok per kolom supaya kolom numerik tidak disalin
+        df = table.to_pandas(split_blocks=True)
+        size = _frame_bytes(df)
+        return freeze(df), size
+
+    def _remember(self, key, df, size):
+        if size > self.memory_bytes:
+            return
+        with self._lock:
+            if key in self._memory:
+                self._memory_used -= self._memory.pop(key)[1]
+            self._memory[key] = (df, size)
+            self._memory_used += size
+            while self._memory_used > self.memory_bytes:
+                _, (_, evicted) = self._memory.popitem(last=False)
+                self._memory_used -= evicted
+                self.stats["memory_evictions"] += 1
+
+    def _evict_disk(self, keep=None):
+        # File tertua (mtime) dihapus sampai total di bawah budget; proses lain
+        # yang masih memetakan file itu tetap aman (POSIX unlink)
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".arrow"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.disk_bytes:
+                break
+            if name == keep:
+                continue
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            total -= size
+            with self._lock:
+                self.stats["disk_evictions"] += 1
+
+    def usage(self):
+        with self._lock:
+            return {"memory_entries": len(self._memory), "memory_bytes": self._memory_used, **self.stats}
+
+
+def code_version(*objects):
+    """Digest source fungsi/modul yang menghasilkan frame yang di-cache.
+
+    Dipakai sebagai bagian ``namespace``: mengubah fungsi node (atau modul
+    utils yang dipanggilnya) otomatis membuang hasil lama di disk.
+    """
+    h = hashlib.sha1()
+    for obj in objects:
+        h.update(inspect.getsource(obj).encode("utf-8"))
+    return h.hexdigest()
+
+
+def default_frame_cache(namespace, base_path="data"):
+    memory_mb = int(os.environ.get(MEMORY_BUDGET_ENV, 512))
+    disk_mb = int(os.environ.get(DISK_BUDGET_ENV, 2048))
+    return FrameCache(
+        os.path.join(base_path, CACHE_DIR_NAME, FRAMES_DIR_NAME),
+        namespace=namespace,
+        memory_bytes=memory_mb << 20,
+        disk_bytes=disk_mb << 20,
+    )
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+
+class FrozenFrame(pd.DataFrame):
+    """DataFrame yang dibagi antar sesi: kolomnya tidak bisa diganti in-place.
+
+    ``df[col] = ...``, ``del df[col]``, ``insert``/``pop`` dan method
+    ``inplace=True`` melempar TypeError; array NumPy di baliknya read-only,
+    jadi ``df.loc[...] = ...`` juga gagal. Operasi yang menghasilkan frame
+    baru (filter, ``assign``, merge, groupby) mengembalikan DataFrame biasa
+    yang bebas diubah.
+    """
+
+    _metadata = []
+
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+
+    def _refuse(self, *args, **kwargs):
+        raise TypeError(
+            "Frame ini dibagi antar sesi dan read-only; pakai df.assign(...) "
+            "atau mutable_copy(df) untuk versi yang bisa diubah"
+        )
+
+    __setitem__ = _refuse
+    __delitem__ = _refuse
+    insert = _refuse
+    pop = _refuse
+    _update_inplace = _refuse
+
+
+def freeze(df):
+    """Bungkus ``df`` sebagai FrozenFrame tanpa menyalin data."""
+    if isinstance(df, FrozenFrame):
+        return df
+    # Blok internal pandas: satu-satunya cara menandai array aslinya (bukan
+    # view) read-only. Extension array (string pyarrow) sudah immutable.
+    for block in df._mgr.blocks:
+        if isinstance(block.values, np.ndarray):
+            block.values.flags.writeable = False
+    return FrozenFrame(df)
+
+
+def mutable_copy(df):
+    """Salinan biasa yang boleh diubah, untuk kode yang memang perlu in-place."""
+    return pd.DataFrame(df, copy=True)
@@ -0,0 +1,30 @@
+import numpy as np
+
+
+def centroids(geolocation, keys, lat_col="geolocation_lat", lng_col="geolocation_lng"):
+    """Titik tengah per grup (mis. per kota): median lat/lng dan jumlah titik.
+
+    Median dipakai, bukan titik pertama atau mean, supaya beberapa koordinat
+    yang salah input di dataset geolocation tidak menggeser titik kota.
+    """
+    valid = geolocation[lat_col].notna() & geolocation[lng_col].notna()
+    grouped = geolocation[valid].groupby(keys, observed=True)
+    result = grouped[[lat_col, lng_col]].median().astype(np.float32)
+    result["points"] = grouped.size().astype(np.int32)
+    return result.reset_index()
+
+
+def state_totals(customer_orders, payments, state_col="customer_state"):
+    """Jumlah order unik dan total pembayaran per state.
+
+    Pembayaran dijumlahkan per order dulu lalu dipetakan ke state, jadi satu
+    order dihitung sekali walaupun punya beberapa baris (item/pembayaran).
+    """
+    order_revenue = payments.groupby("order_key")["payment_value"].sum()
+    orders = customer_orders[["order_key", state_col]].drop_duplicates("order_key")
+    return orders.assign(
+        order_revenue=orders["order_key"].map(order_revenue)
+    ).groupby(state_col, observed=True).agg(
+        total_orders=("order_key", "nunique"),
+        total_revenue=("order_revenue", "sum"),
+    ).reset_index()
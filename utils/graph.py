@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from utils.frozen import freeze
+
+
+class Node:
+    def __init__(self, name, func, deps, params, shared):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.params = tuple(params)
+        self.shared = shared
+
+
+class ComputeGraph:
+    """Graf dataset turunan yang dihitung saat diminta dan di-memo per input.
+
+    Tiap node mendeklarasikan node lain yang dibutuhkannya (``deps``) dan
+    parameter rerun yang dibacanya langsung (``params``, mis. ``period``).
+    Kunci memo sebuah node adalah nilai semua parameter yang dipakai node itu
+    dan seluruh dependensinya, jadi node tanpa parameter (join orders x
+    payments, cube harian) cukup dihitung sekali per proses, sedangkan node
+    per periode menyimpan ``max_keys`` rentang terakhir (LRU).
+
+    Node ``shared=True`` (DataFrame) tidak memakai memo ini, melainkan
+    ``store`` (lihat ``utils.frame_cache.FrameCache``): budget byte dan
+    hasilnya dibagi antar proses worker.
+    """
+
+    def __init__(self, max_keys=8, store=None):
+        self.max_keys = max_keys
+        self.store = store
+        self._nodes = {}
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, func, deps=(), params=(), shared=False):
+        missing = [dep for dep in deps if dep not in self._nodes]
+        if missing:
+            raise KeyError(f"node {name!r}: dependensi belum terdaftar: {missing}")
+        self._nodes[name] = Node(name, func, deps, params, shared and self.store is not None)
+        self._memo[name] = OrderedDict()
+        return self
+
+    def node(self, name, deps=(), params=(), shared=False):
+        # Versi dekorator dari add()
+        def register(func):
+            self.add(name, func, deps, params, shared)
+            return func
+        return register
+
+    def params_of(self, name):
+        """Parameter yang (langsung atau lewat dependensi) menentukan node."""
+        node = self._nodes[name]
+        found = set(node.params)
+        for dep in node.deps:
+            found.update(self.params_of(dep))
+        return tuple(sorted(found))
+
+    def run(self, **params):
+        return GraphRun(self, params)
+
+    def _get(self, name, run):
+        if name in run.values:
+            return run.values[name]
+        node = self._nodes[name]
+        key = tuple(run.params[p] for p in self.params_of(name))
+        if node.shared:
+            return self._get_shared(node, key, run)
+        memo = self._memo[name]
+        with self._lock:
+            hit = key in memo
+            if hit:
+                memo.move_to_end(key)
+                value = memo[key]
+        if hit:
+            run.record(name, value, 0.0, "cache")
+            return value
+
+        # Dependensi dihitung (atau diambil dari memo) lebih dulu, di luar lock
+        inputs = [self._get(dep, run) for dep in node.deps]
+        start = time.perf_counter()
+        value = node.func(*inputs, *(run.params[p] for p in node.params))
+        if isinstance(value, pd.DataFrame):
+            # Nilai memo dibagi antar sesi: frame dibekukan sebelum disimpan
+            value = freeze(value)
+        run.record(name, value, time.perf_counter() - start, "dihitung")
+
+        with self._lock:
+            memo[key] = value
+            memo.move_to_end(key)
+            while len(memo) > self.max_keys:
+                memo.popitem(last=False)
+        return value
+
+    def _get_shared(self, node, key, run):
+        value, tier = self.store.get((node.name, key))
+        if value is not None:
+            run.record(node.name, value, 0.0, tier)
+            return value
+        inputs = [self._get(dep, run) for dep in node.deps]
+        start = time.perf_counter()
+        value = self.store.put((node.name, key), node.func(*inputs, *(run.params[p] for p in node.params)))
+        run.record(node.name, value, time.perf_counter() - start, "dihitung")
+        return value
+
+
+class GraphRun:
+    """Satu rerun: nilai parameter + jejak node yang dihitung / dari cache."""
+
+    def __init__(self, graph, params):
+        self.graph = graph
+        self.params = params
+        self.values = {}
+        # (node, detik, status), urut sesuai selesai di-resolve. Status:
+        # "dihitung", "cache" (memo graf), "memory" / "disk" (store)
+        self.trace = []
+
+    def bind(self, **params):
+        # Parameter yang baru diketahui di tengah rerun (mis. periode dari sidebar)
+        self.params.update(params)
+
+    def record(self, name, value, seconds, status):
+        self.values[name] = value
+        self.trace.append((name, seconds, status))
+
+    def get(self, *names):
+        values = [self.graph._get(name, self) for name in names]
+        return values[0] if len(names) == 1 else values
@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+
+from utils.cohort import _month_codes, _month_labels
+from utils.search_index import tokenize
+
+# Stopword Portugis ringkas (sudah tanpa aksen, sama seperti hasil tokenize)
+STOPWORDS = frozenset("""
+a ao aos as ate com como da das de dela dele do dos e ela ele eles em entre era
+essa esse esta este eu foi for ha isso ja la lhe mais mas me meu minha muito na
+nas nem no nos o os ou para pela pelo por pra qual quando que se sem ser seu sua
+so sao tambem te tem tinha um uma voce vc
+""".split())
+
+# Bucket skor: 0 = negatif (1-2), 1 = netral (3), 2 = positif (4-5)
+SCORE_BUCKETS = ("negative", "neutral", "positive")
+NEGATIVE, NEUTRAL, POSITIVE = range(3)
+
+# Bobot total prior Dirichlet (dibagi proporsional ke frekuensi global term)
+PRIOR_WEIGHT = 500.0
+
+
+def score_bucket(scores):
+    scores = np.asarray(scores)
+    return np.select([scores <= 2, scores == 3], [NEGATIVE, NEUTRAL], POSITIVE).astype(np.int8)
+
+
+def review_terms(text, stopwords=STOPWORDS):
+    """Unigram + bigram dari satu ulasan, setelah stopword dan angka dibuang."""
+    tokens = [t for t in tokenize(text) if len(t) > 1 and t not in stopwords and not t.isdigit()]
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+class KeywordCounts:
+    """Hitungan term sparse per (kategori, bulan, bucket skor).
+
+    ``counts`` berbentuk panjang (kolom month, bucket, term, count) dan
+    terurut per kategori; ``offsets`` memetakan kategori ke rentang barisnya.
+    Karena hitungan bisa dijumlah, rentang tanggal apa pun cukup dijawab
+    dengan menjumlah partisi bulanan di potongan kategori tersebut.
+    """
+
+    def __init__(self, counts, offsets, vocabulary):
+        self.counts = counts
+        self.offsets = offsets
+        self.vocabulary = vocabulary
+        self.global_counts = np.bincount(
+            counts["term"].to_numpy(), weights=counts["count"].to_numpy(), minlength=len(vocabulary)
+        )
+
+    def _partition(self, category):
+        start, stop = self.offsets.get(category, (0, 0))
+        return self.counts.iloc[start:stop]
+
+    def months(self, category):
+        """Daftar (kode bulan, label 'YYYY-MM') yang punya ulasan di kategori."""
+        codes = np.unique(self._partition(category)["month"].to_numpy())
+        return list(zip(codes.tolist(), _month_labels(codes).tolist()))
+
+    def bucket_counts(self, category, start_month=None, end_month=None):
+        """Matriks (3, n_term): jumlah partisi bulanan dalam rentang, per bucket."""
+        part = self._partition(category)
+        months = part["month"].to_numpy()
+        keep = np.ones(len(part), dtype=bool)
+        if start_month is not None:
+            keep &= months >= start_month
+        if end_month is not None:
+            keep &= months <= end_month
+        buckets = part["bucket"].to_numpy()[keep]
+        terms = part["term"].to_numpy()[keep]
+        weights = part["count"].to_numpy()[keep]
+        n_terms = len(self.vocabulary)
+        cells = np.bincount(buckets.astype(np.int64) * n_terms + terms, weights=weights,
+                            minlength=len(SCORE_BUCKETS) * n_terms)
+        return cells.reshape(len(SCORE_BUCKETS), n_terms)
+
+    def top_terms(self, category, start_month=None, end_month=None, n=10, min_count=3):
+        """Term paling khas ulasan positif vs negatif (log-odds, prior Dirichlet).
+
+        Mengembalikan (positif, negatif): DataFrame term, positive, negative,
+        z_score, masing-masing terurut dari yang paling khas.
+        """
+        counts = self.bucket_counts(category, start_month, end_month)
+        positive, negative = counts[POSITIVE], counts[NEGATIVE]
+        total = positive + negative
+        candidates = np.flatnonzero(total >= min_count)
+        empty = pd.DataFrame(columns=["term", "positive", "negative", "z_score"])
+        if len(candidates) == 0:
+            return empty, empty
+
+        prior = PRIOR_WEIGHT * self.global_counts / max(self.global_counts.sum(), 1.0)
+        prior_total = prior.sum()
+        y_pos, y_neg, alpha = positive[candidates], negative[candidates], prior[candidates]
+        n_pos, n_neg = positive.sum(), negative.sum()
+        delta = (
+            np.log((y_pos + alpha) / (n_pos + prior_total - y_pos - alpha))
+            - np.log((y_neg + alpha) / (n_neg + prior_total - y_neg - alpha))
+        )
+        z_score = delta / np.sqrt(1.0 / (y_pos + alpha) + 1.0 / (y_neg + alpha))
+
+        table = pd.DataFrame({
+            "term": self.vocabulary[candidates],
+            "positive": y_pos.astype(np.int64),
+            "negative": y_neg.astype(np.int64),
+            "z_score": z_score,
+        })
+        top_positive = table[table["z_score"] > 0].nlargest(n, "z_score").reset_index(drop=True)
+        top_negative = table[table["z_score"] < 0].nsmallest(n, "z_score").reset_index(drop=True)
+        return top_positive, top_negative
+
+
+def build_keyword_counts(facts, category_col="product_category_name_english",
+                         text_col="review_comment_message", date_col="review_creation_date"):
+    """Bangun ``KeywordCounts`` dari ``ReviewFacts`` (satu kali per proses).
+
+    Satu ulasan dihitung sekali per kategori walaupun pesanannya punya
+    beberapa item di kategori yang sama.
+    """
+    frame = facts.frame
+    frame = frame[frame[text_col].notna() & frame[category_col].notna() & frame[date_col].notna()]
+    frame = frame.drop_duplicates(["review_id", category_col])
+
+    category_codes = frame[category_col].cat.codes.to_numpy()
+    months = _month_codes(frame[date_col])
+    buckets = score_bucket(frame["review_score"].to_numpy())
+
+    rows, terms = [], []
+    for row, text in enumerate(frame[text_col].tolist()):
+        review = review_terms(text)
+        rows.extend([row] * len(review))
+        terms.extend(review)
+    rows = np.asarray(rows, dtype=np.int64)
+    vocabulary, term_ids = np.unique(np.asarray(terms, dtype=str), return_inverse=True)
+
+    counts = pd.DataFrame({
+        "category": category_codes[rows],
+        "month": months[rows].astype(np.int32),
+        "bucket": buckets[rows],
+        "term": term_ids.astype(np.int32),
+    })
+    counts = (
+        counts.groupby(["category", "month", "bucket", "term"]).size()
+        .rename("count").astype(np.int32).reset_index()
+    )
+
+    categories = frame[category_col].cat.categories
+    codes = counts["category"].to_numpy()
+    starts = np.searchsorted(codes, np.arange(len(categories)), side="left")
+    stops = np.searchsorted(codes, np.arange(len(categories)), side="right")
+    offsets = {
+        category: (int(start), int(stop))
+        for category, start, stop in zip(categories, starts, stops)
+        if stop > start
+    }
+    return KeywordCounts(counts.drop(columns="category"), offsets, vocabulary.astype(object))
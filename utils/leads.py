@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+from utils.timeline import sort_by_time, slice_by_time
+
+LEAD_TIME_COLUMN = "first_contact_date"
+# Atribut yang hanya terisi setelah deal ditutup (dari closed_deals)
+DEAL_COLUMNS = ["won_date", "seller_id", "business_segment", "lead_type", "lead_behaviour_profile", "business_type"]
+
+
+def build_lead_facts(leads_qualified, leads_closed):
+    """Satu baris per MQL, digabung dengan deal-nya (jika ada) lewat ``mql_id``.
+
+    Menambah kolom ``closed`` (bool) dan ``days_to_close`` (first contact ->
+    won, dalam hari; NaN jika belum closed), lalu diurutkan per
+    ``first_contact_date`` agar bisa dipotong per rentang tanggal.
+    """
+    deal_columns = ["mql_id"] + [col for col in DEAL_COLUMNS if col in leads_closed.columns]
+    deals = leads_closed[deal_columns].drop_duplicates("mql_id")
+    facts = leads_qualified.merge(deals, on="mql_id", how="left")
+    facts["closed"] = facts["won_date"].notna()
+    elapsed = facts["won_date"] - facts[LEAD_TIME_COLUMN]
+    facts["days_to_close"] = (elapsed.dt.total_seconds() / 86400).astype(np.float32)
+    return sort_by_time(facts, LEAD_TIME_COLUMN)
+
+
+def leads_in_period(facts, start_date, end_date):
+    # Tanggal None berarti tanpa filter (mis. data order tanpa tanggal valid)
+    if start_date is None or end_date is None:
+        return facts
+    return slice_by_time(facts, start_date, end_date, LEAD_TIME_COLUMN)
+
+
+def funnel_totals(facts):
+    leads = len(facts)
+    closed = int(facts["closed"].sum())
+    days = facts["days_to_close"].dropna()
+    return {
+        "leads": leads,
+        "closed": closed,
+        "conversion": closed / leads if leads else 0.0,
+        "median_days_to_close": float(days.median()) if len(days) else float("nan"),
+    }
+
+
+def conversion_by(facts, column, min_leads=1):
+    """Jumlah MQL, deal closed dan conversion rate per nilai ``column`` (mis. origin)."""
+    grouped = facts.groupby(column, observed=True)["closed"].agg(leads="size", closed="sum").reset_index()
+    grouped = grouped[grouped["leads"] >= min_leads]
+    grouped = grouped.assign(conversion=grouped["closed"] / grouped["leads"])
+    return grouped.sort_values("leads", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def deals_by(facts, column):
+    """Breakdown deal closed per atribut deal (business_segment, lead_type).
+
+    Atribut ini hanya ada untuk lead yang sudah closed, jadi yang dihitung
+    adalah porsi deal dan waktu closing, bukan conversion rate.
+    """
+    deals = facts[facts["closed"]]
+    grouped = deals.groupby(column, observed=True)["days_to_close"].agg(
+        deals="size", median_days_to_close="median"
+    ).reset_index()
+    grouped = grouped.assign(share=grouped["deals"] / max(len(deals), 1))
+    return grouped.sort_values("deals", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def time_to_close_histogram(facts, bin_days=7, max_quantile=0.99):
+    """Distribusi hari sampai closing dalam bin ``bin_days`` hari.
+
+    Ekor panjang dipotong di kuantil ``max_quantile``; deal di atasnya masuk
+    bin terakhir. Kolom: bin_start, bin_end, deals.
+    """
+    days = facts["days_to_close"].dropna().to_numpy(dtype=np.float64)
+    days = days[days >= 0]
+    if len(days) == 0:
+        return pd.DataFrame(columns=["bin_start", "bin_end", "deals"])
+    upper = max(np.quantile(days, max_quantile), bin_days)
+    edges = np.arange(0, upper + bin_days, bin_days)
+    counts, edges = np.histogram(np.minimum(days, edges[-1] - 1e-9), bins=edges)
+    return pd.DataFrame({"bin_start": edges[:-1], "bin_end": edges[1:], "deals": counts})
@@ -0,0 +1,84 @@
+import folium
+import numpy as np
+import pandas as pd
+
+MAP_CENTER = [-2.5489, 118.0149]
+MAP_TILES = "CartoDB positron"
+# Di atas jumlah titik ini, titik diagregasi ke sel grid di sisi server
+BIN_THRESHOLD = 2000
+BIN_CELL_DEGREES = 0.5
+
+
+def points_geojson(frame, lat_col, lng_col, properties):
+    """FeatureCollection titik dari kolom frame (baris tanpa koordinat dibuang).
+
+    Koordinat dan properti diambil per kolom, bukan lewat iterrows.
+    """
+    valid = frame[lat_col].notna() & frame[lng_col].notna()
+    frame = frame[valid]
+    coordinates = np.column_stack([
+        frame[lng_col].to_numpy(dtype=float), frame[lat_col].to_numpy(dtype=float)
+    ]).tolist()
+    props = frame[list(properties)].astype(object).where(frame[list(properties)].notna(), None)
+    records = props.to_dict("records")
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "geometry": {"type": "Point", "coordinates": coords}, "properties": prop}
+            for coords, prop in zip(coordinates, records)
+        ],
+    }
+
+
+def grid_bins(frame, lat_col, lng_col, weight_col, label_col, cell_degrees=BIN_CELL_DEGREES):
+    """Agregasi titik ke sel grid lat/lng: jumlah bobot, jumlah titik dan centroid berbobot."""
+    frame = frame[frame[lat_col].notna() & frame[lng_col].notna()]
+    weights = frame[weight_col].to_numpy(dtype=float)
+    cells = pd.DataFrame({
+        "cell_lat": np.floor(frame[lat_col].to_numpy(dtype=float) / cell_degrees),
+        "cell_lng": np.floor(frame[lng_col].to_numpy(dtype=float) / cell_degrees),
+        "weight": weights,
+        "lat_w": frame[lat_col].to_numpy(dtype=float) * weights,
+        "lng_w": frame[lng_col].to_numpy(dtype=float) * weights,
+        "label": frame[label_col].astype(str).to_numpy(),
+    })
+    grouped = cells.groupby(["cell_lat", "cell_lng"]).agg(
+        weight=("weight", "sum"), points=("weight", "size"),
+        lat_w=("lat_w", "sum"), lng_w=("lng_w", "sum"), top_label=("label", "first"),
+    ).reset_index()
+    safe_weight = grouped["weight"].where(grouped["weight"] > 0)
+    grouped[lat_col] = (grouped["lat_w"] / safe_weight).fillna((grouped["cell_lat"] + 0.5) * cell_degrees)
+    grouped[lng_col] = (grouped["lng_w"] / safe_weight).fillna((grouped["cell_lng"] + 0.5) * cell_degrees)
+    return grouped.drop(columns=["lat_w", "lng_w", "cell_lat", "cell_lng"])
+
+
+def point_map(frame, lat_col, lng_col, label_col, value_col, label_alias, value_alias,
+              color="blue", radius=6, bin_threshold=BIN_THRESHOLD, cell_degrees=BIN_CELL_DEGREES):
+    """Peta folium dengan semua titik dalam satu layer GeoJson.
+
+    Popup dibuat di browser dari properti fitur saat titik diklik
+    (``GeoJsonPopup``), jadi tidak ada HTML popup per titik di payload. Jika
+    titik lebih dari ``bin_threshold``, titik digabung per sel grid dan
+    ``frame`` diasumsikan sudah terurut dari nilai terbesar (label teratas).
+    """
+    m = folium.Map(location=MAP_CENTER, zoom_start=5, tiles=MAP_TILES)
+    points = frame[[lat_col, lng_col, label_col, value_col]]
+    if points[lat_col].notna().sum() > bin_threshold:
+        points = grid_bins(points, lat_col, lng_col, value_col, label_col, cell_degrees)
+        points = points.rename(columns={"weight": value_col, "top_label": label_col})
+        fields = [label_col, value_col, "points"]
+        aliases = [f"{label_alias} (teratas):", f"{value_alias}:", "Jumlah titik:"]
+    else:
+        fields = [label_col, value_col]
+        aliases = [f"{label_alias}:", f"{value_alias}:"]
+
+    geojson = points_geojson(points, lat_col, lng_col, fields)
+    if not geojson["features"]:
+        # GeoJsonPopup menolak layer tanpa fitur
+        return m
+    folium.GeoJson(
+        geojson,
+        marker=folium.CircleMarker(radius=radius, color=color, fill=True, fill_opacity=0.7),
+        popup=folium.GeoJsonPopup(fields=fields, aliases=aliases, max_width=250),
+    ).add_to(m)
+    return m
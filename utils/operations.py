@@ -0,0 +1,74 @@
+import numpy as np
+
+# Timestamp siklus hidup order, urut sesuai proses
+LIFECYCLE_COLUMNS = [
+    "order_purchase_timestamp",
+    "order_approved_at",
+    "order_delivered_carrier_date",
+    "order_delivered_customer_date",
+    "order_estimated_delivery_date",
+]
+
+# Nilai epoch untuk timestamp kosong (sama dengan representasi int NaT)
+EPOCH_NA = np.iinfo(np.int64).min
+
+# Durasi turunan (hari, float32): nama -> (timestamp awal, timestamp akhir).
+# Nilainya pecahan hari, kecuali WHOLE_DAY_DURATIONS.
+DURATIONS = {
+    "approval_lag_days": ("order_purchase_timestamp", "order_approved_at"),
+    "carrier_handoff_days": ("order_approved_at", "order_delivered_carrier_date"),
+    "delivery_days": ("order_approved_at", "order_delivered_customer_date"),
+    # Positif = terlambat dari estimasi, negatif = lebih cepat
+    "lateness_days": ("order_estimated_delivery_date", "order_delivered_customer_date"),
+}
+# Dibulatkan ke bawah ke hari penuh, sama seperti .dt.days yang dipakai
+# rata-rata, kuartil dan histogram waktu kirim sejak awal
+WHOLE_DAY_DURATIONS = {"delivery_days"}
+
+
+def add_lifecycle_columns(orders):
+    """Tambahkan kolom durasi turunan (DURATIONS) ke frame orders.
+
+    Dipanggil sekali di preprocess; halaman cukup membaca kolom hasilnya.
+    Durasi bernilai NaN jika salah satu timestamp-nya kosong.
+    """
+    # Epoch detik (int64) hanya dipakai di sini, tidak ditambahkan ke orders
+    epochs = {}
+    for col in LIFECYCLE_COLUMNS:
+        if col in orders.columns:
+            epochs[col] = orders[col].to_numpy(dtype="datetime64[s]").astype(np.int64)
+
+    for name, (start_col, end_col) in DURATIONS.items():
+        if start_col not in epochs or end_col not in epochs:
+            continue
+        start, end = epochs[start_col], epochs[end_col]
+        valid = (start != EPOCH_NA) & (end != EPOCH_NA)
+        days = np.full(len(orders), np.nan, dtype=np.float32)
+        days[valid] = (end[valid] - start[valid]) / 86400.0
+        if name in WHOLE_DAY_DURATIONS:
+            days = np.floor(days)
+        orders[name] = days
+    return orders
+
+
+def sla_percentiles(frame, metric, by, percentiles=(0.5, 0.9, 0.95), min_count=1):
+    """Persentil ``metric`` per grup ``by`` (mis. bulan, state, seller).
+
+    Kolom hasil: by, orders, p50, p90, ... terurut dari jumlah order terbanyak.
+    """
+    values = frame[[by, metric]].dropna()
+    grouped = values.groupby(by, observed=True)[metric]
+    table = grouped.quantile(list(percentiles)).unstack()
+    table.columns = [f"p{round(p * 100)}" for p in percentiles]
+    table.insert(0, "orders", grouped.size())
+    table = table[table["orders"] >= min_count]
+    return table.sort_values("orders", ascending=False, kind="stable").reset_index()
+
+
+def on_time_rate(frame, by=None, lateness_col="lateness_days"):
+    """Porsi order terkirim yang sampai paling lambat di tanggal estimasi."""
+    delivered = frame[frame[lateness_col].notna()]
+    on_time = delivered[lateness_col] < 1.0  # sampai sebelum akhir hari estimasi
+    if by is None:
+        return float(on_time.mean()) if len(delivered) else float("nan")
+    return on_time.groupby(delivered[by], observed=True).mean()
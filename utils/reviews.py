@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from utils.data_loader import merge_on_key
+
+CATEGORY_COLUMN = "product_category_name_english"
+
+
+class ReviewFacts:
+    """Tabel fakta ulasan (review x item x produk x kategori) yang terurut per kategori.
+
+    ``offsets`` memetakan kategori ke rentang baris (start, stop), jadi memilih
+    satu kategori adalah potongan O(k) tanpa boolean mask atas semua ulasan.
+    ``positions[fact_id]`` adalah baris di ``frame`` untuk baris ke-``fact_id``
+    hasil merge (urutan asli, stabil saat ulasan baru ditambahkan di akhir).
+    """
+
+    def __init__(self, frame, offsets, positions):
+        self.frame = frame
+        self.offsets = offsets
+        self.positions = positions
+
+    @property
+    def categories(self):
+        return list(self.offsets)
+
+    def for_category(self, category):
+        start, stop = self.offsets.get(category, (0, 0))
+        return self.frame.iloc[start:stop]
+
+    def texts(self, columns=("review_comment_title", "review_comment_message")):
+        """Judul + isi ulasan per baris, dalam urutan fact_id (untuk indeks pencarian)."""
+        parts = [self.frame[col].astype(object).fillna("").astype(str) for col in columns]
+        combined = parts[0]
+        for part in parts[1:]:
+            combined = combined + " " + part
+        return combined.to_numpy(dtype=object)[self.positions]
+
+
+def build_review_facts(order_reviews, order_items, products, product_cat):
+    """Gabungkan ulasan dengan item, produk dan terjemahan kategori, sekali saja."""
+    facts = merge_on_key(order_reviews, order_items, on="order_key", how="left")
+    facts = merge_on_key(facts, products, on="product_key", how="left")
+    facts = facts.merge(product_cat, on="product_category_name", how="left")
+
+    for col in ("review_creation_date", "review_answer_timestamp"):
+        if col in facts.columns:
+            facts[col] = pd.to_datetime(facts[col], errors="coerce")
+
+    # Kategori sebagai categorical terurut alfabet; baris tanpa kategori di akhir
+    names = facts[CATEGORY_COLUMN].astype("string")
+    categories = sorted(names.dropna().unique())
+    facts[CATEGORY_COLUMN] = pd.Categorical(names, categories=categories)
+    codes = facts[CATEGORY_COLUMN].cat.codes.to_numpy()
+    sort_codes = np.where(codes < 0, len(categories), codes)
+    order = np.argsort(sort_codes, kind="stable")
+    facts = facts.iloc[order].reset_index(drop=True)
+    positions = np.empty(len(order), dtype=np.int64)
+    positions[order] = np.arange(len(order))
+
+    sorted_codes = np.sort(sort_codes, kind="stable")
+    starts = np.searchsorted(sorted_codes, np.arange(len(categories)), side="left")
+    stops = np.searchsorted(sorted_codes, np.arange(len(categories)), side="right")
+    offsets = {
+        category: (int(start), int(stop))
+        for category, start, stop in zip(categories, starts, stops)
+        if stop > start
+    }
+    return ReviewFacts(facts, offsets, positions)
@@ -0,0 +1,219 @@
+import os
+import pickle
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from utils.data_loader import CACHE_DIR_NAME
+
+# Parameter BM25 standar
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Versi format file indeks; naikkan jika struktur berubah supaya dibangun ulang
+INDEX_VERSION = 1
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text):
+    """Huruf kecil tanpa aksen: 'Não Chegou' -> 'nao chegou'."""
+    decomposed = unicodedata.normalize("NFKD", str(text).lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text):
+    if not isinstance(text, str) or not text:
+        return []
+    return _TOKEN_RE.findall(normalize(text))
+
+
+def parse_query(query):
+    """Query -> daftar klausa OR, tiap klausa daftar (term, prefix) yang di-AND.
+
+    Kata dipisah spasi = AND, ``OR`` atau ``|`` memisahkan klausa, akhiran
+    ``*`` = prefix. Contoh: ``entreg* rapido OR atraso``.
+    """
+    clauses, current = [], []
+    for word in query.replace("|", " | ").split():
+        if word in ("OR", "|"):
+            if current:
+                clauses.append(current)
+            current = []
+            continue
+        prefix = word.endswith("*")
+        tokens = tokenize(word.rstrip("*"))
+        current.extend((token, False) for token in tokens[:-1])
+        if tokens:
+            current.append((tokens[-1], prefix))
+    if current:
+        clauses.append(current)
+    return clauses
+
+
+class InvertedIndex:
+    """Indeks terbalik (term -> dokumen) dalam bentuk CSR dengan skor BM25.
+
+    ``terms`` terurut (untuk prefix lewat bisect), posting term ke-i ada di
+    ``doc_ids[offsets[i]:offsets[i + 1]]`` (terurut) dengan frekuensi ``tfs``.
+    Dokumen bernomor 0..n-1; ``add_documents`` menambah dokumen di akhir tanpa
+    men-tokenisasi ulang dokumen lama.
+    """
+
+    def __init__(self):
+        self.terms = []
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.doc_ids = np.zeros(0, dtype=np.int32)
+        self.tfs = np.zeros(0, dtype=np.int32)
+        self.doc_lengths = np.zeros(0, dtype=np.int32)
+        self.doc_hashes = np.zeros(0, dtype=np.uint64)
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    def add_documents(self, texts):
+        texts = list(texts)
+        first_id = len(self)
+        new_terms, new_docs, new_tfs, lengths = [], [], [], []
+        for offset, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            lengths.append(sum(counts.values()))
+            new_terms.extend(counts)
+            new_docs.extend([first_id + offset] * len(counts))
+            new_tfs.extend(counts.values())
+
+        # Gabungkan posting lama (diekspansi dari CSR) dengan posting baru
+        old_terms = np.repeat(np.array(self.terms, dtype=object), np.diff(self.offsets))
+        all_terms = np.concatenate([old_terms, np.array(new_terms, dtype=object)])
+        all_docs = np.concatenate([self.doc_ids, np.array(new_docs, dtype=np.int32)])
+        all_tfs = np.concatenate([self.tfs, np.array(new_tfs, dtype=np.int32)])
+
+        vocabulary, term_codes = np.unique(all_terms.astype(str), return_inverse=True)
+        # Sort stabil per term: dokumen baru selalu bernomor lebih besar
+        order = np.lexsort((all_docs, term_codes))
+        counts = np.bincount(term_codes, minlength=len(vocabulary))
+
+        self.terms = vocabulary.tolist()
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self.doc_ids = all_docs[order]
+        self.tfs = all_tfs[order]
+        self.doc_lengths = np.concatenate([self.doc_lengths, np.array(lengths, dtype=np.int32)])
+        self.doc_hashes = np.concatenate([self.doc_hashes, document_hashes(texts)])
+        return self
+
+    def _term_range(self, term, prefix):
+        lo = bisect_left(self.terms, term)
+        if prefix:
+            hi = bisect_left(self.terms, term + "\uffff")
+        else:
+            hi = lo + 1 if lo < len(self.terms) and self.terms[lo] == term else lo
+        return lo, hi
+
+    def _match(self, term, prefix):
+        # Dokumen + skor BM25 untuk satu term query (prefix = gabungan banyak term)
+        lo, hi = self._term_range(term, prefix)
+        if lo == hi:
+            return np.zeros(0, dtype=np.int32), np.zeros(0)
+        n_docs = len(self)
+        avg_length = max(self.doc_lengths.mean(), 1.0)
+        docs, scores = [], []
+        for i in range(lo, hi):
+            start, stop = self.offsets[i], self.offsets[i + 1]
+            posting_docs = self.doc_ids[start:stop]
+            tf = self.tfs[start:stop].astype(np.float64)
+            idf = np.log1p((n_docs - len(posting_docs) + 0.5) / (len(posting_docs) + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[posting_docs] / avg_length)
+            docs.append(posting_docs)
+            scores.append(idf * tf * (BM25_K1 + 1) / (tf + norm))
+        if len(docs) == 1:
+            return docs[0], scores[0]
+        unique_docs, inverse = np.unique(np.concatenate(docs), return_inverse=True)
+        return unique_docs.astype(np.int32), np.bincount(inverse, weights=np.concatenate(scores))
+
+    def search(self, query, limit=None):
+        """Cari dokumen; hasil (doc_ids, skor) terurut dari skor tertinggi."""
+        result_docs = np.zeros(0, dtype=np.int32)
+        result_scores = np.zeros(0)
+        for clause in parse_query(query):
+            docs, scores = None, None
+            for term, prefix in clause:
+                term_docs, term_scores = self._match(term, prefix)
+                if docs is None:
+                    docs, scores = term_docs, term_scores
+                    continue
+                docs, left, right = np.intersect1d(docs, term_docs, assume_unique=True, return_indices=True)
+                scores = scores[left] + term_scores[right]
+                if len(docs) == 0:
+                    break
+            if docs is None or len(docs) == 0:
+                continue
+            # OR: gabungkan klausa, skor dokumen yang cocok di beberapa klausa dijumlah
+            merged, inverse = np.unique(np.concatenate([result_docs, docs]), return_inverse=True)
+            result_scores = np.bincount(inverse, weights=np.concatenate([result_scores, scores]))
+            result_docs = merged.astype(np.int32)
+
+        ranking = np.lexsort((result_docs, -result_scores))
+        if limit is not None:
+            ranking = ranking[:limit]
+        return result_docs[ranking], result_scores[ranking]
+
+
+def document_hashes(texts):
+    # Hash per dokumen untuk mendeteksi apakah indeks tersimpan masih cocok
+    values = pd.Series(list(texts), dtype=object).fillna("").astype(str)
+    return pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+
+
+def default_index_path(base_path="data", name="review_index"):
+    return os.path.join(base_path, CACHE_DIR_NAME, f"{name}.pkl")
+
+
+def save_index(index, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump((INDEX_VERSION, index), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_index(path):
+    try:
+        with open(path, "rb") as f:
+            version, index = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError):
+        return None
+    return index if version == INDEX_VERSION else None
+
+
+def open_index(texts, path):
+    """Muat indeks dari disk dan perbarui secara inkremental, atau bangun baru.
+
+    Jika n dokumen pertama masih identik dengan yang tersimpan, hanya dokumen
+    tambahan yang diindeks. Jika ada perubahan di tengah, indeks dibangun ulang.
+    Mengembalikan (index, status) dengan status "hit", "updated" atau "rebuilt".
+    """
+    texts = list(texts)
+    index = load_index(path)
+    status = "hit"
+    if index is None or len(index) > len(texts) or not np.array_equal(
+        index.doc_hashes, document_hashes(texts[:len(index)])
+    ):
+        index, status = InvertedIndex(), "rebuilt"
+    if len(index) < len(texts):
+        index.add_documents(texts[len(index):])
+        status = "updated" if status == "hit" else status
+    if status != "hit":
+        try:
+            save_index(index, path)
+        except OSError:
+            # Folder cache read-only: indeks tetap dipakai dari memori
+            pass
+    return index, status
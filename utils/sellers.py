@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+from utils.cohort import _month_codes
+
+# Hari pengiriman di atas batas ini digabung ke bin terakhir histogram
+DELIVERY_DAYS_CAP = 365
+
+# Kolom partisi yang bisa dijumlah lintas bulan / batch
+ADDITIVE_COLUMNS = [
+    "orders", "items", "revenue", "freight", "delivered",
+    "delivery_days_sum", "late", "review_sum", "review_count",
+]
+
+
+def month_code(value):
+    # Bulan sebagai integer (tahun * 12 + bulan - 1), sama seperti cohort
+    ts = pd.Timestamp(value)
+    return ts.year * 12 + ts.month - 1
+
+
+class SellerFacts:
+    """Fakta seller dalam partisi bulanan yang bisa dijumlah.
+
+    ``partials``: satu baris per (month, seller_key) dengan kolom
+    ADDITIVE_COLUMNS. ``delivery_hist``: histogram sparse hari pengiriman per
+    (month, seller_key, days). Keduanya terurut per bulan, jadi rentang bulan
+    adalah potongan baris dan ringkasan per seller cukup menjumlah partisi,
+    bukan menghitung ulang dari baris item/order mentah.
+    """
+
+    def __init__(self, partials, delivery_hist, sellers=None):
+        self.partials = partials.sort_values(["month", "seller_key"], kind="stable").reset_index(drop=True)
+        self.delivery_hist = delivery_hist.sort_values(["month", "seller_key", "days"], kind="stable").reset_index(drop=True)
+        self.sellers = sellers
+
+    def merge(self, other):
+        """Gabungkan dengan batch baru (mis. order bulan terbaru) tanpa menyentuh data lama."""
+        partials = pd.concat([self.partials, other.partials], ignore_index=True)
+        partials = partials.groupby(["month", "seller_key"], as_index=False)[ADDITIVE_COLUMNS].sum()
+        hist = pd.concat([self.delivery_hist, other.delivery_hist], ignore_index=True)
+        hist = hist.groupby(["month", "seller_key", "days"], as_index=False)["count"].sum()
+        return SellerFacts(partials, hist, self.sellers if self.sellers is not None else other.sellers)
+
+    @staticmethod
+    def _month_slice(frame, start_month, end_month):
+        months = frame["month"].to_numpy()
+        lo = 0 if start_month is None else np.searchsorted(months, start_month, side="left")
+        hi = len(months) if end_month is None else np.searchsorted(months, end_month, side="right")
+        return frame.iloc[lo:hi]
+
+    def summary(self, start_month=None, end_month=None, quantile=0.9):
+        """Metrik per seller untuk rentang bulan (inklusif; None = tanpa batas)."""
+        window = self._month_slice(self.partials, start_month, end_month)
+        summary = window.groupby("seller_key")[ADDITIVE_COLUMNS].sum()
+        delivered = summary["delivered"].where(summary["delivered"] > 0)
+        summary["avg_delivery_days"] = summary["delivery_days_sum"] / delivered
+        summary["late_rate"] = summary["late"] / delivered
+        summary["review_score"] = summary["review_sum"] / summary["review_count"].where(summary["review_count"] > 0)
+        summary["p90_delivery_days"] = self._delivery_quantile(start_month, end_month, quantile)
+        summary = summary.reset_index()
+        if self.sellers is not None:
+            summary = summary.merge(self.sellers, on="seller_key", how="left")
+        return summary
+
+    def _delivery_quantile(self, start_month, end_month, quantile):
+        # Kuantil dari histogram (definisi inverted CDF): hari pertama di mana
+        # frekuensi kumulatif >= q * total
+        hist = self._month_slice(self.delivery_hist, start_month, end_month)
+        if hist.empty:
+            return pd.Series(dtype=float)
+        hist = hist.groupby(["seller_key", "days"], as_index=False)["count"].sum()
+        cumulative = hist.groupby("seller_key")["count"].cumsum()
+        total = hist.groupby("seller_key")["count"].transform("sum")
+        reached = hist[cumulative >= quantile * total]
+        return reached.groupby("seller_key")["days"].first().astype(float)
+
+
+def top_n(summary, metric, n=10, ascending=False, min_orders=1):
+    """N seller teratas menurut ``metric`` lewat partition (tanpa sort penuh).
+
+    Seller dengan metrik NaN atau order < ``min_orders`` diabaikan. Nilai
+    kembar diurutkan menurut urutan baris, sama seperti sort stabil + head(n).
+    """
+    eligible = summary[(summary["orders"] >= min_orders) & summary[metric].notna()]
+    values = eligible[metric].to_numpy(dtype=float)
+    if not ascending:
+        values = -values
+    if len(values) > n:
+        # Nilai ke-n sebagai batas; yang kembar di batas diambil dari baris teratas
+        kth = np.partition(values, n - 1)[n - 1]
+        below = np.flatnonzero(values < kth)
+        ties = np.flatnonzero(values == kth)[:n - len(below)]
+        candidates = np.sort(np.concatenate([below, ties]))
+    else:
+        candidates = np.arange(len(values))
+    ordered = candidates[np.argsort(values[candidates], kind="stable")]
+    return eligible.iloc[ordered].reset_index(drop=True)
+
+
+def build_seller_facts(orders, order_items, order_reviews=None, sellers=None):
+    """Bangun ``SellerFacts`` dari baris order/item (untuk semua data atau satu batch).
+
+    Metrik pengiriman dihitung per (seller, order) untuk order berstatus
+    delivered: lama kirim = delivered_customer - approved (hari penuh), telat
+    jika tanggal sampai melewati ``order_estimated_delivery_date``.
+    """
+    per_order = order_items.groupby(["seller_key", "order_key"], as_index=False).agg(
+        items=("order_item_id", "size"), revenue=("price", "sum"), freight=("freight_value", "sum")
+    )
+
+    order_info = orders[["order_key", "order_status", "order_purchase_timestamp", "order_approved_at",
+                         "order_delivered_customer_date", "order_estimated_delivery_date"]]
+    order_info = order_info[order_info["order_purchase_timestamp"].notna()]
+    delivered = (
+        (order_info["order_status"] == "delivered")
+        & order_info["order_delivered_customer_date"].notna()
+        & order_info["order_approved_at"].notna()
+    ).to_numpy()
+    delivery_days = (order_info["order_delivered_customer_date"] - order_info["order_approved_at"]).dt.days
+    late = order_info["order_delivered_customer_date"].dt.normalize() > order_info["order_estimated_delivery_date"]
+    order_info = pd.DataFrame({
+        "order_key": order_info["order_key"].to_numpy(),
+        "month": _month_codes(order_info["order_purchase_timestamp"]).astype(np.int32),
+        "delivered": delivered.astype(np.int32),
+        "delivery_days": np.where(delivered, delivery_days.fillna(0).to_numpy(), 0).astype(np.int32),
+        "late": (late.to_numpy() & delivered).astype(np.int32),
+    })
+    if order_reviews is not None and not order_reviews.empty:
+        review_score = order_reviews.groupby("order_key")["review_score"].mean()
+        order_info["review_sum"] = order_info["order_key"].map(review_score).fillna(0.0).to_numpy()
+        order_info["review_count"] = order_info["order_key"].isin(review_score.index).astype(np.int32).to_numpy()
+    else:
+        order_info["review_sum"] = 0.0
+        order_info["review_count"] = 0
+
+    facts = per_order.merge(order_info, on="order_key", how="inner")
+    facts["orders"] = 1
+    facts["delivery_days_sum"] = facts["delivery_days"] * facts["delivered"]
+    partials = facts.groupby(["month", "seller_key"], as_index=False)[ADDITIVE_COLUMNS].sum()
+
+    shipped = facts[facts["delivered"] == 1]
+    hist = pd.DataFrame({
+        "month": shipped["month"].to_numpy(),
+        "seller_key": shipped["seller_key"].to_numpy(),
+        "days": np.clip(shipped["delivery_days"].to_numpy(), 0, DELIVERY_DAYS_CAP).astype(np.int16),
+    })
+    hist = hist.groupby(["month", "seller_key", "days"]).size().rename("count").reset_index()
+
+    if sellers is not None:
+        sellers = sellers[["seller_key", "seller_city", "seller_state"]].drop_duplicates("seller_key")
+    return SellerFacts(partials, hist, sellers)
@@ -0,0 +1,104 @@
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import zipfile
+
+# DASHBOARD_OFFLINE=1: jangan pernah mengakses jaringan (runner air-gapped)
+OFFLINE_ENV = "DASHBOARD_OFFLINE"
+
+# URL unduhan untuk file yang tidak ikut di repo
+REMOTE_URLS = {
+    "geolocation_dataset.csv": "https://drive.google.com/uc?id=1RgX0EAZfPbpwEaABInGf71JnCz8wLyoz",
+}
+
+# Ekstensi arsip lokal yang dikenali -> fungsi open untuk stream terkompresi
+_STREAM_OPENERS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+
+
+def offline_mode():
+    return os.environ.get(OFFLINE_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _atomic_copy(stream, path):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as out:
+        shutil.copyfileobj(stream, out, length=1 << 20)
+    os.replace(tmp_path, path)
+
+
+class LocalFileSource:
+    """File CSV sudah ada di folder data."""
+
+    name = "local"
+    remote = False
+
+    def fetch(self, path):
+        return os.path.exists(path)
+
+
+class ArchiveSource:
+    """CSV diekstrak dari arsip di sebelahnya: <file>.zip/.gz/.bz2/.xz."""
+
+    name = "archive"
+    remote = False
+
+    def fetch(self, path):
+        if os.path.exists(f"{path}.zip"):
+            with zipfile.ZipFile(f"{path}.zip") as archive:
+                members = [m for m in archive.namelist() if os.path.basename(m) == os.path.basename(path)]
+                if not members:
+                    return False
+                with archive.open(members[0]) as stream:
+                    _atomic_copy(stream, path)
+            return True
+        for ext, opener in _STREAM_OPENERS.items():
+            if os.path.exists(f"{path}{ext}"):
+                with opener(f"{path}{ext}", "rb") as stream:
+                    _atomic_copy(stream, path)
+                return True
+        return False
+
+
+class GdownSource:
+    """Unduh dari Google Drive lewat gdown (butuh internet)."""
+
+    name = "gdown"
+    remote = True
+
+    def __init__(self, url):
+        self.url = url
+
+    def fetch(self, path):
+        import gdown
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        gdown.download(self.url, path, quiet=False)
+        return os.path.exists(path)
+
+
+def default_sources(filename):
+    sources = [LocalFileSource(), ArchiveSource()]
+    if filename in REMOTE_URLS:
+        sources.append(GdownSource(REMOTE_URLS[filename]))
+    return sources
+
+
+def ensure_file(path, sources=None, offline=None):
+    """Pastikan ``path`` ada dengan mencoba sumber satu per satu.
+
+    Sumber remote dilewati saat mode offline. Mengembalikan nama sumber yang
+    berhasil, atau None jika file tetap tidak tersedia (pemanggil yang
+    memutuskan mau gagal atau memakai cache).
+    """
+    sources = default_sources(os.path.basename(path)) if sources is None else sources
+    offline = offline_mode() if offline is None else offline
+    for source in sources:
+        if source.remote and offline:
+            continue
+        try:
+            if source.fetch(path):
+                return source.name
+        except Exception:
+            continue
+    return None
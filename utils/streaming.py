@@ -0,0 +1,334 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.cohort import _month_codes
+from utils.cube import _hash64, build_daily_cube
+from utils.data_loader import (
+    CACHE_DIR_NAME, DATASET_FILES, SCHEMAS, _ensure_source, iter_csv_chunks, read_csv_with_schema,
+)
+from utils.rfm import score_rfm
+from utils.sellers import build_seller_facts
+
+# Kolom yang dibaca per tabel; id string langsung diganti hash key int64
+STREAM_COLUMNS = {
+    "orders": ["order_id", "customer_id", "order_status", "order_purchase_timestamp", "order_approved_at",
+               "order_delivered_customer_date", "order_estimated_delivery_date"],
+    "order_items": ["order_id", "order_item_id", "product_id", "seller_id", "price", "freight_value"],
+    "order_payments": ["order_id", "payment_type", "payment_value"],
+    "order_reviews": ["order_id", "review_score"],
+}
+ID_COLUMNS = {"order_id": "order_key", "customer_id": "customer_key",
+              "product_id": "product_key", "seller_id": "seller_key"}
+
+# Kolom rollup kategori per (month, kategori) yang bisa dijumlah lintas partisi
+CATEGORY_COLUMNS = ["items", "revenue", "freight", "review_sum", "review_count"]
+
+# Target ukuran CSV per bucket: satu bucket (4 tabel) harus muat di memori
+BUCKET_BYTES = 256 << 20
+
+# Statistik RFM final per customer ditulis ke <base_path>/.cache/stream
+STREAM_DIR_NAME = "stream"
+CUSTOMER_STATS_FILE = "customer_stats.parquet"
+CUSTOMER_STATS_SCHEMA = pa.schema([
+    ("customer_key", pa.int64()),
+    ("last_purchase", pa.timestamp("ns")),
+    ("frequency", pa.int64()),
+    ("monetary", pa.float64()),
+])
+
+_HEX = np.full(256, -1, dtype=np.int64)
+_HEX[np.frombuffer(b"0123456789", dtype=np.uint8)] = np.arange(10)
+_HEX[np.frombuffer(b"abcdef", dtype=np.uint8)] = np.arange(10, 16)
+_HEX[np.frombuffer(b"ABCDEF", dtype=np.uint8)] = np.arange(10, 16)
+
+
+def hash_key(ids):
+    """Id hex 32 karakter -> int64 dari 15 digit hex pertama (60 bit).
+
+    Pengganti IdInterner untuk data yang tidak muat di memori: tidak perlu
+    kamus id yang tumbuh bersama data, dan sama di setiap chunk/proses.
+    Peluang tabrakan ~n^2 / 2^61 (sekitar 1e-3 untuk 50 juta id). Nilai
+    kosong mendapat -1.
+    """
+    values = pd.Series(ids, dtype=object)
+    missing = values.isna().to_numpy()
+    raw = np.asarray(values.fillna("").to_numpy(dtype="S15"))
+    digits = _HEX[raw.view(np.uint8).reshape(len(raw), 15)]
+    keys = np.zeros(len(raw), dtype=np.int64)
+    for column in range(15):
+        keys = (keys << 4) | np.maximum(digits[:, column], 0)
+    keys[missing | (digits < 0).any(axis=1)] = -1
+    return keys
+
+
+def _encode(chunk):
+    # Id -> hash key, kategori -> string (skema spill sama di semua chunk)
+    for id_col, key_col in ID_COLUMNS.items():
+        if id_col in chunk.columns:
+            chunk[key_col] = hash_key(chunk.pop(id_col))
+    for col in chunk.columns:
+        if isinstance(chunk[col].dtype, pd.CategoricalDtype):
+            chunk[col] = chunk[col].astype(object)
+    return chunk
+
+
+def _arrow_type(name, col):
+    schema = SCHEMAS[name]
+    if col in schema["dates"]:
+        return pa.timestamp("ns")
+    kind = schema["dtype"].get(col)
+    if kind == "category":
+        return pa.string()
+    return pa.float64() if kind is None else pa.from_numpy_dtype(np.dtype(kind))
+
+
+def spill_schema(name):
+    """Skema Arrow file spill, diturunkan dari SCHEMAS (bukan dari chunk pertama).
+
+    Chunk yang kolomnya kosong semua tetap punya tipe yang sama dengan chunk
+    lain, jadi setiap chunk bisa di-cast ke skema ini.
+    """
+    fields = []
+    for col in STREAM_COLUMNS[name]:
+        if col in ID_COLUMNS:
+            fields.append((ID_COLUMNS[col], pa.int64()))
+        else:
+            fields.append((col, _arrow_type(name, col)))
+    return pa.schema(fields)
+
+
+class StreamAggregates:
+    """Hasil ingest streaming: hanya agregat berukuran terbatas yang resident.
+
+    - ``cube``: ``DailyCube`` (KPI harian, HLL customer)
+    - ``seller_facts``: ``SellerFacts`` partisi bulanan
+    - ``categories``: per (month, kategori) CATEGORY_COLUMNS
+    - ``sample``: maksimal ``sample_size`` order, dipilih dengan hash terkecil
+
+    Statistik per customer (last_purchase, frequency, monetary) tumbuh
+    bersama jumlah customer, jadi tidak ikut di memori: sudah final di file
+    Parquet ``customer_stats_path`` (satu row group per bucket customer) dan
+    baru dibaca oleh ``customer_stats()`` / ``rfm()``.
+    """
+
+    def __init__(self, cube, seller_facts, categories, sample, sample_size, customer_stats_path=None):
+        self.cube = cube
+        self.seller_facts = seller_facts
+        self.categories = categories
+        self.sample = sample
+        self.sample_size = sample_size
+        self.customer_stats_path = customer_stats_path
+
+    @property
+    def n_customers(self):
+        return pq.ParquetFile(self.customer_stats_path).metadata.num_rows
+
+    def customer_stats(self, columns=None):
+        return pd.read_parquet(self.customer_stats_path, columns=columns)
+
+    def merge(self, other):
+        # Hanya agregat yang ukurannya dibatasi hari/bulan/seller/kategori
+        categories = pd.concat([self.categories, other.categories], ignore_index=True)
+        categories = categories.groupby(["month", "category"], as_index=False)[CATEGORY_COLUMNS].sum()
+        sample = pd.concat([self.sample, other.sample], ignore_index=True)
+        sample = sample.nsmallest(self.sample_size, "_sample_hash").reset_index(drop=True)
+        return StreamAggregates(
+            self.cube.merge(other.cube), self.seller_facts.merge(other.seller_facts),
+            categories, sample, self.sample_size, self.customer_stats_path or other.customer_stats_path,
+        )
+
+    def rfm(self, current_date=None):
+        """Tabel RFM seperti ``calculate_rfm``, dari statistik per customer.
+
+        Skor kuintil butuh semua customer sekaligus, jadi empat kolom
+        numerik statistik customer dimuat utuh selama pemanggilan ini.
+        """
+        stats = self.customer_stats()
+        if current_date is None:
+            current_date = stats["last_purchase"].max()
+        rfm_data = pd.DataFrame({
+            "customer_key": stats["customer_key"].to_numpy(),
+            "recency": (current_date - stats["last_purchase"]).dt.days.to_numpy(),
+            "frequency": stats["frequency"].to_numpy(),
+            "monetary": stats["monetary"].to_numpy(),
+        })
+        return score_rfm(rfm_data)
+
+
+def _write_partitioned(df, buckets, schema, writer):
+    # Urutkan sekali per bucket, lalu potong per rentang; writer(bucket) ->
+    # ParquetWriter bucket itu. Tiap potongan di-cast ke skema tetap.
+    order = np.argsort(buckets, kind="stable")
+    df, buckets = df.iloc[order], buckets[order]
+    present = np.unique(buckets)
+    starts = np.searchsorted(buckets, present, side="left")
+    stops = np.searchsorted(buckets, present, side="right")
+    for bucket, start, stop in zip(present, starts, stops):
+        table = pa.Table.from_pandas(df.iloc[start:stop], schema=schema, preserve_index=False)
+        writer(bucket).write_table(table.replace_schema_metadata(None))
+
+
+def _spill(base_path, spill_dir, n_buckets, chunksize):
+    # Tahap 1: tiap chunk dipecah per bucket hash order_key dan ditulis ke
+    # Parquet bucket-nya, sehingga satu order + item/payment/review-nya selalu
+    # berada di bucket yang sama
+    for name, columns in STREAM_COLUMNS.items():
+        path = _ensure_source(name, base_path)
+        schema = spill_schema(name)
+        writers = {}
+
+        def writer(bucket):
+            if bucket not in writers:
+                writers[bucket] = pq.ParquetWriter(os.path.join(spill_dir, f"{name}.{bucket}.parquet"), schema)
+            return writers[bucket]
+
+        try:
+            for chunk in iter_csv_chunks(name, path, chunksize, usecols=columns):
+                chunk = _encode(chunk)
+                buckets = (_hash64(chunk["order_key"]) % np.uint64(n_buckets)).astype(np.int64)
+                _write_partitioned(chunk, buckets, schema, writer)
+        finally:
+            for bucket_writer in writers.values():
+                bucket_writer.close()
+
+
+def _read_bucket(spill_dir, name, bucket):
+    # Bucket tanpa baris untuk tabel ini: frame kosong dengan dtype yang sama
+    path = os.path.join(spill_dir, f"{name}.{bucket}.parquet")
+    if os.path.exists(path):
+        return pd.read_parquet(path)
+    return spill_schema(name).empty_table().to_pandas()
+
+
+def _customer_buckets(customer_keys, n_buckets):
+    return (_hash64(customer_keys) % np.uint64(n_buckets)).astype(np.int64)
+
+
+def _reduce_bucket(spill_dir, bucket, product_category, sample_size, customer_writers):
+    # Tahap 2: join dan reduksi satu bucket order (muat di memori) menjadi
+    # agregat. Statistik customer parsial dipartisi ulang per hash
+    # customer_key ke customer_writers, tidak disimpan di hasil.
+    orders = _read_bucket(spill_dir, "orders", bucket)
+    if orders.empty:
+        return None
+    items = _read_bucket(spill_dir, "order_items", bucket)
+    payments = _read_bucket(spill_dir, "order_payments", bucket)
+    reviews = _read_bucket(spill_dir, "order_reviews", bucket)
+
+    order_time = orders[["order_key", "customer_key", "order_purchase_timestamp"]]
+    orders_payments = order_time.merge(payments, on="order_key", how="left")
+    orders_items = order_time.merge(items, on="order_key", how="left")
+    # Sketch HLL dibutuhkan: cube tiap bucket digabung lewat DailyCube.merge
+    cube = build_daily_cube(orders, orders_payments, orders_items, customer_sketch=True)
+
+    paid = orders_payments[orders_payments["order_purchase_timestamp"].notna()]
+    grouped = paid.groupby("customer_key")
+    # Satu order utuh ada di satu bucket order: frequency antar bucket cukup dijumlah
+    partial_stats = pd.DataFrame({
+        "last_purchase": grouped["order_purchase_timestamp"].max(),
+        "frequency": grouped["order_key"].nunique(),
+        "monetary": grouped["payment_value"].sum(),
+    }).reset_index()
+    buckets = _customer_buckets(partial_stats["customer_key"], len(customer_writers))
+    _write_partitioned(partial_stats, buckets, CUSTOMER_STATS_SCHEMA, customer_writers.__getitem__)
+
+    seller_facts = build_seller_facts(orders, items, reviews)
+
+    sold = orders_items[orders_items["order_purchase_timestamp"].notna() & orders_items["product_key"].notna()]
+    review_score = reviews.groupby("order_key")["review_score"].mean()
+    per_item = pd.DataFrame({
+        "month": _month_codes(sold["order_purchase_timestamp"]).astype(np.int32),
+        "category": sold["product_key"].astype(np.int64).map(product_category).fillna("unknown").to_numpy(),
+        "items": 1,
+        "revenue": sold["price"].to_numpy(),
+        "freight": sold["freight_value"].to_numpy(),
+        "review_sum": sold["order_key"].map(review_score).fillna(0.0).to_numpy(),
+        "review_count": sold["order_key"].isin(review_score.index).astype(np.int32).to_numpy(),
+    })
+    categories = per_item.groupby(["month", "category"], as_index=False)[CATEGORY_COLUMNS].sum()
+
+    sample = orders.assign(_sample_hash=_hash64(orders["order_key"]))
+    sample = sample.nsmallest(sample_size, "_sample_hash").reset_index(drop=True)
+    return StreamAggregates(cube, seller_facts, categories, sample, sample_size)
+
+
+def _finalize_customers(spill_dir, n_buckets, output_path):
+    # Tahap 3: tiap bucket customer berisi semua baris parsial customer-nya,
+    # jadi hasil groupby per bucket sudah final dan langsung ditulis
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    with pq.ParquetWriter(tmp_path, CUSTOMER_STATS_SCHEMA) as writer:
+        for bucket in range(n_buckets):
+            partial = pd.read_parquet(os.path.join(spill_dir, f"customers.{bucket}.parquet"))
+            if partial.empty:
+                continue
+            stats = partial.groupby("customer_key", as_index=False).agg(
+                last_purchase=("last_purchase", "max"), frequency=("frequency", "sum"),
+                monetary=("monetary", "sum"),
+            )
+            table = pa.Table.from_pandas(stats, schema=CUSTOMER_STATS_SCHEMA, preserve_index=False)
+            writer.write_table(table.replace_schema_metadata(None))
+    os.replace(tmp_path, output_path)
+
+
+def stream_aggregates(base_path="data", chunksize=1_000_000, n_buckets=None, sample_size=100_000,
+                      spill_dir=None, output_dir=None):
+    """Ingest orders/items/payments/reviews yang lebih besar dari RAM.
+
+    CSV dibaca per ``chunksize`` baris dan dipartisi ke ``n_buckets`` file
+    Parquet sementara menurut hash order_key (default: satu bucket per
+    BUCKET_BYTES CSV). Setiap bucket kemudian di-join dan direduksi menjadi
+    agregat yang bisa digabung (cube harian, fakta seller bulanan, rollup
+    kategori, sampel); ukurannya dibatasi jumlah hari/bulan/seller/kategori,
+    bukan jumlah order. Statistik RFM parsial per customer dipartisi ulang
+    menurut hash customer_key, lalu tiap bucket customer direduksi dan
+    ditulis ke ``<output_dir>/customer_stats.parquet`` (default
+    ``<base_path>/.cache/stream``).
+
+    Memori kerja ~ satu chunk CSV atau satu bucket, ditambah agregat
+    terbatas di atas; ``rfm()`` memuat statistik semua customer.
+    """
+    if n_buckets is None:
+        total = sum(os.path.getsize(_ensure_source(name, base_path)) for name in STREAM_COLUMNS)
+        n_buckets = max(1, -(-total // BUCKET_BYTES))
+
+    # Produk & kategori kecil, dibaca utuh
+    products = read_csv_with_schema("products", os.path.join(base_path, DATASET_FILES["products"]))
+    product_category = pd.Series(
+        products["product_category_name"].astype(object).to_numpy(), index=hash_key(products["product_id"])
+    )
+    product_category = product_category[~product_category.index.duplicated()]
+
+    output_dir = output_dir or os.path.join(base_path, CACHE_DIR_NAME, STREAM_DIR_NAME)
+    os.makedirs(output_dir, exist_ok=True)
+    own_dir = spill_dir is None
+    spill_dir = spill_dir or tempfile.mkdtemp(prefix="stream-spill-")
+    try:
+        _spill(base_path, spill_dir, n_buckets, chunksize)
+        result = None
+        customer_writers = [
+            pq.ParquetWriter(os.path.join(spill_dir, f"customers.{bucket}.parquet"), CUSTOMER_STATS_SCHEMA)
+            for bucket in range(n_buckets)
+        ]
+        try:
+            for bucket in range(n_buckets):
+                partial = _reduce_bucket(spill_dir, bucket, product_category, sample_size, customer_writers)
+                if partial is not None:
+                    result = partial if result is None else result.merge(partial)
+        finally:
+            for writer in customer_writers:
+                writer.close()
+        if result is None:
+            return None
+
+        result.customer_stats_path = os.path.join(output_dir, CUSTOMER_STATS_FILE)
+        _finalize_customers(spill_dir, n_buckets, result.customer_stats_path)
+        return result
+    finally:
+        if own_dir:
+            shutil.rmtree(spill_dir, ignore_errors=True)
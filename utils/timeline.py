@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+# Kolom waktu utama yang dipakai filter periode di sidebar
+TIME_COLUMN = "order_purchase_timestamp"
+
+
+def sort_by_time(df, col=TIME_COLUMN):
+    """Urutkan frame berdasarkan timestamp (NaT di akhir) dan reset index-nya.
+
+    Frame yang sudah terurut bisa dipotong per rentang tanggal dengan
+    ``slice_by_time`` tanpa memindai semua baris.
+    """
+    return df.sort_values(col, kind="stable", na_position="last").reset_index(drop=True)
+
+
+def _as_datetime64(value, dtype):
+    return pd.Timestamp(value).to_datetime64().astype(dtype)
+
+
+def time_bounds(df, start_date, end_date, col=TIME_COLUMN):
+    # Rentang inklusif per tanggal: [start 00:00, end + 1 hari 00:00).
+    # numpy mengurutkan NaT paling akhir, jadi searchsorted tetap valid.
+    values = df[col].to_numpy()
+    start = _as_datetime64(start_date, values.dtype)
+    end = _as_datetime64(pd.Timestamp(end_date) + pd.Timedelta(days=1), values.dtype)
+    lo, hi = np.searchsorted(values, [start, end], side="left")
+    return int(lo), int(hi)
+
+
+def slice_by_time(df, start_date, end_date, col=TIME_COLUMN):
+    """Ambil baris dengan ``col`` di antara start_date dan end_date (inklusif).
+
+    ``df`` harus sudah diurutkan dengan ``sort_by_time``; hasilnya potongan
+    posisi (dua binary search + slice), bukan boolean mask.
+    """
+    lo, hi = time_bounds(df, start_date, end_date, col)
+    return df.iloc[lo:hi]
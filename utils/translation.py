@@ -0,0 +1,163 @@
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+from utils.data_loader import CACHE_DIR_NAME
+
+# Backend bisa dipilih lewat env var, mis. TRANSLATION_BACKEND=identity untuk
+# lingkungan tanpa internet atau untuk pengujian
+TRANSLATION_BACKEND_ENV = "TRANSLATION_BACKEND"
+
+
+class GoogleBackend:
+    """Terjemahan lewat deep_translator.GoogleTranslator (butuh internet).
+
+    ``GoogleTranslator.translate_batch`` tetap mengirim satu request per
+    teks, jadi teks digabung per baris menjadi request sampai
+    ``max_chars`` karakter (batas Google 5000) lalu hasilnya dipecah lagi.
+    Baris baru di dalam teks diganti spasi. Jika jumlah baris hasil tidak
+    cocok, grup itu diterjemahkan ulang per teks.
+    """
+
+    name = "google"
+
+    def __init__(self, max_chars=4500):
+        self.max_chars = max_chars
+        self.requests = 0
+
+    def _groups(self, lines):
+        group, size = [], 0
+        for line in lines:
+            if group and size + len(line) + 1 > self.max_chars:
+                yield group
+                group, size = [], 0
+            group.append(line)
+            size += len(line) + 1
+        if group:
+            yield group
+
+    def translate_batch(self, texts, target_lang):
+        from deep_translator import GoogleTranslator
+        translator = GoogleTranslator(source="auto", target=target_lang)
+        lines = [" ".join(text.splitlines()) for text in texts]
+        results = []
+        for group in self._groups(lines):
+            self.requests += 1
+            translated = translator.translate("\n".join(group))
+            parts = translated.split("\n") if isinstance(translated, str) else []
+            if len(parts) != len(group):
+                parts = []
+                for line in group:
+                    self.requests += 1
+                    parts.append(translator.translate(line))
+            results.extend(parts)
+        return results
+
+
+class IdentityBackend:
+    """Backend offline: mengembalikan teks apa adanya dan mencatat jumlah panggilan."""
+
+    name = "identity"
+
+    def __init__(self):
+        self.calls = 0
+
+    def translate_batch(self, texts, target_lang):
+        self.calls += 1
+        return list(texts)
+
+
+BACKENDS = {
+    GoogleBackend.name: GoogleBackend,
+    IdentityBackend.name: IdentityBackend,
+}
+
+
+def get_backend(name=None):
+    name = name or os.environ.get(TRANSLATION_BACKEND_ENV, GoogleBackend.name)
+    return BACKENDS[name]()
+
+
+class TranslationStore:
+    """Cache terjemahan persisten di SQLite, dengan key (bahasa, teks)."""
+
+    def __init__(self, path):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                " lang TEXT NOT NULL, text TEXT NOT NULL, translation TEXT NOT NULL,"
+                " PRIMARY KEY (lang, text))"
+            )
+
+    def get_many(self, texts, lang, chunk_size=500):
+        found = {}
+        texts = list(texts)
+        with self._lock:
+            for i in range(0, len(texts), chunk_size):
+                chunk = texts[i:i + chunk_size]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT text, translation FROM translations WHERE lang = ? AND text IN ({placeholders})",
+                    [lang, *chunk],
+                )
+                found.update(rows)
+        return found
+
+    def put_many(self, translations, lang):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations (lang, text, translation) VALUES (?, ?, ?)",
+                [(lang, text, translated) for text, translated in translations.items()],
+            )
+
+
+class Translator:
+    """Terjemahkan banyak teks sekaligus: dedup, cek store, lalu batch ke backend.
+
+    Teks kosong/NaN dikembalikan apa adanya. Jika backend gagal, teks asli
+    dipakai dan tidak disimpan, sehingga akan dicoba lagi di lain waktu.
+    """
+
+    def __init__(self, backend, store, batch_size=50):
+        self.backend = backend
+        self.store = store
+        self.batch_size = batch_size
+        self.backend_calls = 0
+
+    def translate_many(self, texts, target_lang="id"):
+        texts = list(texts)
+        unique = list(dict.fromkeys(
+            text for text in texts if isinstance(text, str) and text.strip()
+        ))
+        translated = self.store.get_many(unique, target_lang)
+
+        missing = [text for text in unique if text not in translated]
+        fresh = {}
+        for i in range(0, len(missing), self.batch_size):
+            batch = missing[i:i + self.batch_size]
+            self.backend_calls += 1
+            try:
+                results = self.backend.translate_batch(batch, target_lang)
+            except Exception:
+                continue
+            fresh.update({
+                text: result for text, result in zip(batch, results) if isinstance(result, str)
+            })
+        if fresh:
+            self.store.put_many(fresh, target_lang)
+            translated.update(fresh)
+
+        return [translated.get(text, text) if isinstance(text, str) else text for text in texts]
+
+    def translate_series(self, series, target_lang="id"):
+        return pd.Series(self.translate_many(series.tolist(), target_lang), index=series.index, dtype=object)
+
+
+def default_store_path(base_path="data"):
+    return os.path.join(base_path, CACHE_DIR_NAME, "translations.sqlite")